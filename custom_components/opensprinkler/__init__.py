@@ -2,7 +2,10 @@
 
 import asyncio
 import logging
-from datetime import timedelta
+import shutil
+from collections import Counter
+from time import monotonic
+from typing import Any
 
 import async_timeout
 from aiohttp.client_exceptions import InvalidURL
@@ -11,56 +14,120 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
     CONF_URL,
     CONF_VERIFY_SSL,
 )
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.entity_platform import (
+    async_get_current_platform,
+    async_get_platforms,
+)
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.service import entity_service_call
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.update_coordinator import (
     ConfigEntryAuthFailed,
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.util import slugify
-from homeassistant.util.dt import utc_from_timestamp
+from homeassistant.util.dt import utc_from_timestamp, utcnow
 from pyopensprinkler import Controller as OpenSprinkler
-from pyopensprinkler import OpenSprinklerAuthError, OpenSprinklerConnectionError
+from pyopensprinkler import (
+    OpenSprinklerApiError,
+    OpenSprinklerAuthError,
+    OpenSprinklerConnectionError,
+)
 
+from .baselines import StationBaselines
+from .commands import OpenSprinklerCommandQueue
+from .connection import KEEPALIVE_MARGIN, OpenSprinklerConnection
 from .const import (
+    BASELINES_STORAGE_KEY,
+    COMMANDS_STORAGE_KEY,
+    CONF_COMMAND_EXPIRY,
+    CONF_COMMAND_QUEUE,
     CONF_INDEX,
+    CONF_MAX_CONSECUTIVE_FAILURES,
+    CONF_MAX_SILENCE,
+    CONF_MIN_TIMEOUT,
+    CONF_OFFSET,
+    CONF_OFFSET_TYPE,
+    CONF_RELATIVE_DEADBAND,
+    CONF_RUN_LOG,
     CONF_RUN_SECONDS,
+    DATA_PROBES,
+    DEFAULT_COMMAND_EXPIRY,
+    DEFAULT_MAX_SILENCE,
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    FLOW_STORAGE_KEY,
+    LAYOUT_OPTIONS,
+    PROBE_TTL,
     QUEUE_OPTION_VALUES,
+    SCHEMA_SERVICE_EXPORT_PROGRAMS,
+    SCHEMA_SERVICE_IMPORT_PROGRAMS,
     SCHEMA_SERVICE_PAUSE_STATIONS,
+    SCHEMA_SERVICE_PROFILE,
     SCHEMA_SERVICE_REBOOT,
     SCHEMA_SERVICE_RUN,
     SCHEMA_SERVICE_RUN_ONCE,
     SCHEMA_SERVICE_RUN_PROGRAM,
     SCHEMA_SERVICE_RUN_STATION,
     SCHEMA_SERVICE_SET_RAIN_DELAY,
+    SCHEMA_SERVICE_SET_START_TIMES,
     SCHEMA_SERVICE_SET_WATER_LEVEL,
     SCHEMA_SERVICE_STOP,
+    SERVICE_EXPORT_PROGRAMS,
+    SERVICE_IMPORT_PROGRAMS,
     SERVICE_PAUSE_STATIONS,
+    SERVICE_PROFILE,
     SERVICE_REBOOT,
     SERVICE_RUN,
     SERVICE_RUN_ONCE,
     SERVICE_RUN_PROGRAM,
     SERVICE_RUN_STATION,
     SERVICE_SET_RAIN_DELAY,
+    SERVICE_SET_START_TIMES,
     SERVICE_SET_WATER_LEVEL,
     SERVICE_STOP,
+    SIGNAL_ENTRY_UNLOADED,
+    SIGNAL_TOPOLOGY_UPDATED,
+    START_TIME_MIDNIGHT,
+    STATISTICS_STORAGE_KEY,
 )
+from .events import OpenSprinklerEventEmitter
+from .latency import LatencyTracker
+from .polling import OpenSprinklerPollScheduler, async_get_poll_scheduler
+from .profiler import CoordinatorProfiler
+from .programs import export_program, plan_import, program_params
+from .runlog import OpenSprinklerRunLog
+from .schedule import NextRunScheduler, ScheduleCache
+from .snapshot import ControllerSnapshot, ProgramSnapshot, StationSnapshot
+from .timings import SetupTimings
+from .totalizer import FlowTotalizer
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [
     "binary_sensor",
+    "calendar",
     "date",
     "number",
     "select",
@@ -70,25 +137,48 @@ PLATFORMS = [
     "time",
 ]
 TIMEOUT = 10
+MIN_TIMEOUT = 2
 MAX_CONSECUTIVE_UPDATE_FAILURES = 3
 
 
 class OpenSprinklerDataUpdater:
     """Fetch OpenSprinkler data while tolerating brief communication failures."""
 
-    def __init__(self, controller: OpenSprinkler) -> None:
-        """Initialize the data updater."""
+    def __init__(
+        self,
+        controller: OpenSprinkler,
+        timeout: int = TIMEOUT,
+        max_consecutive_failures: int = MAX_CONSECUTIVE_UPDATE_FAILURES,
+        min_timeout: int = MIN_TIMEOUT,
+    ) -> None:
+        """Initialize the data updater.
+
+        Polls and commands time out after a multiple of their own recent
+        latency, between the minimum and the (maximum) timeout.
+        """
         self._controller = controller
         self._consecutive_update_failures = 0
+        self._snapshot = None
+        self._snapshot_state = None
+        self.totalizer: FlowTotalizer | None = None
+        self.baselines: StationBaselines | None = None
+        self.command_queue: OpenSprinklerCommandQueue | None = None
+        self.poll_latency = LatencyTracker(min_timeout, timeout)
+        self.command_latency = LatencyTracker(min_timeout, timeout)
+        self.max_consecutive_failures = max_consecutive_failures
 
     def _can_reuse_previous_state(self, error: Exception) -> bool:
         """Return whether cached state can be used after a transient failure."""
+        # Commands wait in the queue until a poll reaches the controller again
+        if self.command_queue is not None:
+            self.command_queue.offline = True
+
         if not self._controller._state:
             return False
 
         self._consecutive_update_failures += 1
 
-        if self._consecutive_update_failures >= MAX_CONSECUTIVE_UPDATE_FAILURES:
+        if self._consecutive_update_failures >= self.max_consecutive_failures:
             return False
 
         reason = str(error) or type(error).__name__
@@ -96,18 +186,35 @@ class OpenSprinklerDataUpdater:
             "Using previous OpenSprinkler state after transient update failure "
             "(%d/%d): %s",
             self._consecutive_update_failures,
-            MAX_CONSECUTIVE_UPDATE_FAILURES,
+            self.max_consecutive_failures,
             reason,
         )
         return True
 
+    async def _async_refresh(self) -> None:
+        """Refresh the controller state within the poll timeout."""
+        timeout = self.poll_latency.timeout
+        start = monotonic()
+        try:
+            async with async_timeout.timeout(timeout):
+                await self._controller.refresh()
+        except asyncio.TimeoutError:
+            self.poll_latency.add_timeout(timeout)
+            raise
+        self.poll_latency.add(monotonic() - start)
+
     async def async_update_data(self):
         """Fetch data from OpenSprinkler."""
         _LOGGER.debug("refreshing data")
 
         try:
-            async with async_timeout.timeout(TIMEOUT):
-                await self._controller.refresh()
+            await self._async_refresh()
+            if (
+                self.command_queue is not None
+                and await self.command_queue.async_replay()
+            ):
+                # Read back what the commands sent while it was away changed
+                await self._async_refresh()
         except OpenSprinklerAuthError as e:
             # Wrong password, tell the user to re-enter it immediately.
             _LOGGER.debug(f"auth failure: {e}")
@@ -135,6 +242,330 @@ class OpenSprinklerDataUpdater:
 
         return self._controller._state
 
+    def get_snapshot(self) -> ControllerSnapshot:
+        """Return the controller state parsed for the entities.
+
+        The state is parsed once when pyopensprinkler has downloaded a new
+        one, and shared by all entity state writes until the next poll.
+        """
+        state = self._controller._state
+        if state is not self._snapshot_state:
+            self._snapshot = ControllerSnapshot.from_controller(self._controller)
+            self._snapshot_state = state
+            if self.totalizer is not None:
+                self.totalizer.add_sample(self._snapshot, monotonic())
+            if self.baselines is not None:
+                self.baselines.add_sample(self._snapshot)
+
+        return self._snapshot
+
+    async def async_update_snapshot(self) -> ControllerSnapshot:
+        """Fetch data from OpenSprinkler and parse it."""
+        await self.async_update_data()
+        return self.get_snapshot()
+
+
+@callback
+def async_store_probe(
+    hass: HomeAssistant, unique_id: str, controller: OpenSprinkler
+) -> None:
+    """Keep a freshly validated controller for the next setup of its entry."""
+    hass.data.setdefault(DATA_PROBES, {})[unique_id] = (
+        monotonic() + PROBE_TTL,
+        controller,
+    )
+
+
+@callback
+def async_pop_probe(hass: HomeAssistant, unique_id: str) -> OpenSprinkler | None:
+    """Return the validated controller for an entry if it is still fresh."""
+    expires, controller = hass.data.get(DATA_PROBES, {}).pop(unique_id, (0, None))
+    if expires < monotonic():
+        return None
+
+    return controller
+
+
+async def async_swap_password(
+    hass: HomeAssistant, entry: ConfigEntry, validated: OpenSprinkler
+) -> bool:
+    """Move a validated password into the running controller of an entry.
+
+    Returns False when the entry is not running, in which case it has to be
+    set up again to pick up the new password.
+    """
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if data is None:
+        return False
+
+    controller = data["controller"]
+    controller._password = validated._password
+    controller._md5password = validated._md5password
+    await data["coordinator"].async_refresh()
+    return True
+
+
+@callback
+def _async_apply_options(
+    entry: ConfigEntry,
+    polling: OpenSprinklerPollScheduler,
+    updater: OpenSprinklerDataUpdater,
+) -> None:
+    """Apply the entry options to its polling and updater."""
+    options = entry.options
+    scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    polling.set_interval(entry.entry_id, scan_interval)
+    for latency in (updater.poll_latency, updater.command_latency):
+        latency.floor = options.get(CONF_MIN_TIMEOUT, MIN_TIMEOUT)
+        latency.ceiling = options.get(CONF_TIMEOUT, TIMEOUT)
+    updater.max_consecutive_failures = options.get(
+        CONF_MAX_CONSECUTIVE_FAILURES, MAX_CONSECUTIVE_UPDATE_FAILURES
+    )
+    updater.command_queue.enabled = options.get(CONF_COMMAND_QUEUE, False)
+    updater.command_queue.expiry = (
+        options.get(CONF_COMMAND_EXPIRY, DEFAULT_COMMAND_EXPIRY) * 60
+    )
+
+
+def _get_layout(entry: ConfigEntry) -> dict:
+    """Return the options that decide which entities are created."""
+    return {option: entry.options.get(option, False) for option in LAYOUT_OPTIONS}
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running controller without a reload.
+
+    Options that decide which entities are created, and the scan interval
+    the keep-alive of the connection pool is set from, reload the entry.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    if (
+        _get_layout(entry) != data["layout"]
+        or data["connection"].keepalive_timeout != scan_interval + KEEPALIVE_MARGIN
+    ):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    _async_apply_options(entry, async_get_poll_scheduler(hass), data["updater"])
+
+
+def _get_run_log_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the directory of the run log cache of an entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}_runlog_{entry.entry_id}")
+
+
+async def _async_setup_run_log(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: DataUpdateCoordinator,
+    controller: OpenSprinkler,
+) -> tuple[OpenSprinklerRunLog, Any]:
+    """Load the run log cache and fetch new records when a run has ended.
+
+    With the recorder loaded, the fetched runs are also imported into hourly
+    statistics, and the log is fetched every hour to complete the last hour.
+    """
+    run_log = OpenSprinklerRunLog(hass, controller, _get_run_log_path(hass, entry))
+    await run_log.async_load()
+
+    statistics = None
+    if "recorder" in hass.config.components:
+        # The recorder is optional, only import it when it is loaded
+        from .stats import OpenSprinklerStatistics
+
+        statistics = OpenSprinklerStatistics(
+            hass, entry, controller, coordinator, run_log
+        )
+        await statistics.async_load()
+
+    last_run_end_time = None
+
+    async def _async_fetch(now: int) -> None:
+        """Fetch the run log up to a controller local time."""
+        nonlocal last_run_end_time
+        try:
+            await run_log.async_fetch(now)
+            if statistics is not None:
+                await statistics.async_import()
+        except (
+            OpenSprinklerConnectionError,
+            OpenSprinklerAuthError,
+            OpenSprinklerApiError,
+            asyncio.TimeoutError,
+        ) as exc:
+            _LOGGER.debug("Fetching the OpenSprinkler run log failed: %r", exc)
+            # Try again on the next poll
+            last_run_end_time = None
+            return
+
+        coordinator.async_update_listeners()
+
+    @callback
+    def _async_check_last_run() -> None:
+        nonlocal last_run_end_time
+        data = coordinator.data
+        if data is None or data.last_run_end_time == last_run_end_time:
+            return
+
+        last_run_end_time = data.last_run_end_time
+        # The run log is kept in the controller's local time
+        entry.async_create_task(hass, _async_fetch(data.device_time + data.utc_offset))
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_last_run))
+    _async_check_last_run()
+
+    if statistics is not None:
+
+        @callback
+        def _async_hourly_fetch(_) -> None:
+            data = coordinator.data
+            if data is not None:
+                entry.async_create_task(
+                    hass, _async_fetch(data.device_time + data.utc_offset)
+                )
+
+        entry.async_on_unload(
+            async_track_time_change(hass, _async_hourly_fetch, minute=1, second=0)
+        )
+
+    return run_log, statistics
+
+
+def _get_topology(controller: OpenSprinkler) -> tuple[frozenset, frozenset]:
+    """Return the program and station indexes currently on the controller."""
+    # pyopensprinkler never forgets a station, so drop the ones that are gone
+    # (e.g. after an expansion board was removed) before taking the indexes.
+    station_count = len(controller._state["stations"]["snames"])
+    for index in [index for index in controller.stations if index >= station_count]:
+        del controller.stations[index]
+
+    return frozenset(controller.programs), frozenset(controller.stations)
+
+
+def _entity_indexes(entity) -> tuple[tuple[str, int], ...]:
+    """Return the program and station indexes an entity belongs to."""
+    return tuple(
+        (kind, getattr(entity, f"_{kind}").index)
+        for kind in ("program", "station")
+        if hasattr(entity, f"_{kind}")
+    )
+
+
+def _unique_id_template(
+    unique_id: str, indexes: tuple[tuple[str, int], ...]
+) -> tuple[str, tuple[str, ...]]:
+    """Return a unique id without its trailing indexes, and their kinds."""
+    suffix = "".join(f"_{index}" for _, index in indexes)
+    return unique_id[: -len(suffix)], tuple(kind for kind, _ in indexes)
+
+
+async def async_setup_platform_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities,
+    create_entities,
+) -> None:
+    """Add a platform's entities and keep them in sync with the controller.
+
+    When programs or stations are added to or removed from the controller,
+    only the entities of the affected programs and stations are added or
+    removed; the rest of the platform is left untouched. Entities that are
+    not created because of an option or a controller setting (e.g. without a
+    flow sensor) are kept in the registry, with their customizations.
+    """
+    platform = async_get_current_platform()
+    platform_domain = platform.domain
+    entity_registry = er.async_get(hass)
+    controller = hass.data[DOMAIN][entry.entry_id]["controller"]
+    start = monotonic()
+    entities = {entity.unique_id: entity for entity in create_entities(hass, entry)}
+    constructed = monotonic()
+    # Unique ids of the program and station entities without their indexes
+    templates = {
+        _unique_id_template(entity.unique_id, indexes)
+        for entity in entities.values()
+        if (indexes := _entity_indexes(entity))
+    }
+
+    @callback
+    def _is_removed(unique_id: str) -> bool:
+        """Return whether a unique id is of a program or station that is gone."""
+        programs, stations = _get_topology(controller)
+        existing = {"program": programs, "station": stations}
+        for prefix, kinds in templates:
+            indexes = unique_id[len(prefix) :].split("_")[1:]
+            if (
+                unique_id.startswith(f"{prefix}_")
+                and len(indexes) == len(kinds)
+                and all(index.isdigit() for index in indexes)
+            ):
+                return any(
+                    int(index) not in existing[kind]
+                    for kind, index in zip(kinds, indexes)
+                )
+
+        return False
+
+    @callback
+    def _async_remove_stale(unique_ids) -> None:
+        for unique_id in unique_ids:
+            entity_id = entity_registry.async_get_entity_id(
+                platform_domain, DOMAIN, unique_id
+            )
+            if entity_id is not None:
+                _LOGGER.debug("Removing %s, no longer on the controller", entity_id)
+                entity_registry.async_remove(entity_id)
+
+    # Registry entries of programs or stations deleted while not running
+    _async_remove_stale(
+        [
+            registry_entry.unique_id
+            for registry_entry in er.async_entries_for_config_entry(
+                entity_registry, entry.entry_id
+            )
+            if registry_entry.domain == platform_domain
+            and registry_entry.unique_id not in entities
+            and _is_removed(registry_entry.unique_id)
+        ]
+    )
+
+    @callback
+    def _async_reconcile() -> None:
+        desired = {entity.unique_id: entity for entity in create_entities(hass, entry)}
+        templates.update(
+            _unique_id_template(entity.unique_id, indexes)
+            for entity in desired.values()
+            if (indexes := _entity_indexes(entity))
+        )
+        stale = [
+            unique_id
+            for unique_id in entities.keys() - desired.keys()
+            if _is_removed(unique_id)
+        ]
+        for unique_id in stale:
+            del entities[unique_id]
+        _async_remove_stale(stale)
+
+        added = [
+            entity for unique_id, entity in desired.items() if unique_id not in entities
+        ]
+        entities.update((entity.unique_id, entity) for entity in added)
+        async_add_entities(added)
+
+    # Connected before the entities are added, so a change meanwhile is seen
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_TOPOLOGY_UPDATED.format(entry.entry_id), _async_reconcile
+        )
+    )
+    # Added here rather than scheduled, so the time it takes can be recorded
+    initial = list(entities.values())
+    await platform.async_add_entities(initial)
+    hass.data[DOMAIN][entry.entry_id]["setup_timings"].add_platform(
+        platform_domain, len(initial), constructed - start, monotonic() - constructed
+    )
+
 
 def async_get_entities(hass: HomeAssistant):
     """Get entities for a domain."""
@@ -147,34 +578,128 @@ def async_get_entities(hass: HomeAssistant):
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up OpenSprinkler from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    timings = SetupTimings()
 
     url = entry.data.get(CONF_URL)
     password = entry.data.get(CONF_PASSWORD)
     verify_ssl = entry.data.get(CONF_VERIFY_SSL)
-    opts = {"session": async_get_clientsession(hass), "verify_ssl": verify_ssl}
-
-    controller = OpenSprinkler(url, password, opts)
+    # The SSL verification is part of the connection pool, so it is not
+    # passed to pyopensprinkler as a per request setting.
+    connection = OpenSprinklerConnection(
+        hass,
+        verify_ssl,
+        entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+    )
+    opts = {"session": connection.session}
+
+    # Reuse the controller the config flow just downloaded, if there is one
+    probe = async_pop_probe(hass, entry.unique_id)
+    if probe is not None:
+        probe._http_client = connection.session
+        probe._opts.pop("verify_ssl", None)
+    controller = probe or OpenSprinkler(url, password, opts)
     controller.refresh_on_update = False
     updater = OpenSprinklerDataUpdater(controller)
+    updater.totalizer = FlowTotalizer(hass, entry.entry_id)
+    await updater.totalizer.async_load()
+    updater.baselines = StationBaselines(hass, entry.entry_id)
+    await updater.baselines.async_load()
+    updater.command_queue = OpenSprinklerCommandQueue(
+        hass, entry.entry_id, controller, updater.command_latency
+    )
+    await updater.command_queue.async_load()
+    timings.end_phase("controller")
 
-    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
         name=f"{entry.data.get(CONF_NAME, DEFAULT_NAME)} resource status",
-        update_method=updater.async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
+        update_method=updater.async_update_snapshot,
     )
+    # Polls are scheduled for all controllers together, not by the coordinator
+    polling = async_get_poll_scheduler(hass)
+    remove_polling = polling.async_add(entry, coordinator)
+    _async_apply_options(entry, polling, updater)
 
     # initial load before loading platforms
-    await coordinator.async_config_entry_first_refresh()
+    if probe is not None:
+        _LOGGER.debug("Using OpenSprinkler state validated by the config flow")
+        coordinator.async_set_updated_data(updater.get_snapshot())
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            remove_polling()
+            await connection.async_close()
+            raise
+    entry.async_on_unload(remove_polling)
+    timings.end_phase("first_refresh")
 
+    run_log = statistics = None
+    if entry.options.get(CONF_RUN_LOG, False):
+        run_log, statistics = await _async_setup_run_log(
+            hass, entry, coordinator, controller
+        )
+        timings.end_phase("run_log")
+
+    schedule = ScheduleCache()
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "controller": controller,
+        "updater": updater,
+        "connection": connection,
+        "totalizer": updater.totalizer,
+        "baselines": updater.baselines,
+        "command_queue": updater.command_queue,
+        "schedule": schedule,
+        "skipped_writes": Counter(),
+        "deadband_suppressed": Counter(),
+        "scheduler": NextRunScheduler(schedule),
+        "run_log": run_log,
+        "statistics": statistics,
+        "layout": _get_layout(entry),
+        "setup_timings": timings,
     }
 
+    topology = _get_topology(controller)
+
+    @callback
+    def _async_check_topology() -> None:
+        """Tell the platforms when programs or stations come or go."""
+        nonlocal topology
+        current = _get_topology(controller)
+        if current == topology:
+            return
+
+        _LOGGER.debug(
+            "OpenSprinkler topology changed from %d programs/%d stations "
+            "to %d programs/%d stations",
+            len(topology[0]),
+            len(topology[1]),
+            len(current[0]),
+            len(current[1]),
+        )
+        topology = current
+        async_dispatcher_send(hass, SIGNAL_TOPOLOGY_UPDATED.format(entry.entry_id))
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_topology))
+
+    emitter = OpenSprinklerEventEmitter(hass, entry.entry_id, coordinator.data)
+
+    @callback
+    def _async_fire_events() -> None:
+        """Fire the station and program events of the latest poll."""
+        emitter.async_update(coordinator.data)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_fire_events))
+
+    timings.end_phase("listeners")
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    timings.end_phase("platforms")
+
+    async_register_websocket_commands(hass)
 
     # Setup services
     async def _async_send_run_command(call: ServiceCall) -> None:
@@ -281,6 +806,61 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         service_func=_async_send_reboot_command,
     )
 
+    async def _async_send_set_start_times_command(call: ServiceCall) -> None:
+        await entity_service_call(
+            hass, async_get_entities(hass), SERVICE_SET_START_TIMES, call
+        )
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_SET_START_TIMES,
+        schema=cv.make_entity_service_schema(SCHEMA_SERVICE_SET_START_TIMES),
+        service_func=_async_send_set_start_times_command,
+    )
+
+    async def _async_send_export_programs_command(call: ServiceCall) -> ServiceResponse:
+        return await entity_service_call(
+            hass, async_get_entities(hass), SERVICE_EXPORT_PROGRAMS, call
+        )
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_EXPORT_PROGRAMS,
+        schema=cv.make_entity_service_schema(SCHEMA_SERVICE_EXPORT_PROGRAMS),
+        service_func=_async_send_export_programs_command,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_send_import_programs_command(call: ServiceCall) -> ServiceResponse:
+        return await entity_service_call(
+            hass, async_get_entities(hass), SERVICE_IMPORT_PROGRAMS, call
+        )
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_IMPORT_PROGRAMS,
+        schema=cv.make_entity_service_schema(SCHEMA_SERVICE_IMPORT_PROGRAMS),
+        service_func=_async_send_import_programs_command,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_send_profile_command(call: ServiceCall) -> ServiceResponse:
+        return await entity_service_call(
+            hass, async_get_entities(hass), SERVICE_PROFILE, call
+        )
+
+    hass.services.async_register(
+        domain=DOMAIN,
+        service=SERVICE_PROFILE,
+        schema=cv.make_entity_service_schema(SCHEMA_SERVICE_PROFILE),
+        service_func=_async_send_profile_command,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    timings.end_phase("services")
+    _LOGGER.debug(
+        "Set up %s in %s", entry.data.get(CONF_NAME, DEFAULT_NAME), timings.summary()
+    )
+
     return True
 
 
@@ -295,11 +875,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         )
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
+        await data["totalizer"].async_save()
+        await data["baselines"].async_save()
+        await data["connection"].async_close()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the run log cache and the stored data of a deleted entry."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, _get_run_log_path(hass, entry), True
+    )
+    for key in (
+        STATISTICS_STORAGE_KEY,
+        FLOW_STORAGE_KEY,
+        COMMANDS_STORAGE_KEY,
+        BASELINES_STORAGE_KEY,
+    ):
+        await Store(hass, 1, key.format(entry.entry_id)).async_remove()
+
+
 class OpenSprinklerEntity(RestoreEntity):
     """Define a generic OpenSprinkler entity."""
 
@@ -313,11 +911,33 @@ class OpenSprinklerEntity(RestoreEntity):
         """Retrieve the state."""
         raise NotImplementedError
 
+    def _exists(self) -> bool:
+        """Return whether the entity still exists on the controller."""
+        return True
+
+    def _skip_write(self, unchanged: bool) -> bool:
+        """Return whether a write can be skipped, as it would change nothing.
+
+        Skipped writes make no request and no refresh, and are counted for
+        diagnostics.
+        """
+        if not unchanged:
+            return False
+
+        data = self.hass.data[DOMAIN][self._entry.entry_id]
+        # Queued commands change the value once the controller is back
+        if data["command_queue"].pending:
+            return False
+
+        _LOGGER.debug("Skipping write to %s, the value is already set", self.entity_id)
+        data["skipped_writes"][self._entity_type] += 1
+        return True
+
     @property
     def device_info(self):
         """Return device information about Opensprinkler Controller."""
 
-        controller = self.hass.data[DOMAIN][self._entry.entry_id]["controller"]
+        controller = self._coordinator.data
 
         model = controller.hardware_version_name or "Unknown"
         if controller.hardware_type_name:
@@ -347,9 +967,17 @@ class OpenSprinklerEntity(RestoreEntity):
 
     async def async_added_to_hass(self):
         self.async_on_remove(
-            self._coordinator.async_add_listener(self.async_write_ha_state)
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
         )
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state unless the entity is being removed."""
+        # Entities of a deleted program or station still receive the update
+        # that removes them, and would fail reading their state.
+        if self._exists():
+            self.async_write_ha_state()
+
     async def async_update(self):
         """Update latest state."""
         await self._coordinator.async_request_refresh()
@@ -377,6 +1005,81 @@ class OpenSprinklerSensor(OpenSprinklerEntity):
         return self._get_state()
 
 
+def exceeds_deadband(old, new, absolute: float, relative: float) -> bool:
+    """Return whether a value moved out of the deadband around the previous one.
+
+    The deadband is the larger of the absolute one and the relative one times
+    the previous value. Changes from or to zero (or no value) always count.
+    """
+    if new == old:
+        return False
+    if not old or not new:
+        return True
+
+    return abs(new - old) >= max(absolute, relative * abs(old))
+
+
+class OpenSprinklerAnalogSensor(OpenSprinklerSensor):
+    """Define an OpenSprinkler sensor of a measurement that jitters.
+
+    The state is only written once the value moves out of the deadband around
+    the state last written, so it is never further from the value than the
+    deadband for longer than the maximum silence. Smaller changes are written
+    once the state has not been written for the maximum silence.
+    """
+
+    # Option with the absolute deadband, in the unit of the sensor
+    _deadband_option: str
+
+    _written = None
+    _written_at = 0.0
+    _written_available = None
+    _written_attributes = None
+
+    async def async_added_to_hass(self):
+        self._remember_written()
+        await super().async_added_to_hass()
+
+    def _remember_written(self) -> None:
+        self._written = self._get_state()
+        self._written_at = monotonic()
+        self._written_available = self.available
+        self._written_attributes = self.extra_state_attributes
+
+    @property
+    def state(self):
+        """Return the state last written."""
+        return self._written
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state unless it is within the deadband."""
+        options = self._entry.options
+        value = self._get_state()
+        silence = monotonic() - self._written_at
+        if (
+            self.available == self._written_available
+            and self.extra_state_attributes == self._written_attributes
+            and not exceeds_deadband(
+                self._written,
+                value,
+                options.get(self._deadband_option, 0),
+                options.get(CONF_RELATIVE_DEADBAND, 0) / 100,
+            )
+            and (
+                value == self._written
+                or silence < options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE)
+            )
+        ):
+            if value != self._written:
+                data = self.hass.data[DOMAIN][self._entry.entry_id]
+                data["deadband_suppressed"][self._deadband_option] += 1
+            return
+
+        self._remember_written()
+        self.async_write_ha_state()
+
+
 class OpenSprinklerNumber(OpenSprinklerEntity):
     """Define a generic OpenSprinkler number."""
 
@@ -394,6 +1097,11 @@ class OpenSprinklerTime(OpenSprinklerEntity):
 
 
 class OpenSprinklerControllerEntity:
+    @property
+    def _controller_data(self) -> ControllerSnapshot:
+        """Return the controller as of the last poll."""
+        return self._coordinator.data
+
     async def run_once(
         self,
         run_seconds=None,
@@ -500,8 +1208,62 @@ class OpenSprinklerControllerEntity:
         await self._controller.reboot()
         await self._coordinator.async_request_refresh()
 
+    async def export_programs(self) -> dict:
+        """Return the definition of every program."""
+        return {
+            "programs": [
+                export_program(index, data)
+                for index, data in enumerate(self._controller._state["programs"]["pd"])
+            ]
+        }
+
+    async def import_programs(self, programs: list[dict]) -> dict:
+        """Write the programs that differ from their definitions, one request each."""
+        writes = plan_import(
+            self._controller._state["programs"]["pd"],
+            programs,
+            len(self._controller_data.stations),
+        )
+        for definition, pid in writes:
+            await self._controller.request("/cp", program_params(definition, pid))
+
+        if writes:
+            await self._coordinator.async_request_refresh()
+        return {"written": [definition["index"] for definition, _ in writes]}
+
+    async def profile(self, cycles: int) -> dict:
+        """Profile the next update cycles, and return the file written."""
+        path = self.hass.config.path(
+            f"{DOMAIN}_profile.{int(utcnow().timestamp())}.cprof"
+        )
+        profiler = CoordinatorProfiler(
+            self.hass,
+            self._coordinator,
+            cycles,
+            self._entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        )
+        remove_unload_listener = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_ENTRY_UNLOADED.format(self._entry.entry_id),
+            profiler.async_stop,
+        )
+        try:
+            await profiler.async_run(path)
+        finally:
+            remove_unload_listener()
+        return {"path": path, "cycles": profiler.completed}
+
 
 class OpenSprinklerProgramEntity:
+    @property
+    def _program_data(self) -> ProgramSnapshot:
+        """Return the program as of the last poll."""
+        return self._coordinator.data.programs[self._program.index]
+
+    def _exists(self) -> bool:
+        """Return whether the program still exists on the controller."""
+        return self._program.index < len(self._coordinator.data.programs)
+
     @property
     def extra_state_attributes(self):
         attributes = {"opensprinkler_type": "program"}
@@ -510,7 +1272,7 @@ class OpenSprinklerProgramEntity:
             "index",
         ]:
             try:
-                attributes[attr] = getattr(self._program, attr)
+                attributes[attr] = getattr(self._program_data, attr)
             except:  # noqa: E722
                 pass
 
@@ -531,8 +1293,48 @@ class OpenSprinklerProgramEntity:
         await self._program.run(**kwargs)
         await self._coordinator.async_request_refresh()
 
+    async def set_start_times(self, start_times):
+        """Set all start times of the program in one request.
+
+        Start times that are not given are disabled. A repeating program only
+        has start0, the other slots hold its repeat count and interval.
+        """
+        encoded = []
+        for start_time in start_times:
+            offset_type = start_time[CONF_OFFSET_TYPE]
+            offset = start_time.get(CONF_OFFSET, 0)
+            if offset_type == START_TIME_MIDNIGHT and offset < 0:
+                raise ValueError("Start time offset from midnight cannot be negative")
+            encoded.append(self._program._encode_offset_minutes(offset_type, offset))
+
+        if self._program_data.start_time_type == 0:
+            if len(encoded) > 1:
+                raise RuntimeError(
+                    "Cannot update start1-3 when start time type is 'repeating'"
+                )
+            encoded = (encoded or [-1]) + list(
+                self._program_data.program_start_times[1:]
+            )
+        else:
+            encoded += [-1] * (4 - len(encoded))
+
+        if self._skip_write(encoded == list(self._program_data.program_start_times)):
+            return
+
+        await self._program.set_program_start_times(encoded)
+        await self._coordinator.async_request_refresh()
+
 
 class OpenSprinklerStationEntity:
+    @property
+    def _station_data(self) -> StationSnapshot:
+        """Return the station as of the last poll."""
+        return self._coordinator.data.stations[self._station.index]
+
+    def _exists(self) -> bool:
+        """Return whether the station still exists on the controller."""
+        return self._station.index < len(self._coordinator.data.stations)
+
     @property
     def extra_state_attributes(self):
         attributes = {"opensprinkler_type": "station"}
@@ -543,12 +1345,12 @@ class OpenSprinklerStationEntity:
             "running_program_id",
         ]:
             try:
-                attributes[attr] = getattr(self._station, attr)
+                attributes[attr] = getattr(self._station_data, attr)
             except:  # noqa: E722
                 pass
 
         for attr in ["start_time", "end_time"]:
-            timestamp = getattr(self._station, attr, 0)
+            timestamp = getattr(self._station_data, attr, 0)
             if not timestamp:
                 attributes[attr] = None
             else:
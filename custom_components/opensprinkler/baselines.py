@@ -0,0 +1,179 @@
+"""Per-station baselines of the current draw and flow, learned while polling."""
+
+import logging
+from dataclasses import dataclass
+from math import sqrt
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import BASELINES_STORAGE_KEY, EVENT_STATION_DEVIATION
+from .snapshot import ControllerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# Measured quantities, the snapshot fields they are read from
+QUANTITIES = ("current_draw", "flow_rate")
+
+# Seconds a station runs before it is measured, so the inrush current and
+# filling the pipes are not learned
+SETTLE_SECONDS = 30
+
+# Samples learned before deviations are reported
+MIN_SAMPLES = 20
+
+# Standard deviations from the mean a sample deviates at
+DEVIATION_THRESHOLD = 4
+
+# Lowest spread, as a fraction of the mean, so a station that always
+# measured the same value does not deviate on the smallest change
+MIN_SPREAD = 0.05
+
+# Seconds the baselines may be held in memory before they are saved
+SAVE_DELAY = 300
+
+STORAGE_VERSION = 1
+
+
+@dataclass
+class RunningStats:
+    """Mean and variance of a stream of samples, updated with Welford's method."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Return the sample standard deviation."""
+        if self.count < 2:
+            return 0.0
+
+        return sqrt(self.m2 / (self.count - 1))
+
+    def deviation(self, value: float) -> float | None:
+        """Return how many standard deviations a value is from the mean."""
+        if self.count < MIN_SAMPLES:
+            return None
+
+        spread = max(self.std, abs(self.mean) * MIN_SPREAD)
+        if not spread:
+            return None
+
+        return (value - self.mean) / spread
+
+
+class StationBaselines:
+    """Learn the current draw and flow of each station as it runs alone.
+
+    A poll is learned while exactly one (non master) station runs, once it
+    has run for SETTLE_SECONDS. Each sample is first compared with what was
+    learned before it, and an event is fired the first time in a run a
+    quantity deviates by DEVIATION_THRESHOLD or more. The baselines keep
+    learning, so a lasting change becomes the new normal over later runs.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._store = Store(
+            hass, STORAGE_VERSION, BASELINES_STORAGE_KEY.format(entry_id)
+        )
+        self.stats: dict[tuple[str, int], RunningStats] = {}
+        # Deviation of the last sample of each station, in this run of Home
+        # Assistant
+        self.deviations: dict[tuple[str, int], float | None] = {}
+        # Start time of the run each deviation event was fired for
+        self._reported: dict[tuple[str, int], int] = {}
+
+    async def async_load(self) -> None:
+        """Load the baselines saved by a previous run."""
+        data = await self._store.async_load() or {}
+        self.stats = {
+            (quantity, int(index)): RunningStats(*values)
+            for quantity in QUANTITIES
+            for index, values in data.get(quantity, {}).items()
+        }
+
+    async def async_save(self) -> None:
+        """Save the baselines now."""
+        await self._store.async_save(self._data())
+
+    def _data(self) -> dict:
+        data = {quantity: {} for quantity in QUANTITIES}
+        for (quantity, index), stats in self.stats.items():
+            data[quantity][index] = [stats.count, stats.mean, stats.m2]
+        return data
+
+    @callback
+    def add_sample(self, snapshot: ControllerSnapshot) -> None:
+        """Learn a poll if exactly one station has been running for a while."""
+        running = [
+            station
+            for station in snapshot.stations
+            if snapshot.is_station_running(station.index) and not station.is_master
+        ]
+        if len(running) != 1:
+            return
+
+        station = running[0]
+        if snapshot.device_time - station.start_time < SETTLE_SECONDS:
+            return
+
+        for quantity in QUANTITIES:
+            value = getattr(snapshot, quantity)
+            if value is None:
+                continue
+
+            key = (quantity, station.index)
+            stats = self.stats.setdefault(key, RunningStats())
+            deviation = self.deviations[key] = stats.deviation(value)
+            if (
+                deviation is not None
+                and abs(deviation) >= DEVIATION_THRESHOLD
+                and self._reported.get(key) != station.start_time
+            ):
+                self._reported[key] = station.start_time
+                self._fire(quantity, station.index, value, stats, deviation)
+            stats.add(value)
+
+        self._store.async_delay_save(self._data, SAVE_DELAY)
+
+    def _fire(
+        self,
+        quantity: str,
+        index: int,
+        value: float,
+        stats: RunningStats,
+        deviation: float,
+    ) -> None:
+        data = {
+            "config_entry_id": self._entry_id,
+            "station": index,
+            "quantity": quantity,
+            "value": value,
+            "mean": stats.mean,
+            "std": stats.std,
+            "deviation": deviation,
+        }
+        _LOGGER.debug("Firing %s: %s", EVENT_STATION_DEVIATION, data)
+        self._hass.bus.async_fire(EVENT_STATION_DEVIATION, data)
+
+    def as_dict(self) -> dict:
+        """Return the number of stations learned for diagnostics."""
+        return {
+            quantity: sum(
+                stats.count >= MIN_SAMPLES
+                for (learned, _), stats in self.stats.items()
+                if learned == quantity
+            )
+            for quantity in QUANTITIES
+        }
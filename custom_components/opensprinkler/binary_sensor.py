@@ -16,6 +16,7 @@ from . import (
     OpenSprinklerControllerEntity,
     OpenSprinklerProgramEntity,
     OpenSprinklerStationEntity,
+    async_setup_platform_entities,
 )
 from .const import DOMAIN
 
@@ -28,8 +29,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler binary sensors."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -91,7 +93,7 @@ class ControllerSensorActive(
 
     @property
     def extra_state_attributes(self):
-        controller = self._controller
+        controller = self._controller_data
         attributes = {}
         try:
             attributes[self._sensor + "_enabled"] = getattr(
@@ -104,7 +106,7 @@ class ControllerSensorActive(
 
     def _get_state(self) -> int:
         """Retrieve latest state."""
-        return bool(getattr(self._controller, self._attr))
+        return bool(getattr(self._controller_data, self._attr))
 
 
 class ProgramIsRunningBinarySensor(
@@ -126,7 +128,7 @@ class ProgramIsRunningBinarySensor(
     @property
     def name(self) -> str:
         """Return the name of this sensor."""
-        return self._program.name + " Program Running"
+        return self._program_data.name + " Program Running"
 
     @property
     def unique_id(self) -> str:
@@ -138,14 +140,25 @@ class ProgramIsRunningBinarySensor(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._program.is_running:
+        if self._get_state():
             return "mdi:timer-outline"
 
         return "mdi:timer-off-outline"
 
+    @property
+    def extra_state_attributes(self):
+        attributes = super().extra_state_attributes
+        data = self._coordinator.data
+        attributes["running_stations"] = sorted(
+            index
+            for index in data.program_stations[self._program.index]
+            if data.is_station_running(index)
+        )
+        return attributes
+
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._program.is_running)
+        return bool(self._coordinator.data.program_stations[self._program.index])
 
 
 class StationIsRunningBinarySensor(
@@ -167,7 +180,7 @@ class StationIsRunningBinarySensor(
     @property
     def name(self) -> str:
         """Return the name of this sensor."""
-        return self._station.name + " Station Running"
+        return self._station_data.name + " Station Running"
 
     @property
     def unique_id(self) -> str:
@@ -179,20 +192,20 @@ class StationIsRunningBinarySensor(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._station.is_master:
-            if self._station.is_running:
+        if self._station_data.is_master:
+            if self._get_state():
                 return "mdi:water-pump"
             else:
                 return "mdi:water-pump-off"
 
-        if self._station.is_running:
+        if self._get_state():
             return "mdi:valve-open"
 
         return "mdi:valve-closed"
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._station.is_running)
+        return self._coordinator.data.is_station_running(self._station.index)
 
 
 class PauseActiveBinarySensor(
@@ -224,11 +237,11 @@ class PauseActiveBinarySensor(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._controller.pause_active:
+        if self._controller_data.pause_active:
             return "mdi:pause"
         else:
             return "mdi:play"
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._controller.pause_active)
+        return bool(self._controller_data.pause_active)
@@ -0,0 +1,115 @@
+"""Component providing support for the OpenSprinkler schedule calendar."""
+
+import logging
+from datetime import datetime
+from typing import Callable
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+from homeassistant.util.dt import utc_from_timestamp, utcnow
+
+from . import (
+    OpenSprinklerControllerEntity,
+    OpenSprinklerEntity,
+    async_setup_platform_entities,
+)
+from .const import DOMAIN
+from .schedule import SECONDS_PER_DAY, ScheduleCache, ScheduledRun, expand
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: dict,
+    async_add_entities: Callable,
+):
+    """Set up the OpenSprinkler calendars."""
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
+
+
+def _create_entities(hass: HomeAssistant, entry: dict):
+    schedule = hass.data[DOMAIN][entry.entry_id]["schedule"]
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    name = entry.data[CONF_NAME]
+
+    return [ScheduleCalendar(entry, name, schedule, coordinator)]
+
+
+class ScheduleCalendar(
+    OpenSprinklerControllerEntity, OpenSprinklerEntity, CalendarEntity
+):
+    """Represent the upcoming program runs of a controller as a calendar.
+
+    Events are served from the schedule cache, without requests to the
+    controller.
+    """
+
+    def __init__(self, entry, name, schedule: ScheduleCache, coordinator):
+        """Set up a new OpenSprinkler schedule calendar."""
+        self._schedule = schedule
+        self._entity_type = "calendar"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def name(self) -> str:
+        """Return the name of this calendar."""
+        return f"{self._name} Schedule"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(f"{self._entry.unique_id}_{self._entity_type}_schedule")
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:calendar-clock"
+
+    def _now(self) -> int:
+        """Return the current controller time."""
+        return int(utcnow().timestamp()) + self._controller_data.utc_offset
+
+    def _event(self, run: ScheduledRun) -> CalendarEvent:
+        controller = self._controller_data
+        names = {station.index: station.name for station in controller.stations}
+        return CalendarEvent(
+            start=utc_from_timestamp(run.start - controller.utc_offset),
+            end=utc_from_timestamp(run.end - controller.utc_offset),
+            summary=controller.programs[run.program].name,
+            description="\n".join(
+                f"{names[index]}: {seconds // 60}:{seconds % 60:02d}"
+                for index, seconds in run.durations
+            ),
+            uid=f"{run.program}_{run.start}",
+        )
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next program run."""
+        now = self._now()
+        for run in self._schedule.runs(self._controller_data):
+            if run.end > now:
+                return self._event(run)
+        return None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the program runs between two times."""
+        controller = self._controller_data
+        start = int(start_date.timestamp()) + controller.utc_offset
+        end = int(end_date.timestamp()) + controller.utc_offset
+
+        runs = self._schedule.runs(controller)
+        first_day = start // SECONDS_PER_DAY - 1
+        last_day = end // SECONDS_PER_DAY
+        if first_day < self._schedule.first_day or last_day > self._schedule.last_day:
+            # Outside of the cached days, expanded without caching
+            runs = expand(controller, first_day, last_day)
+
+        return [self._event(run) for run in runs if run.end > start and run.start < end]
@@ -0,0 +1,212 @@
+"""Durable queue of OpenSprinkler commands sent while the controller is away."""
+
+import asyncio
+import logging
+from time import monotonic, time
+
+import async_timeout
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from pyopensprinkler import Controller as OpenSprinkler
+from pyopensprinkler import OpenSprinklerApiError, OpenSprinklerConnectionError
+
+from .const import COMMANDS_STORAGE_KEY
+from .latency import LatencyTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Paths of the commands that can be queued, with the parameters naming what a
+# command acts on, and whether the names of the parameters it sets are part
+# of that. A queued command replaces the earlier one acting on the same thing,
+# e.g. a station stop replaces its run, a program disable its enable.
+QUEUED_COMMANDS: dict[str, tuple[tuple[str, ...], bool]] = {
+    "/cv": ((), True),
+    "/co": ((), True),
+    "/cm": (("sid",), False),
+    "/mp": (("pid",), False),
+    "/cp": (("pid",), True),
+    "/cr": ((), False),
+    "/pq": ((), False),
+}
+
+# Commands that are never queued: whole programs (v) are built from the state
+# before the controller went away, and a reboot is no use later
+UNQUEUED_PARAMS = frozenset({"v", "rbt"})
+
+# Paths of the requests reading state (/ja, /jc, /jo, ...) instead of commands
+READ_PREFIX = "/j"
+
+
+def command_key(path: str, params: dict | None) -> tuple | None:
+    """Return what a command acts on, or None when it can not be queued."""
+    if path not in QUEUED_COMMANDS:
+        return None
+
+    params = params or {}
+    if UNQUEUED_PARAMS.intersection(params):
+        return None
+
+    targets, by_name = QUEUED_COMMANDS[path]
+    key = (path, *(params.get(name) for name in targets))
+    if by_name:
+        key += tuple(sorted(name for name in params if name not in targets))
+    return key
+
+
+class OpenSprinklerCommandQueue:
+    """Queue the commands of a controller while it can not be reached.
+
+    Once enabled, commands sent while the controller is away are saved instead
+    of failing, and sent in order once a poll reaches it again. Commands older
+    than the expiry are dropped instead of being sent. Commands time out after
+    the timeout derived from their latency.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        controller: OpenSprinkler,
+        latency: LatencyTracker,
+    ):
+        """Initialize and take over the requests of the controller."""
+        self._store = Store(
+            hass, STORAGE_VERSION, COMMANDS_STORAGE_KEY.format(entry_id)
+        )
+        self._request = controller.request
+        self._latency = latency
+        controller.request = self.async_request
+        self._commands: list[dict] = []
+        self.enabled = False
+        self.expiry = 0
+        self.offline = False
+        self.queued = 0
+        self.collapsed = 0
+        self.replayed = 0
+        self.expired = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of commands waiting for the controller."""
+        return len(self._commands)
+
+    async def async_load(self) -> None:
+        """Load the commands saved by a previous run."""
+        data = await self._store.async_load() or {}
+        self._commands = data.get("commands", [])
+
+    async def _async_save(self) -> None:
+        await self._store.async_save({"commands": self._commands})
+
+    async def async_request(
+        self, path, params=None, raw_qs=None, refresh_on_update=None
+    ) -> dict:
+        """Send a request, or queue it when the controller is away."""
+        key = command_key(path, params) if self.enabled else None
+        if key is not None and (self.offline or self._commands):
+            # Keep the order of commands sent while others are waiting
+            return await self._async_enqueue(key, path, params, raw_qs)
+
+        try:
+            return await self._async_send(path, params, raw_qs, refresh_on_update)
+        except (OpenSprinklerConnectionError, asyncio.TimeoutError):
+            if key is None:
+                raise
+            self.offline = True
+            return await self._async_enqueue(key, path, params, raw_qs)
+
+    async def _async_send(self, path, params, raw_qs, refresh_on_update=None):
+        # pyopensprinkler adds the password to the parameters
+        params = dict(params or {})
+        if path.startswith(READ_PREFIX):
+            # Polls have a timeout of their own
+            return await self._request(path, params, raw_qs, refresh_on_update)
+
+        timeout = self._latency.timeout
+        start = monotonic()
+        try:
+            async with async_timeout.timeout(timeout):
+                content = await self._request(path, params, raw_qs, refresh_on_update)
+        except asyncio.TimeoutError:
+            self._latency.add_timeout(timeout)
+            raise
+        self._latency.add(monotonic() - start)
+        return content
+
+    async def _async_enqueue(self, key, path, params, raw_qs) -> dict:
+        count = len(self._commands)
+        self._commands = [
+            command
+            for command in self._commands
+            if command_key(command["path"], command["params"]) != key
+        ]
+        self.collapsed += count - len(self._commands)
+        self._commands.append(
+            {
+                "path": path,
+                "params": dict(params or {}),
+                "raw_qs": raw_qs,
+                "time": time(),
+            }
+        )
+        self.queued += 1
+        _LOGGER.debug("Queued %s until the controller can be reached", path)
+        await self._async_save()
+        return {"result": 1}
+
+    async def async_replay(self) -> int:
+        """Send the queued commands in order, and return how many were sent.
+
+        Called once a poll reached the controller. Stops at the first command
+        the controller can not be reached for, keeping it and the rest.
+        """
+        self.offline = False
+        if not self._commands:
+            return 0
+
+        sent = 0
+        while self._commands:
+            command = self._commands[0]
+            if time() - command["time"] > self.expiry:
+                _LOGGER.debug("Dropping expired %s command", command["path"])
+                self.expired += 1
+            else:
+                try:
+                    await self._async_send(
+                        command["path"], command["params"], command["raw_qs"]
+                    )
+                except (OpenSprinklerConnectionError, asyncio.TimeoutError):
+                    self.offline = True
+                    break
+                except OpenSprinklerApiError as exc:
+                    _LOGGER.warning(
+                        "Dropping queued %s command rejected by the controller: %s",
+                        command["path"],
+                        exc,
+                    )
+                else:
+                    sent += 1
+            # Commands queued meanwhile may have replaced this one already
+            self._commands = [item for item in self._commands if item is not command]
+
+        self.replayed += sent
+        _LOGGER.debug(
+            "Replayed %d queued command(s), %d pending", sent, len(self._commands)
+        )
+        await self._async_save()
+        return sent
+
+    def as_dict(self) -> dict:
+        """Return the queue state for diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "expiry": self.expiry,
+            "offline": self.offline,
+            "pending": [command["path"] for command in self._commands],
+            "queued": self.queued,
+            "collapsed": self.collapsed,
+            "replayed": self.replayed,
+            "expired": self.expired,
+        }
@@ -10,16 +10,45 @@ from homeassistant.const import (
     CONF_MAC,
     CONF_NAME,
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
     CONF_URL,
     CONF_VERIFY_SSL,
 )
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import slugify
 from pyopensprinkler import Controller as OpenSprinkler
 from pyopensprinkler import OpenSprinklerAuthError, OpenSprinklerConnectionError
 
-from .const import DEFAULT_NAME, DEFAULT_VERIFY_SSL, DOMAIN
+from . import (
+    MAX_CONSECUTIVE_UPDATE_FAILURES,
+    MIN_TIMEOUT,
+    TIMEOUT,
+    async_store_probe,
+    async_swap_password,
+)
+from .const import (
+    CONF_COMMAND_EXPIRY,
+    CONF_COMMAND_QUEUE,
+    CONF_COMPACT_START_TIMES,
+    CONF_COMPACT_WEEKDAYS,
+    CONF_CURRENT_DRAW_DEADBAND,
+    CONF_FLOW_RATE_DEADBAND,
+    CONF_MAX_CONSECUTIVE_FAILURES,
+    CONF_MAX_SILENCE,
+    CONF_MIN_TIMEOUT,
+    CONF_RELATIVE_DEADBAND,
+    CONF_RUN_LOG,
+    CONF_WATER_LEVEL_DEADBAND,
+    DEFAULT_COMMAND_EXPIRY,
+    DEFAULT_MAX_SILENCE,
+    DEFAULT_NAME,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_VERIFY_SSL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,12 +68,82 @@ REAUTH_SCHEMA = vol.Schema(
 )
 
 
+def _options_schema(options: dict[str, Any]) -> vol.Schema:
+    """Return the options schema with the current values as defaults."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Required(
+                CONF_MIN_TIMEOUT, default=options.get(CONF_MIN_TIMEOUT, MIN_TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Required(
+                CONF_TIMEOUT, default=options.get(CONF_TIMEOUT, TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Required(
+                CONF_MAX_CONSECUTIVE_FAILURES,
+                default=options.get(
+                    CONF_MAX_CONSECUTIVE_FAILURES, MAX_CONSECUTIVE_UPDATE_FAILURES
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Required(
+                CONF_COMPACT_WEEKDAYS,
+                default=options.get(CONF_COMPACT_WEEKDAYS, False),
+            ): bool,
+            vol.Required(
+                CONF_COMPACT_START_TIMES,
+                default=options.get(CONF_COMPACT_START_TIMES, False),
+            ): bool,
+            vol.Required(
+                CONF_RUN_LOG,
+                default=options.get(CONF_RUN_LOG, False),
+            ): bool,
+            vol.Required(
+                CONF_COMMAND_QUEUE,
+                default=options.get(CONF_COMMAND_QUEUE, False),
+            ): bool,
+            vol.Required(
+                CONF_COMMAND_EXPIRY,
+                default=options.get(CONF_COMMAND_EXPIRY, DEFAULT_COMMAND_EXPIRY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10080)),
+            vol.Required(
+                CONF_FLOW_RATE_DEADBAND,
+                default=options.get(CONF_FLOW_RATE_DEADBAND, 0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Required(
+                CONF_CURRENT_DRAW_DEADBAND,
+                default=options.get(CONF_CURRENT_DRAW_DEADBAND, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Required(
+                CONF_WATER_LEVEL_DEADBAND,
+                default=options.get(CONF_WATER_LEVEL_DEADBAND, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=250)),
+            vol.Required(
+                CONF_RELATIVE_DEADBAND,
+                default=options.get(CONF_RELATIVE_DEADBAND, 0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Required(
+                CONF_MAX_SILENCE,
+                default=options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=86400)),
+        }
+    )
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for OpenSprinkler."""
 
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -71,6 +170,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 else:
                     await self.async_set_unique_id(slugify(controller.mac_address))
 
+                async_store_probe(self.hass, self.unique_id, controller)
                 return self.async_create_entry(
                     title=name,
                     data={
@@ -134,7 +234,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_PASSWORD: password,
                     },
                 )
-                await self.hass.config_entries.async_reload(existing_entry.entry_id)
+                # Keep the entities if the entry is running, only the
+                # password has changed.
+                if not await async_swap_password(self.hass, existing_entry, controller):
+                    async_store_probe(self.hass, existing_entry.unique_id, controller)
+                    await self.hass.config_entries.async_reload(existing_entry.entry_id)
                 return self.async_abort(reason="reauth_successful")
 
         return self.async_show_form(
@@ -142,5 +246,25 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle OpenSprinkler options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling and performance options."""
+        entry = self.hass.config_entries.async_get_entry(self.handler)
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_TIMEOUT] > user_input[CONF_TIMEOUT]:
+                errors[CONF_MIN_TIMEOUT] = "min_timeout_above_max"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=_options_schema(user_input or entry.options),
+            errors=errors,
+        )
+
+
 class MacAddressRequiredError(Exception):
     """Error to mac address required."""
@@ -0,0 +1,88 @@
+"""HTTP connection pool dedicated to one OpenSprinkler controller."""
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util.ssl import get_default_context, get_default_no_verify_context
+
+# pyopensprinkler sends one request at a time, a second connection only
+# covers a request racing with the previous one being released.
+MAX_CONNECTIONS = 2
+
+# Seconds an idle connection is kept open on top of the scan interval
+KEEPALIVE_MARGIN = 15
+
+
+class OpenSprinklerConnection:
+    """Keep-alive connection pool for a single controller.
+
+    The pool stays small and keeps its connections open for longer than the
+    scan interval, so that polls reuse the same TCP (and TLS) connection
+    instead of handshaking again. The SSL context is the one Home Assistant
+    caches for the ``verify_ssl`` setting, so it is built only once.
+
+    The keep-alive is set from the scan interval when the pool is created,
+    changing the scan interval reloads the entry to create a new pool.
+    """
+
+    def __init__(self, hass: HomeAssistant, verify_ssl: bool, scan_interval: int):
+        """Initialize the connection pool."""
+        self.created = 0
+        self.reused = 0
+        self.keepalive_timeout = scan_interval + KEEPALIVE_MARGIN
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+
+        self._connector = aiohttp.TCPConnector(
+            ssl=(
+                get_default_context() if verify_ssl else get_default_no_verify_context()
+            ),
+            limit=MAX_CONNECTIONS,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self._connector,
+            headers={"User-Agent": SERVER_SOFTWARE},
+            trace_configs=[trace_config],
+        )
+        self._remove_close_listener = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_close_on_stop
+        )
+
+    async def _on_connection_create(self, session, context, params) -> None:
+        self.created += 1
+
+    async def _on_connection_reuse(self, session, context, params) -> None:
+        self.reused += 1
+
+    @property
+    def reuse_rate(self) -> float | None:
+        """Return the share of requests sent on an already open connection."""
+        total = self.created + self.reused
+        if not total:
+            return None
+
+        return self.reused / total
+
+    async def _async_close_on_stop(self, event: Event) -> None:
+        self._remove_close_listener = None
+        await self.session.close()
+
+    async def async_close(self) -> None:
+        """Close the pool."""
+        if self._remove_close_listener is not None:
+            self._remove_close_listener()
+            self._remove_close_listener = None
+        await self.session.close()
+
+    def as_dict(self) -> dict:
+        """Return the pool statistics."""
+        return {
+            "connections_created": self.created,
+            "connections_reused": self.reused,
+            "reuse_rate": self.reuse_rate,
+            "keepalive_timeout": self.keepalive_timeout,
+        }
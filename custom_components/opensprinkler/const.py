@@ -12,6 +12,23 @@ CONF_SHIFT_SEQUENTIAL_STATIONS = "shift_sequential_stations"
 CONF_WATER_LEVEL = "water_level"
 CONF_RAIN_DELAY = "rain_delay"
 CONF_PAUSE_SECONDS = "pause_duration"
+CONF_MAX_CONSECUTIVE_FAILURES = "max_consecutive_failures"
+CONF_MIN_TIMEOUT = "min_timeout"
+CONF_COMPACT_WEEKDAYS = "compact_weekdays"
+CONF_COMPACT_START_TIMES = "compact_start_times"
+CONF_RUN_LOG = "run_log"
+CONF_COMMAND_QUEUE = "command_queue"
+CONF_COMMAND_EXPIRY = "command_expiry"
+CONF_FLOW_RATE_DEADBAND = "flow_rate_deadband"
+CONF_CURRENT_DRAW_DEADBAND = "current_draw_deadband"
+CONF_WATER_LEVEL_DEADBAND = "water_level_deadband"
+CONF_RELATIVE_DEADBAND = "relative_deadband"
+CONF_MAX_SILENCE = "max_silence"
+CONF_START_TIMES = "start_times"
+CONF_OFFSET_TYPE = "offset_type"
+CONF_OFFSET = "offset"
+CONF_PROGRAMS = "programs"
+CONF_CYCLES = "cycles"
 
 QUEUE_OPTION_APPEND = "append"
 QUEUE_OPTION_PREEMPT = "preempt"
@@ -24,12 +41,46 @@ QUEUE_OPTION_VALUES: dict[str, int] = {
 }
 
 DOMAIN = "opensprinkler"
+DATA_PROBES = f"{DOMAIN}_probes"
+DATA_POLLING = f"{DOMAIN}_polling"
+DATA_PROFILE = f"{DOMAIN}_profile"
+
+SIGNAL_TOPOLOGY_UPDATED = f"{DOMAIN}_topology_updated_{{}}"
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+EVENT_STATION_STARTED = f"{DOMAIN}_station_started"
+EVENT_STATION_STOPPED = f"{DOMAIN}_station_stopped"
+EVENT_PROGRAM_STARTED = f"{DOMAIN}_program_started"
+EVENT_PROGRAM_STOPPED = f"{DOMAIN}_program_stopped"
+EVENT_STATION_DEVIATION = f"{DOMAIN}_station_deviation"
+
+STATISTICS_STORAGE_KEY = f"{DOMAIN}_statistics_{{}}"
+FLOW_STORAGE_KEY = f"{DOMAIN}_flow_{{}}"
+COMMANDS_STORAGE_KEY = f"{DOMAIN}_commands_{{}}"
+BASELINES_STORAGE_KEY = f"{DOMAIN}_baselines_{{}}"
 
 DEFAULT_NAME = "OpenSprinkler"
 DEFAULT_VERIFY_SSL = True
 
 DEFAULT_SCAN_INTERVAL = 5
 
+# Minutes a queued command may wait for the controller before it is dropped
+DEFAULT_COMMAND_EXPIRY = 60
+
+# Seconds a sensor state within its deadband may go without being written
+DEFAULT_MAX_SILENCE = 300
+
+# Options that change which entities are created and need a reload
+LAYOUT_OPTIONS = (CONF_COMPACT_WEEKDAYS, CONF_COMPACT_START_TIMES, CONF_RUN_LOG)
+
+# Seconds a config flow probe result may be reused by the first entry setup
+PROBE_TTL = 60
+
+START_TIME_DISABLED = "disabled"
+START_TIME_MIDNIGHT = "midnight"
+START_TIME_SUNRISE = "sunrise"
+START_TIME_SUNSET = "sunset"
+
 SCHEMA_SERVICE_RUN_SECONDS = {
     vol.Required(CONF_INDEX): cv.positive_int,
     vol.Required(CONF_RUN_SECONDS): cv.positive_int,
@@ -94,6 +145,53 @@ SCHEMA_SERVICE_PAUSE_STATIONS = {
 
 SCHEMA_SERVICE_REBOOT = {}
 
+SCHEMA_SERVICE_START_TIME = {
+    vol.Required(CONF_OFFSET_TYPE): vol.In(
+        [
+            START_TIME_DISABLED,
+            START_TIME_MIDNIGHT,
+            START_TIME_SUNRISE,
+            START_TIME_SUNSET,
+        ]
+    ),
+    vol.Optional(CONF_OFFSET, default=0): vol.All(
+        vol.Coerce(int), vol.Range(min=-1439, max=1439)
+    ),
+}
+
+SCHEMA_SERVICE_SET_START_TIMES = {
+    vol.Required(CONF_START_TIMES): vol.All(
+        cv.ensure_list, [SCHEMA_SERVICE_START_TIME], vol.Length(max=4)
+    ),
+}
+
+SCHEMA_SERVICE_EXPORT_PROGRAMS = {}
+
+# A program as exported, in the encoding of the controller. Fields that are
+# not given keep their current value.
+SCHEMA_PROGRAM_DEFINITION = {
+    vol.Optional(CONF_INDEX): vol.All(vol.Coerce(int), vol.Range(min=0, max=39)),
+    vol.Optional("name"): cv.string,
+    vol.Optional("flag"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional("days0"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional("days1"): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    vol.Optional("start_times"): vol.All([vol.Coerce(int)], vol.Length(min=4, max=4)),
+    vol.Optional("durations"): [vol.All(vol.Coerce(int), vol.Range(min=0, max=65535))],
+    vol.Optional("date_range"): vol.All([vol.Coerce(int)], vol.Length(min=2, max=2)),
+}
+
+SCHEMA_SERVICE_IMPORT_PROGRAMS = {
+    vol.Required(CONF_PROGRAMS): vol.All(
+        cv.ensure_list, [SCHEMA_PROGRAM_DEFINITION], vol.Length(max=40)
+    ),
+}
+
+SCHEMA_SERVICE_PROFILE = {
+    vol.Optional(CONF_CYCLES, default=3): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=100)
+    ),
+}
+
 SERVICE_RUN = "run"
 SERVICE_RUN_ONCE = "run_once"
 SERVICE_RUN_PROGRAM = "run_program"
@@ -103,8 +201,7 @@ SERVICE_SET_WATER_LEVEL = "set_water_level"
 SERVICE_REBOOT = "reboot"
 SERVICE_SET_RAIN_DELAY = "set_rain_delay"
 SERVICE_PAUSE_STATIONS = "pause_stations"
-
-START_TIME_DISABLED = "disabled"
-START_TIME_MIDNIGHT = "midnight"
-START_TIME_SUNRISE = "sunrise"
-START_TIME_SUNSET = "sunset"
+SERVICE_SET_START_TIMES = "set_start_times"
+SERVICE_EXPORT_PROGRAMS = "export_programs"
+SERVICE_IMPORT_PROGRAMS = "import_programs"
+SERVICE_PROFILE = "profile"
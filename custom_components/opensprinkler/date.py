@@ -9,7 +9,11 @@ from homeassistant.const import CONF_NAME, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.util import slugify
 
-from . import OpenSprinklerDate, OpenSprinklerProgramEntity
+from . import (
+    OpenSprinklerDate,
+    OpenSprinklerProgramEntity,
+    async_setup_platform_entities,
+)
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,8 +25,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler dates."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -59,7 +64,7 @@ class ProgramSingleRunStartDate(
     @property
     def name(self) -> str:
         """Return the name of this date."""
-        return f"{self._program.name} Single-run Start Date"
+        return f"{self._program_data.name} Single-run Start Date"
 
     @property
     def unique_id(self) -> str:
@@ -77,13 +82,16 @@ class ProgramSingleRunStartDate(
     def native_value(self) -> date:
         """The value of the date."""
         epoch_start = date(1970, 1, 1)
-        if self._program.program_schedule_type == 1:  # Single-run program
-            return epoch_start + timedelta(days=self._program.single_run_day)
+        if self._program_data.program_schedule_type == 1:  # Single-run program
+            return epoch_start + timedelta(days=self._program_data.single_run_day)
         else:
             return epoch_start
 
     async def async_set_value(self, value: date) -> None:
         """Update the current value."""
+        if self._skip_write(value == self.native_value):
+            return
+
         epoch_start = date(1970, 1, 1)
         days_since_epoch = (value - epoch_start).days
         await self._program.set_single_run_day(days_since_epoch)
@@ -107,7 +115,7 @@ class ProgramDateRangeFrom(OpenSprinklerProgramEntity, OpenSprinklerDate, DateEn
     @property
     def name(self) -> str:
         """Return the name of this date."""
-        return f"{self._program.name} Date Range From Date"
+        return f"{self._program_data.name} Date Range From Date"
 
     @property
     def unique_id(self) -> str:
@@ -124,11 +132,17 @@ class ProgramDateRangeFrom(OpenSprinklerProgramEntity, OpenSprinklerDate, DateEn
     @property
     def native_value(self) -> date:
         """The value of the date."""
-        from_date = self._program.date_range_from
+        from_date = self._program_data.date_range_from
         return date.today().replace(month=from_date[0], day=from_date[1])
 
     async def async_set_value(self, value: date) -> None:
         """Update the current value."""
+        # The controller only keeps the month and day
+        if self._skip_write(
+            (value.month, value.day) == tuple(self._program_data.date_range_from)
+        ):
+            return
+
         await self._program.set_date_range_from(value.month, value.day)
         await self._coordinator.async_request_refresh()
 
@@ -150,7 +164,7 @@ class ProgramDateRangeTo(OpenSprinklerProgramEntity, OpenSprinklerDate, DateEnti
     @property
     def name(self) -> str:
         """Return the name of this date."""
-        return f"{self._program.name} Date Range To Date"
+        return f"{self._program_data.name} Date Range To Date"
 
     @property
     def unique_id(self) -> str:
@@ -167,10 +181,16 @@ class ProgramDateRangeTo(OpenSprinklerProgramEntity, OpenSprinklerDate, DateEnti
     @property
     def native_value(self) -> date:
         """The value of the date."""
-        to_date = self._program.date_range_to
+        to_date = self._program_data.date_range_to
         return date.today().replace(month=to_date[0], day=to_date[1])
 
     async def async_set_value(self, value: date) -> None:
         """Update the current value."""
+        # The controller only keeps the month and day
+        if self._skip_write(
+            (value.month, value.day) == tuple(self._program_data.date_range_to)
+        ):
+            return
+
         await self._program.set_date_range_to(value.month, value.day)
         await self._coordinator.async_request_refresh()
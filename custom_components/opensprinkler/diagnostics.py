@@ -0,0 +1,42 @@
+"""Diagnostics support for OpenSprinkler."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_URL
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .polling import async_get_poll_scheduler
+
+TO_REDACT = {CONF_PASSWORD, CONF_URL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "setup_timings": data["setup_timings"].as_dict(),
+        "connection": data["connection"].as_dict(),
+        "polling": async_get_poll_scheduler(hass).as_dict(entry.entry_id),
+        "latency": {
+            "polls": data["updater"].poll_latency.as_dict(),
+            "commands": data["updater"].command_latency.as_dict(),
+        },
+        "totalizer": data["totalizer"].as_dict(),
+        "baselines": data["baselines"].as_dict(),
+        "command_queue": data["command_queue"].as_dict(),
+        "skipped_writes": dict(data["skipped_writes"]),
+        "deadband_suppressed": dict(data["deadband_suppressed"]),
+        "schedule": data["schedule"].as_dict(),
+        "scheduler": data["scheduler"].as_dict(),
+        "run_log": data["run_log"].as_dict() if data["run_log"] else None,
+        "statistics": data["statistics"].as_dict() if data["statistics"] else None,
+    }
@@ -0,0 +1,163 @@
+"""Station and program events derived from the difference between two polls."""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    EVENT_PROGRAM_STARTED,
+    EVENT_PROGRAM_STOPPED,
+    EVENT_STATION_STARTED,
+    EVENT_STATION_STOPPED,
+)
+from .schedule import station_durations
+from .snapshot import ControllerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _bits(mask: int):
+    """Yield the index of each set bit of a mask."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _station_events(
+    previous: ControllerSnapshot, current: ControllerSnapshot
+) -> list[tuple[str, dict]]:
+    events = []
+    changed = previous.running_stations ^ current.running_stations
+    # A station run again right after a run of its own, e.g. by the next
+    # program, only has a new start time
+    for index in _bits(previous.running_stations & current.running_stations):
+        if previous.stations[index].start_time != current.stations[index].start_time:
+            changed |= 1 << index
+
+    for index in _bits(changed):
+        if previous.is_station_running(index) and index < len(previous.stations):
+            station = previous.stations[index]
+            events.append(
+                (
+                    EVENT_STATION_STOPPED,
+                    {
+                        "station": index,
+                        "program_id": station.running_program_id,
+                        # The time the station ran
+                        "duration": max(current.device_time - station.start_time, 0),
+                    },
+                )
+            )
+        if current.is_station_running(index) and index < len(current.stations):
+            station = current.stations[index]
+            events.append(
+                (
+                    EVENT_STATION_STARTED,
+                    {
+                        "station": index,
+                        "program_id": station.running_program_id,
+                        # The time the station is going to run
+                        "duration": max(station.end_time - station.start_time, 0),
+                    },
+                )
+            )
+
+    return events
+
+
+def _program_events(
+    previous: ControllerSnapshot,
+    current: ControllerSnapshot,
+    program_starts: dict[int, int],
+) -> list[tuple[str, dict]]:
+    events = []
+    stations = frozenset(
+        station.index
+        for station in current.stations
+        if station.enabled and not station.is_master
+    )
+    for program in current.programs:
+        index = program.index
+        # A program runs while any of its stations runs or waits to run, so
+        # the gaps between its stations are not a stop and a start
+        was_running = index < len(previous.programs) and bool(
+            previous.program_stations[index]
+        )
+        is_running = bool(current.program_stations[index])
+        if is_running == was_running:
+            continue
+
+        if is_running:
+            program_starts[index] = current.device_time
+            durations = station_durations(
+                program, stations, current.sunrise, current.sunset, current.water_level
+            )
+            events.append(
+                (
+                    EVENT_PROGRAM_STARTED,
+                    {
+                        "program": index,
+                        "program_id": index + 1,
+                        # The time the program is going to run, with its
+                        # stations one after the other
+                        "duration": sum(seconds for _, seconds in durations),
+                    },
+                )
+            )
+        else:
+            started = program_starts.pop(index, None)
+            events.append(
+                (
+                    EVENT_PROGRAM_STOPPED,
+                    {
+                        "program": index,
+                        "program_id": index + 1,
+                        # The time the program ran, if its start was seen
+                        "duration": (
+                            None if started is None else current.device_time - started
+                        ),
+                    },
+                )
+            )
+
+    return events
+
+
+def diff_events(
+    previous: ControllerSnapshot,
+    current: ControllerSnapshot,
+    program_starts: dict[int, int],
+) -> list[tuple[str, dict]]:
+    """Return the events of the stations and programs that started or stopped.
+
+    Only the stations whose running bit changed are looked at. The controller
+    times programs were seen starting are kept in program_starts.
+    """
+    return _station_events(previous, current) + _program_events(
+        previous, current, program_starts
+    )
+
+
+class OpenSprinklerEventEmitter:
+    """Fire the events of each poll on the Home Assistant event bus."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, snapshot):
+        """Initialize with the snapshot the next poll is compared with."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._previous = snapshot
+        self._program_starts: dict[int, int] = {}
+
+    @callback
+    def async_update(self, snapshot: ControllerSnapshot) -> None:
+        """Fire the events since the previous snapshot."""
+        previous, self._previous = self._previous, snapshot
+        if previous is None or snapshot is previous:
+            return
+
+        for event_type, data in diff_events(previous, snapshot, self._program_starts):
+            _LOGGER.debug("Firing %s: %s", event_type, data)
+            self._hass.bus.async_fire(
+                event_type, {"config_entry_id": self._entry_id, **data}
+            )
@@ -0,0 +1,66 @@
+"""Request timeouts derived from the observed latency of a controller."""
+
+from collections import deque
+from math import ceil
+
+# Requests the latency percentiles are taken over
+WINDOW = 100
+
+# Requests measured before the timeout is derived from them
+MIN_SAMPLES = 10
+
+# Timeout as a multiple of the 99th percentile latency
+MULTIPLIER = 4
+
+
+class LatencyTracker:
+    """Track the latency of recent requests and derive a timeout from it.
+
+    Until enough requests are measured the timeout is the ceiling. Requests
+    that timed out count as taking the timeout, so a controller that became
+    slower raises its own timeout after a couple of failures.
+    """
+
+    def __init__(self, floor: float, ceiling: float):
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=WINDOW)
+        self.floor = floor
+        self.ceiling = ceiling
+        self.timeouts = 0
+
+    def add(self, seconds: float) -> None:
+        """Add the latency of a request."""
+        self._samples.append(seconds)
+
+    def add_timeout(self, seconds: float) -> None:
+        """Add a request that timed out after the given time."""
+        self.timeouts += 1
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the latency a fraction of the recent requests were faster than."""
+        if not self._samples:
+            return None
+
+        samples = sorted(self._samples)
+        return samples[max(ceil(fraction * len(samples)) - 1, 0)]
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout of the next request."""
+        if len(self._samples) < MIN_SAMPLES:
+            return self.ceiling
+
+        timeout = self.percentile(0.99) * MULTIPLIER
+        return min(max(timeout, self.floor), self.ceiling)
+
+    def as_dict(self) -> dict:
+        """Return the latency statistics."""
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "timeout": self.timeout,
+            "timeouts": self.timeouts,
+        }
@@ -8,8 +8,17 @@ from homeassistant.const import CONF_NAME, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.util import slugify
 
-from . import OpenSprinklerNumber, OpenSprinklerProgramEntity
-from .const import DOMAIN, START_TIME_SUNRISE, START_TIME_SUNSET
+from . import (
+    OpenSprinklerNumber,
+    OpenSprinklerProgramEntity,
+    async_setup_platform_entities,
+)
+from .const import (
+    CONF_COMPACT_START_TIMES,
+    DOMAIN,
+    START_TIME_SUNRISE,
+    START_TIME_SUNSET,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,8 +29,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler numbers."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -47,6 +57,10 @@ def _create_entities(hass: HomeAssistant, entry: dict):
         entities.append(
             ProgramStartTimeRepeatIntervalNumber(entry, name, program, coordinator)
         )
+        # The start times are a single text entity in compact mode
+        if entry.options.get(CONF_COMPACT_START_TIMES, False):
+            continue
+
         for start_index in range(4):
             entities.append(
                 ProgramStartTimeOffsetNumber(
@@ -69,6 +83,12 @@ class ProgramDurationNumber(
         self._entity_type = "number"
         super().__init__(entry, name, coordinator)
 
+    def _exists(self) -> bool:
+        """Return whether both the program and the station still exist."""
+        return super()._exists() and self._station.index < len(
+            self._coordinator.data.stations
+        )
+
     @property
     def entity_category(self):
         """Return the entity category."""
@@ -82,7 +102,8 @@ class ProgramDurationNumber(
     @property
     def name(self) -> str:
         """Return the name of this sensor."""
-        return f"{self._program.name} {self._station.name} Station Duration"
+        station = self._coordinator.data.stations[self._station.index]
+        return f"{self._program_data.name} {station.name} Station Duration"
 
     @property
     def unique_id(self) -> str:
@@ -119,13 +140,17 @@ class ProgramDurationNumber(
     @property
     def native_value(self) -> float:
         """The value of the number in the number's native_unit_of_measurement."""
-        return round(self._program.station_durations[self._station.index] / 60.0)
+        return round(self._program_data.station_durations[self._station.index] / 60.0)
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        await self._program.set_station_duration(
-            self._station.index, round(value * 60.0)
-        )
+        seconds = round(value * 60.0)
+        if self._skip_write(
+            seconds == self._program_data.station_durations[self._station.index]
+        ):
+            return
+
+        await self._program.set_station_duration(self._station.index, seconds)
         await self._coordinator.async_request_refresh()
 
 
@@ -153,7 +178,7 @@ class ProgramIntervalDaysNumber(
     @property
     def name(self) -> str:
         """Return the name of this number."""
-        return f"{self._program.name} Interval Days"
+        return f"{self._program_data.name} Interval Days"
 
     @property
     def unique_id(self) -> str:
@@ -185,7 +210,7 @@ class ProgramIntervalDaysNumber(
     @property
     def native_min_value(self) -> float:
         """The minimum accepted value in the number's native_unit_of_measurement."""
-        return max(1.0, self._program.starting_in_days + 1.0)
+        return max(1.0, self._program_data.starting_in_days + 1.0)
 
     @property
     def native_step(self) -> float:
@@ -195,10 +220,13 @@ class ProgramIntervalDaysNumber(
     @property
     def native_value(self) -> float:
         """The value of the number in the number's native_unit_of_measurement."""
-        return self._program.interval_days
+        return self._program_data.interval_days
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        if self._skip_write(round(value) == self.native_value):
+            return
+
         await self._program.set_interval_days(round(value))
         await self._coordinator.async_request_refresh()
 
@@ -227,7 +255,7 @@ class ProgramStartingInDaysNumber(
     @property
     def name(self) -> str:
         """Return the name of this number."""
-        return f"{self._program.name} Starting In Days"
+        return f"{self._program_data.name} Starting In Days"
 
     @property
     def unique_id(self) -> str:
@@ -254,7 +282,7 @@ class ProgramStartingInDaysNumber(
     @property
     def native_max_value(self) -> float:
         """The maximum accepted value in the number's native_unit_of_measurement."""
-        return max(0.0, float(self._program.interval_days) - 1.0)
+        return max(0.0, float(self._program_data.interval_days) - 1.0)
 
     @property
     def native_min_value(self) -> float:
@@ -269,10 +297,13 @@ class ProgramStartingInDaysNumber(
     @property
     def native_value(self) -> float:
         """The value of the number in the number's native_unit_of_measurement."""
-        return self._program.starting_in_days
+        return self._program_data.starting_in_days
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        if self._skip_write(round(value) == self.native_value):
+            return
+
         await self._program.set_starting_in_days(round(value))
         await self._coordinator.async_request_refresh()
 
@@ -301,7 +332,7 @@ class ProgramDayofMonthNumber(
     @property
     def name(self) -> str:
         """Return the name of this number."""
-        return f"{self._program.name} Day of Month"
+        return f"{self._program_data.name} Day of Month"
 
     @property
     def unique_id(self) -> str:
@@ -343,10 +374,13 @@ class ProgramDayofMonthNumber(
     @property
     def native_value(self) -> float:
         """The value of the number in the number's native_unit_of_measurement."""
-        return self._program.monthly_day
+        return self._program_data.monthly_day
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        if self._skip_write(round(value) == self.native_value):
+            return
+
         await self._program.set_monthly_day(round(value))
         await self._coordinator.async_request_refresh()
 
@@ -377,7 +411,7 @@ class ProgramStartTimeOffsetNumber(
     def name(self) -> str:
         """Return the name of this number."""
         start = str(self._start_index) if self._start_index > 0 else ""
-        return f"{self._program.name} Start{start} Time Offset"
+        return f"{self._program_data.name} Start{start} Time Offset"
 
     @property
     def unique_id(self) -> str:
@@ -410,9 +444,9 @@ class ProgramStartTimeOffsetNumber(
     @property
     def native_max_value(self) -> float:
         """The maximum accepted value in the number's native_unit_of_measurement."""
-        offset_type = self._program.get_program_start_time_offset_type(
+        offset_type = self._program_data.program_start_time_offset_types[
             self._start_index
-        )
+        ]
 
         if offset_type in [START_TIME_SUNRISE, START_TIME_SUNSET]:
             max_value = 240.0
@@ -424,9 +458,9 @@ class ProgramStartTimeOffsetNumber(
     @property
     def native_min_value(self) -> float:
         """The minimum accepted value in the number's native_unit_of_measurement."""
-        offset_type = self._program.get_program_start_time_offset_type(
+        offset_type = self._program_data.program_start_time_offset_types[
             self._start_index
-        )
+        ]
 
         if offset_type in [START_TIME_SUNRISE, START_TIME_SUNSET]:
             min_value = -240.0
@@ -438,10 +472,13 @@ class ProgramStartTimeOffsetNumber(
     @property
     def native_value(self) -> float:
         """The value of the number in the number's native_unit_of_measurement."""
-        return self._program.get_program_start_time_offset(self._start_index)
+        return self._program_data.program_start_time_offsets[self._start_index]
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        if self._skip_write(int(value) == self.native_value):
+            return
+
         await self._program.set_program_start_time_offset(self._start_index, int(value))
         await self._coordinator.async_request_refresh()
 
@@ -465,7 +502,7 @@ class ProgramStartTimeRepeatCountNumber(
     @property
     def name(self) -> str:
         """Return the name of this number."""
-        return f"{self._program.name} Start Time Repeat Count"
+        return f"{self._program_data.name} Start Time Repeat Count"
 
     @property
     def unique_id(self) -> str:
@@ -502,10 +539,13 @@ class ProgramStartTimeRepeatCountNumber(
     @property
     def native_value(self) -> float:
         """The value of the number."""
-        return self._program.program_start_repeat_count
+        return self._program_data.program_start_repeat_count
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        if self._skip_write(int(value) == self.native_value):
+            return
+
         await self._program.set_program_start_repeat_count(int(value))
         await self._coordinator.async_request_refresh()
 
@@ -534,7 +574,7 @@ class ProgramStartTimeRepeatIntervalNumber(
     @property
     def name(self) -> str:
         """Return the name of this number."""
-        return f"{self._program.name} Start Time Repeat Interval"
+        return f"{self._program_data.name} Start Time Repeat Interval"
 
     @property
     def unique_id(self) -> str:
@@ -576,9 +616,12 @@ class ProgramStartTimeRepeatIntervalNumber(
     @property
     def native_value(self) -> float:
         """The value of the number in the number's native_unit_of_measurement."""
-        return self._program.program_start_repeat_interval
+        return self._program_data.program_start_repeat_interval
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        if self._skip_write(int(value) == self.native_value):
+            return
+
         await self._program.set_program_start_repeat_interval(int(value))
         await self._coordinator.async_request_refresh()
@@ -0,0 +1,178 @@
+"""Polling of all OpenSprinkler controllers, spread over the scan interval."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from math import ceil
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DATA_POLLING
+
+_LOGGER = logging.getLogger(__name__)
+
+# Polls of all controllers running at the same time
+MAX_CONCURRENT_POLLS = 3
+
+
+@dataclass
+class _Poll:
+    """Polling state of one entry."""
+
+    entry: ConfigEntry
+    coordinator: DataUpdateCoordinator
+    interval: float | None = None
+    # Offset of the polls into the interval, as a fraction of it
+    phase: float = 0.0
+    cancel: CALLBACK_TYPE | None = None
+    last_start: float | None = None
+    polls: int = 0
+    intervals: int = 0
+    interval_total: float = 0.0
+    waited: float = 0.0
+
+
+class OpenSprinklerPollScheduler:
+    """Poll the controllers of all entries at evenly spread times.
+
+    Instead of every coordinator polling on its own timer, and all of them at
+    once, each entry polls at its own offset into the scan interval: three
+    controllers polled every 6 seconds poll 2 seconds apart. All polls,
+    including the refreshes after commands, wait while the maximum number of
+    polls is running.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int = MAX_CONCURRENT_POLLS):
+        """Initialize."""
+        self._hass = hass
+        self._polls: dict[str, _Poll] = {}
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+
+    @callback
+    def async_add(self, entry: ConfigEntry, coordinator: DataUpdateCoordinator):
+        """Take over the polling of a coordinator, and return how to stop it.
+
+        The coordinator must not have an update interval of its own. Polls
+        start once the interval is set.
+        """
+        poll = self._polls[entry.entry_id] = _Poll(entry, coordinator)
+        coordinator.update_method = self._limit(poll, coordinator.update_method)
+
+        @callback
+        def _async_remove() -> None:
+            if self._polls.get(entry.entry_id) is not poll:
+                return
+            del self._polls[entry.entry_id]
+            self._async_cancel(poll)
+            self._async_rephase()
+
+        return _async_remove
+
+    def _limit(
+        self, poll: _Poll, update: Callable[[], Awaitable]
+    ) -> Callable[[], Awaitable]:
+        async def _async_update():
+            queued = self._hass.loop.time()
+            async with self._slots:
+                poll.waited += self._hass.loop.time() - queued
+                return await update()
+
+        return _async_update
+
+    @callback
+    def set_interval(self, entry_id: str, seconds: float) -> None:
+        """Set the scan interval of an entry."""
+        poll = self._polls[entry_id]
+        if poll.interval == seconds:
+            return
+        poll.interval = seconds
+        self._async_rephase()
+
+    @callback
+    def _async_rephase(self) -> None:
+        """Spread the entries evenly over the interval, and reschedule them."""
+        entry_ids = sorted(self._polls)
+        for position, entry_id in enumerate(entry_ids):
+            poll = self._polls[entry_id]
+            poll.phase = position / len(entry_ids)
+            self._async_schedule(poll)
+
+    @callback
+    def _async_cancel(self, poll: _Poll) -> None:
+        if poll.cancel is not None:
+            poll.cancel()
+            poll.cancel = None
+
+    @callback
+    def _async_schedule(self, poll: _Poll) -> None:
+        """Schedule the next poll of an entry at its phase of the interval.
+
+        A poll is at least half an interval after the previous one, so a
+        refresh requested after a command does not bring the next one forward.
+        """
+        self._async_cancel(poll)
+        if poll.interval is None:
+            return
+
+        loop = self._hass.loop
+        offset = poll.phase * poll.interval
+        earliest = loop.time() + poll.interval / 2
+        if poll.last_start is not None:
+            earliest = max(earliest, poll.last_start + poll.interval / 2)
+        slot = ceil((earliest - offset) / poll.interval) * poll.interval + offset
+        poll.cancel = loop.call_at(slot, self._async_start, poll).cancel
+
+    @callback
+    def _async_start(self, poll: _Poll) -> None:
+        poll.cancel = None
+        if self._hass.is_stopping:
+            return
+
+        now = self._hass.loop.time()
+        if poll.last_start is not None:
+            poll.intervals += 1
+            poll.interval_total += now - poll.last_start
+        poll.last_start = now
+
+        if poll.entry.pref_disable_polling:
+            self._async_schedule(poll)
+            return
+
+        self._hass.async_create_background_task(
+            self._async_poll(poll), f"opensprinkler poll {poll.entry.entry_id}"
+        )
+
+    async def _async_poll(self, poll: _Poll) -> None:
+        try:
+            await poll.coordinator.async_refresh()
+            poll.polls += 1
+        finally:
+            if self._polls.get(poll.entry.entry_id) is poll:
+                self._async_schedule(poll)
+
+    def as_dict(self, entry_id: str) -> dict:
+        """Return the polling statistics of an entry."""
+        poll = self._polls[entry_id]
+        return {
+            "entries": len(self._polls),
+            "max_concurrent_polls": self.max_concurrent,
+            "interval": poll.interval,
+            "phase": poll.phase * poll.interval if poll.interval else None,
+            "actual_interval": (
+                poll.interval_total / poll.intervals if poll.intervals else None
+            ),
+            "polls": poll.polls,
+            "waited": poll.waited,
+        }
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> OpenSprinklerPollScheduler:
+    """Return the poll scheduler shared by all entries."""
+    if DATA_POLLING not in hass.data:
+        hass.data[DATA_POLLING] = OpenSprinklerPollScheduler(hass)
+    return hass.data[DATA_POLLING]
@@ -0,0 +1,98 @@
+"""Profiling of the next update cycles of a controller."""
+
+import asyncio
+import cProfile
+import logging
+from collections.abc import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DATA_PROFILE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a profile waits for its cycles on top of their scan intervals
+TIMEOUT_MARGIN = 30
+
+
+class CoordinatorProfiler:
+    """Profile the next cycles of a coordinator with cProfile.
+
+    A cycle is an update (the requests, parsing the state) and the entity
+    state writes of the listeners after it. The profiler runs from the start
+    of each update until the listeners are done, so the rest of what the event
+    loop runs meanwhile, including waiting for the controller, is in the
+    profile too. Nothing is profiled between cycles, or once done.
+
+    A profile that does not get its cycles within their scan intervals (and a
+    margin), e.g. as polling is disabled, or that is stopped as the entry is
+    unloaded, writes the cycles it got. One profile runs at a time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DataUpdateCoordinator,
+        cycles: int,
+        scan_interval: float,
+    ):
+        """Initialize."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._cycles = cycles
+        self._timeout = cycles * scan_interval + TIMEOUT_MARGIN
+        self._profile = cProfile.Profile()
+        self._update: Callable[[], Awaitable] | None = None
+        self._done = hass.loop.create_future()
+        self.completed = 0
+
+    async def async_run(self, path: str) -> None:
+        """Profile the next cycles and write the pstats file."""
+        if self._hass.data.get(DATA_PROFILE) is not None:
+            raise ServiceValidationError(
+                "Another OpenSprinkler profile is running, profile one controller "
+                "at a time"
+            )
+
+        self._hass.data[DATA_PROFILE] = self
+        self._update = self._coordinator.update_method
+        self._coordinator.update_method = self._async_update
+        try:
+            await asyncio.wait((self._done,), timeout=self._timeout)
+        finally:
+            self._coordinator.update_method = self._update
+            self._profile.disable()
+            self._hass.data.pop(DATA_PROFILE)
+
+        if self.completed < self._cycles:
+            _LOGGER.warning(
+                "OpenSprinkler profile stopped after %d of %d update cycles",
+                self.completed,
+                self._cycles,
+            )
+        await self._hass.async_add_executor_job(self._profile.dump_stats, path)
+        _LOGGER.info("Profile of %d update cycles written to %s", self.completed, path)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop profiling, writing the cycles profiled so far."""
+        if not self._done.done():
+            self._done.set_result(None)
+
+    async def _async_update(self):
+        self._profile.enable()
+        try:
+            return await self._update()
+        finally:
+            # The coordinator calls its listeners right after the update, in
+            # the same step of its task, so this runs once they are done.
+            self._hass.loop.call_soon(self._async_end_cycle)
+
+    @callback
+    def _async_end_cycle(self) -> None:
+        self._profile.disable()
+        self.completed += 1
+        if self.completed >= self._cycles:
+            self.async_stop()
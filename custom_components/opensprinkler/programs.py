@@ -0,0 +1,100 @@
+"""Export and import of OpenSprinkler program definitions."""
+
+import json
+
+from homeassistant.exceptions import ServiceValidationError
+
+# Jan 1 to Dec 31, the range of firmware without date ranges
+DEFAULT_DATE_RANGE = [33, 415]
+
+
+def export_program(index: int, data: list) -> dict:
+    """Return the definition of a program from its /jp data."""
+    return {
+        "index": index,
+        "name": data[5],
+        "flag": data[0],
+        "days0": data[1],
+        "days1": data[2],
+        "start_times": list(data[3]),
+        "durations": list(data[4]),
+        # [enabled, from, to] since firmware 2.2.0(1), enabled is a flag bit
+        "date_range": list(data[6][1:]) if len(data) > 6 else DEFAULT_DATE_RANGE,
+    }
+
+
+def new_program(index: int, station_count: int) -> dict:
+    """Return the definition of a disabled program without start times."""
+    return {
+        "index": index,
+        "name": f"Program {index + 1}",
+        "flag": 0,
+        "days0": 0,
+        "days1": 0,
+        "start_times": [-1, -1, -1, -1],
+        "durations": [0] * station_count,
+        "date_range": DEFAULT_DATE_RANGE,
+    }
+
+
+def program_params(definition: dict, pid: int) -> dict:
+    """Return the /cp parameters writing a whole program at once."""
+    data = [
+        definition["flag"],
+        definition["days0"],
+        definition["days1"],
+        definition["start_times"],
+        definition["durations"],
+    ]
+    return {
+        "pid": pid,
+        "v": json.dumps(data, separators=(",", ":")),
+        "name": definition["name"],
+        "from": definition["date_range"][0],
+        "to": definition["date_range"][1],
+    }
+
+
+def plan_import(
+    current: list[list], desired: list[dict], station_count: int
+) -> list[tuple[dict, int]]:
+    """Return the programs that differ and the /cp program id to write each to.
+
+    Programs are matched by index, or by position when no index is given.
+    Programs past the last one are added (program id -1) in index order, so
+    their indexes have to follow the last program without a gap. Fields that
+    are not given keep their current value.
+    """
+    indexes = [
+        changes.get("index", position) for position, changes in enumerate(desired)
+    ]
+    duplicates = sorted({index for index in indexes if indexes.count(index) > 1})
+    if duplicates:
+        raise ServiceValidationError(
+            f"Programs {duplicates} are given more than once, import each once"
+        )
+
+    added = sorted(index for index in indexes if index >= len(current))
+    if added != list(range(len(current), len(current) + len(added))):
+        raise ServiceValidationError(
+            f"New programs {added} leave a gap, the next program is " f"{len(current)}"
+        )
+
+    writes = []
+    for index, changes in sorted(zip(indexes, desired), key=lambda item: item[0]):
+        if index < len(current):
+            existing = export_program(index, current[index])
+            pid = index
+        else:
+            existing = None
+            pid = -1
+
+        definition = {
+            **(existing or new_program(index, station_count)),
+            **changes,
+            "index": index,
+        }
+        if definition != existing:
+            writes.append((definition, pid))
+
+    return writes
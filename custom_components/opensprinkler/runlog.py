@@ -0,0 +1,261 @@
+"""Incremental reader of the OpenSprinkler run log with an on-disk cache."""
+
+import asyncio
+import json
+import logging
+import os
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone, tzinfo
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.file import write_utf8_file
+from pyopensprinkler import Controller as OpenSprinkler
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+# Days of history fetched on the first run and kept in the cache
+RUN_LOG_DAYS = 31
+
+CHECKPOINT_FILE = "checkpoint"
+
+
+def _day_file(day: int) -> str:
+    """Return the cache file name of a controller day."""
+    date = datetime.fromtimestamp(day * SECONDS_PER_DAY, timezone.utc)
+    return f"{date:%Y%m%d}.jsonl"
+
+
+def _file_day(file_name: str) -> int | None:
+    """Return the controller day of a cache file name."""
+    try:
+        date = datetime.strptime(file_name, "%Y%m%d.jsonl")
+    except ValueError:
+        return None
+    return int(date.replace(tzinfo=timezone.utc).timestamp()) // SECONDS_PER_DAY
+
+
+class OpenSprinklerRunLog:
+    """Runtime totals per station and program from the controller run log.
+
+    Each record ([program id, station index, duration, end time], in
+    controller time) is appended to one JSON lines file per controller day, so
+    only the days since the last fetch are requested from the controller, also
+    after a restart.
+    """
+
+    def __init__(self, hass: HomeAssistant, controller: OpenSprinkler, path: str):
+        """Initialize."""
+        self._hass = hass
+        self._controller = controller
+        self._path = path
+        self._lock = asyncio.Lock()
+        self._records: dict[int, set[tuple]] = {}
+        self._runtimes: dict[int, Counter] = {}
+        self.fetched_until: int | None = None
+        self.cached_since: int | None = None
+        self.fetch_count = 0
+
+    async def async_load(self) -> None:
+        """Load the cached days and the checkpoint from disk."""
+        days, self.fetched_until = await self._hass.async_add_executor_job(self._load)
+        for day, records in days.items():
+            self._add(day, records)
+
+    def _load(self) -> tuple[dict[int, list[tuple]], int | None]:
+        os.makedirs(self._path, exist_ok=True)
+        days = {}
+        for file_name in os.listdir(self._path):
+            day = _file_day(file_name)
+            if day is None:
+                continue
+            with open(os.path.join(self._path, file_name), encoding="utf-8") as file:
+                days[day] = [tuple(json.loads(line)) for line in file if line.strip()]
+
+        try:
+            with open(
+                os.path.join(self._path, CHECKPOINT_FILE), encoding="utf-8"
+            ) as file:
+                fetched_until = int(file.read())
+        except (OSError, ValueError):
+            fetched_until = None
+
+        return days, fetched_until
+
+    def _add(self, day: int, records: list[tuple]) -> list[tuple]:
+        """Add records of a day, returning the ones not seen before."""
+        known = self._records.setdefault(day, set())
+        runtimes = self._runtimes.setdefault(day, Counter())
+        added = []
+        for record in records:
+            if record in known:
+                continue
+
+            known.add(record)
+            added.append(record)
+            program_id, station, duration = record[:3]
+            # Other records (rain delay, sensors, water level) have a name as
+            # their station
+            if isinstance(station, int):
+                runtimes["station", station] += duration
+                runtimes["program", program_id - 1] += duration
+
+        return added
+
+    async def async_fetch(self, now: int) -> int:
+        """Fetch the records since the last fetch up to now (controller time)."""
+        async with self._lock:
+            oldest = now - RUN_LOG_DAYS * SECONDS_PER_DAY
+            start = min(max(self.fetched_until or oldest, oldest), now)
+            # The controller returns whole days, so records of the first day
+            # may already be cached and are skipped.
+            records = await self._controller.request(
+                "/jl", {"start": start, "end": now}
+            )
+            self.fetch_count += 1
+
+            days: dict[int, list[tuple]] = {}
+            for record in records:
+                record = tuple(record)
+                days.setdefault(record[3] // SECONDS_PER_DAY, []).append(record)
+
+            added = {day: self._add(day, records) for day, records in days.items()}
+            added = {day: records for day, records in added.items() if records}
+
+            first_day = oldest // SECONDS_PER_DAY
+            for day in [day for day in self._records if day < first_day]:
+                del self._records[day]
+                del self._runtimes[day]
+
+            await self._hass.async_add_executor_job(self._write, added, now, first_day)
+            self.fetched_until = now
+            self.cached_since = first_day * SECONDS_PER_DAY
+
+        count = sum(len(records) for records in added.values())
+        _LOGGER.debug("Fetched %d new run log records since %d", count, start)
+        return count
+
+    def _write(self, added: dict[int, list[tuple]], now: int, first_day: int) -> None:
+        for day, records in added.items():
+            with open(
+                os.path.join(self._path, _day_file(day)), "a", encoding="utf-8"
+            ) as file:
+                file.writelines(
+                    json.dumps(record, separators=(",", ":")) + "\n"
+                    for record in records
+                )
+
+        for file_name in os.listdir(self._path):
+            day = _file_day(file_name)
+            if day is not None and day < first_day:
+                os.remove(os.path.join(self._path, file_name))
+
+        write_utf8_file(os.path.join(self._path, CHECKPOINT_FILE), str(now))
+
+    def records(self, since: int, until: int) -> list[tuple]:
+        """Return the cached station runs that ended in a time range."""
+        return [
+            record
+            for day in range(since // SECONDS_PER_DAY, until // SECONDS_PER_DAY + 1)
+            for record in self._records.get(day, ())
+            if isinstance(record[1], int) and since <= record[3] < until
+        ]
+
+    def runtime(self, kind: str, index: int, first_day: int, last_day: int) -> int:
+        """Return the seconds a station or program ran over a range of days."""
+        return sum(
+            self._runtimes[day][kind, index]
+            for day in range(first_day, last_day + 1)
+            if day in self._runtimes
+        )
+
+    def as_dict(self) -> dict:
+        """Return the state of the cache for diagnostics."""
+        return {
+            "days": len(self._records),
+            "records": sum(len(records) for records in self._records.values()),
+            "fetched_until": self.fetched_until,
+            "fetch_count": self.fetch_count,
+        }
+
+
+def controller_time_zone(time_zone: tzinfo, utc_offset: int, now: int) -> tzinfo:
+    """Return the time zone the local times of the controller are in.
+
+    The controller only reports its current offset from UTC. When the Home
+    Assistant time zone has that offset now, its daylight saving time rules
+    also apply to older runs, otherwise the current offset is used for all.
+    """
+    if datetime.fromtimestamp(now, time_zone).utcoffset() == timedelta(
+        seconds=utc_offset
+    ):
+        return time_zone
+
+    return timezone(timedelta(seconds=utc_offset))
+
+
+def local_to_utc(local: int, time_zone: tzinfo) -> int:
+    """Return the UTC timestamp of a controller local time."""
+    wall_time = datetime.fromtimestamp(local, timezone.utc).replace(tzinfo=time_zone)
+    return int(wall_time.timestamp())
+
+
+def utc_to_local(timestamp: int, time_zone: tzinfo) -> int:
+    """Return the controller local time of a UTC timestamp."""
+    offset = datetime.fromtimestamp(timestamp, time_zone).utcoffset()
+    return timestamp + int(offset.total_seconds())
+
+
+def hourly_usage(
+    records: list[tuple], time_zone: tzinfo, since: int, until: int
+) -> dict[int, Counter]:
+    """Return the runtime and water use of each station per UTC hour.
+
+    A run counts in the hour it ended, with each end time converted from the
+    controller's local time on its own, and only runs that ended from since
+    until until (UTC) are counted. Keys are ("runtime", station) in seconds
+    and ("water", station) in litres, from the average flow rate the
+    controller logs with a run when it has a flow sensor.
+    """
+    hours: dict[int, Counter] = {}
+    for record in records:
+        station, duration, end = record[1:4]
+        if not isinstance(station, int):
+            continue
+
+        end = local_to_utc(end, time_zone)
+        if not since <= end < until:
+            continue
+
+        hour = end // SECONDS_PER_HOUR * SECONDS_PER_HOUR
+        usage = hours.setdefault(hour, Counter())
+        usage["runtime", station] += duration
+        if len(record) > 4:
+            usage["water", station] += record[4] * duration / 60
+
+    return hours
+
+
+def hourly_statistics(
+    hours: dict[int, Counter],
+    sums: dict[str, float],
+    statistic_id: Callable[[str, int], str],
+) -> dict[tuple[str, int], list[tuple[int, float, float]]]:
+    """Return the (hour, value, sum) rows of each station statistic, by hour.
+
+    Runtime is converted to minutes. The running sum of each statistic is
+    kept in sums, by statistic id, and updated with the new hours.
+    """
+    statistics: dict[tuple[str, int], list[tuple[int, float, float]]] = {}
+    for hour in sorted(hours):
+        for (kind, station), value in hours[hour].items():
+            key = statistic_id(kind, station)
+            if kind == "runtime":
+                value /= 60
+            sums[key] = sums.get(key, 0) + value
+            statistics.setdefault((kind, station), []).append((hour, value, sums[key]))
+
+    return statistics
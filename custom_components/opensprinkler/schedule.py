@@ -0,0 +1,443 @@
+"""Expansion of OpenSprinkler programs into their scheduled runs."""
+
+import calendar
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from heapq import heapify, heappop, heappush
+from itertools import count
+
+from .const import START_TIME_DISABLED, START_TIME_SUNRISE, START_TIME_SUNSET
+from .snapshot import ControllerSnapshot, ProgramSnapshot
+
+SECONDS_PER_DAY = 86400
+MINUTES_PER_DAY = 1440
+
+# Days after today that are expanded and cached
+SCHEDULE_DAYS = 14
+
+# Replaced runs tolerated in the heap of the next run scheduler
+HEAP_SLACK = 64
+
+EPOCH = date(1970, 1, 1)
+
+SCHEDULE_WEEKLY = 0
+SCHEDULE_SINGLE_RUN = 1
+SCHEDULE_MONTHLY = 2
+SCHEDULE_INTERVAL = 3
+
+START_TIME_REPEATING = 0
+
+RESTRICTION_ODD = 1
+RESTRICTION_EVEN = 2
+
+# Special station durations: the time from sunrise to sunset and back
+DURATION_SUNRISE_TO_SUNSET = 65534
+DURATION_SUNSET_TO_SUNRISE = 65535
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledRun:
+    """A run of a program, in controller time (seconds since the epoch)."""
+
+    program: int
+    start: int
+    end: int
+    # (station index, seconds) of each station the run waters
+    durations: tuple[tuple[int, int], ...]
+
+
+def _date_key(month_day: tuple[int, int]) -> int:
+    month, day = month_day
+    return (month << 5) + day
+
+
+def day_matches(program: ProgramSnapshot, day: int) -> bool:
+    """Return whether a program runs on a controller day (days since the epoch).
+
+    Follows the day matching of the firmware: the date range, the schedule
+    type, then the odd/even restriction.
+    """
+    current = EPOCH + timedelta(days=day)
+
+    if program.date_range_enabled:
+        current_key = _date_key((current.month, current.day))
+        first = _date_key(program.date_range_from)
+        last = _date_key(program.date_range_to)
+        if first <= last:
+            if not first <= current_key <= last:
+                return False
+        elif last < current_key < first:
+            return False
+
+    schedule_type = program.program_schedule_type
+    if schedule_type == SCHEDULE_WEEKLY:
+        if not program.weekdays[current.weekday()]:
+            return False
+    elif schedule_type == SCHEDULE_SINGLE_RUN:
+        if day != program.single_run_day:
+            return False
+    elif schedule_type == SCHEDULE_MONTHLY:
+        monthly_day = program.monthly_day & 0x1F
+        last_day = calendar.monthrange(current.year, current.month)[1]
+        # Day 0 is the last day of the month
+        if current.day != (monthly_day or last_day):
+            return False
+    elif schedule_type == SCHEDULE_INTERVAL:
+        if (
+            not program.interval_days
+            or day % program.interval_days != program.starting_in_days
+        ):
+            return False
+
+    if program.odd_even_restriction == RESTRICTION_EVEN:
+        return current.day % 2 == 0
+    if program.odd_even_restriction == RESTRICTION_ODD:
+        # The 31st and the 29th of February are skipped, so odd days never
+        # water twice in a row
+        if current.day == 31 or (current.month == 2 and current.day == 29):
+            return False
+        return current.day % 2 == 1
+
+    return True
+
+
+def _start_minute(offset_type: str | None, offset: int, sunrise: int, sunset: int):
+    if offset_type == START_TIME_SUNRISE:
+        return sunrise + offset
+    if offset_type == START_TIME_SUNSET:
+        return sunset + offset
+    return offset
+
+
+def start_minutes(program: ProgramSnapshot, sunrise: int, sunset: int) -> list[int]:
+    """Return the minutes after midnight a program starts on a day it runs."""
+    types = program.program_start_time_offset_types
+    offsets = program.program_start_time_offsets
+
+    if program.start_time_type == START_TIME_REPEATING:
+        if types[0] == START_TIME_DISABLED:
+            return []
+        first = _start_minute(types[0], offsets[0], sunrise, sunset)
+        if not program.program_start_repeat_interval:
+            return [first]
+        return [
+            minute
+            for repeat in range(program.program_start_repeat_count + 1)
+            if (minute := first + repeat * program.program_start_repeat_interval)
+            < MINUTES_PER_DAY
+        ]
+
+    return sorted(
+        _start_minute(offset_type, offset, sunrise, sunset)
+        for offset_type, offset in zip(types, offsets)
+        if offset_type not in (START_TIME_DISABLED, None)
+    )
+
+
+def station_durations(
+    program: ProgramSnapshot,
+    stations: frozenset[int],
+    sunrise: int,
+    sunset: int,
+    water_level: int,
+) -> tuple[tuple[int, int], ...]:
+    """Return the seconds a program waters each of a set of stations."""
+    durations = []
+    for index, seconds in enumerate(program.station_durations):
+        if index not in stations or not seconds:
+            continue
+        if seconds == DURATION_SUNRISE_TO_SUNSET:
+            seconds = (sunset - sunrise) * 60
+        elif seconds == DURATION_SUNSET_TO_SUNRISE:
+            seconds = (MINUTES_PER_DAY - sunset + sunrise) * 60
+        elif program.use_weather_adjustments:
+            seconds = seconds * water_level // 100
+        if seconds > 0:
+            durations.append((index, seconds))
+
+    return tuple(durations)
+
+
+def expand_program(
+    program: ProgramSnapshot,
+    first_day: int,
+    last_day: int,
+    stations: frozenset[int],
+    sunrise: int,
+    sunset: int,
+    water_level: int,
+) -> tuple[ScheduledRun, ...]:
+    """Return the runs of a program starting over a range of controller days.
+
+    Stations are assumed to run one after the other. Today's sunrise and
+    sunset are used for every day.
+    """
+    if not program.enabled:
+        return ()
+
+    durations = station_durations(program, stations, sunrise, sunset, water_level)
+    if not durations:
+        return ()
+
+    minutes = start_minutes(program, sunrise, sunset)
+    length = sum(seconds for _, seconds in durations)
+    return tuple(
+        ScheduledRun(program.index, start, start + length, durations)
+        for day in range(first_day, last_day + 1)
+        if day_matches(program, day)
+        for minute in minutes
+        for start in (day * SECONDS_PER_DAY + minute * 60,)
+    )
+
+
+def _uses_sun(program: ProgramSnapshot) -> bool:
+    return (
+        START_TIME_SUNRISE in program.program_start_time_offset_types
+        or START_TIME_SUNSET in program.program_start_time_offset_types
+        or DURATION_SUNRISE_TO_SUNSET in program.station_durations
+        or DURATION_SUNSET_TO_SUNRISE in program.station_durations
+    )
+
+
+def _expansion_inputs(snapshot: ControllerSnapshot) -> tuple:
+    return (
+        frozenset(
+            station.index
+            for station in snapshot.stations
+            if station.enabled and not station.is_master
+        ),
+        snapshot.sunrise,
+        snapshot.sunset,
+        snapshot.water_level,
+    )
+
+
+def expand(
+    snapshot: ControllerSnapshot, first_day: int, last_day: int
+) -> list[ScheduledRun]:
+    """Return the runs of all programs over a range of controller days."""
+    if not snapshot.enabled:
+        return []
+
+    inputs = _expansion_inputs(snapshot)
+    return sorted(
+        (
+            run
+            for program in snapshot.programs
+            for run in expand_program(program, first_day, last_day, *inputs)
+        ),
+        key=lambda run: (run.start, run.program),
+    )
+
+
+class ScheduleCache:
+    """The runs of each program from yesterday to SCHEDULE_DAYS days ahead.
+
+    A program is expanded again only when its configuration, the day, or an
+    input it depends on (enabled stations, water level with weather
+    adjustments, sunrise and sunset when it uses them) changes.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        self._programs: dict[int, tuple[tuple, tuple[ScheduledRun, ...]]] = {}
+        self._runs: list[ScheduledRun] = []
+        self.first_day: int | None = None
+        self.last_day: int | None = None
+        self.expansions = 0
+
+    def _update(self, snapshot: ControllerSnapshot) -> bool:
+        """Expand the programs that changed, returning whether any did."""
+        # Runs are expanded by controller local day
+        today = (snapshot.device_time + snapshot.utc_offset) // SECONDS_PER_DAY
+        # Runs that started yesterday may still be going
+        self.first_day = today - 1
+        self.last_day = today + SCHEDULE_DAYS
+        stations, sunrise, sunset, water_level = _expansion_inputs(snapshot)
+
+        changed = len(self._programs) != len(snapshot.programs)
+        for program in snapshot.programs:
+            uses_sun = _uses_sun(program)
+            key = (
+                replace(program, is_running=False),
+                self.first_day,
+                stations,
+                water_level if program.use_weather_adjustments else None,
+                (sunrise, sunset) if uses_sun else None,
+            )
+            cached = self._programs.get(program.index)
+            if cached is None or cached[0] != key:
+                cached = key, expand_program(
+                    program,
+                    self.first_day,
+                    self.last_day,
+                    stations,
+                    sunrise,
+                    sunset,
+                    water_level,
+                )
+                self._programs[program.index] = cached
+                self.expansions += 1
+                changed = True
+
+        if changed:
+            # Programs deleted on the controller
+            for index in [
+                index for index in self._programs if index >= len(snapshot.programs)
+            ]:
+                del self._programs[index]
+
+        return changed
+
+    def program_runs(
+        self, snapshot: ControllerSnapshot
+    ) -> dict[int, tuple[ScheduledRun, ...]]:
+        """Return the cached runs of each program.
+
+        The runs of a program are the same tuple until it is expanded again.
+        """
+        self._update(snapshot)
+        if not snapshot.enabled:
+            return {}
+        return {index: runs for index, (_, runs) in self._programs.items()}
+
+    def runs(self, snapshot: ControllerSnapshot) -> list[ScheduledRun]:
+        """Return the cached runs of all programs, sorted by start."""
+        if self._update(snapshot):
+            self._runs = sorted(
+                (run for _, runs in self._programs.values() for run in runs),
+                key=lambda run: (run.start, run.program),
+            )
+
+        if not snapshot.enabled:
+            return []
+        return self._runs
+
+    def as_dict(self) -> dict:
+        """Return the state of the cache for diagnostics."""
+        return {
+            "programs": len(self._programs),
+            "runs": sum(len(runs) for _, runs in self._programs.values()),
+            "expansions": self.expansions,
+        }
+
+
+class NextRunScheduler:
+    """The next start and end of each program and station.
+
+    Upcoming runs are kept in a min-heap ordered by start. Only the runs of
+    programs the schedule cache expanded again are pushed, replacing the
+    previous ones, which are dropped when they reach the top of the heap.
+    Ended runs are dropped the same way as time passes. The next runs are
+    worked out once per snapshot, and only again once one of them ends.
+    """
+
+    def __init__(self, schedule: ScheduleCache):
+        """Initialize."""
+        self._schedule = schedule
+        # (start, program, generation, sequence, run)
+        self._heap: list[tuple[int, int, int, int, ScheduledRun]] = []
+        self._sequence = count()
+        self._programs: dict[int, tuple[int, tuple[ScheduledRun, ...]]] = {}
+        self._snapshot: ControllerSnapshot | None = None
+        self._next: dict[tuple[str, int], tuple[int, int]] = {}
+        self._valid_until: int | None = None
+        self.recomputations = 0
+
+    def _push_changed(self, snapshot: ControllerSnapshot) -> bool:
+        """Push the runs of programs expanded again, returning whether any were."""
+        now = snapshot.device_time + snapshot.utc_offset
+        program_runs = self._schedule.program_runs(snapshot)
+        changed = False
+        for index, runs in program_runs.items():
+            generation, pushed = self._programs.get(index, (0, None))
+            if pushed is runs:
+                continue
+
+            generation += 1
+            self._programs[index] = generation, runs
+            for run in runs:
+                if run.end > now:
+                    heappush(
+                        self._heap,
+                        (run.start, index, generation, next(self._sequence), run),
+                    )
+            changed = True
+
+        for index in [index for index in self._programs if index not in program_runs]:
+            del self._programs[index]
+            changed = True
+
+        # Drop replaced runs that are not near the top of the heap yet
+        live = sum(len(runs) for _, runs in self._programs.values())
+        if len(self._heap) > 2 * live + HEAP_SLACK:
+            self._heap = [entry for entry in self._heap if self._is_current(entry, now)]
+            heapify(self._heap)
+
+        return changed
+
+    def _is_current(self, entry: tuple, now: int) -> bool:
+        _, index, generation, _, run = entry
+        program = self._programs.get(index)
+        return run.end > now and program is not None and program[0] == generation
+
+    def _recompute(self, now: int) -> None:
+        """Work out the next runs, popping the heap in start order."""
+        self.recomputations += 1
+        wanted = set()
+        for index, (_, runs) in self._programs.items():
+            for run in runs[:1]:
+                wanted.add(("program", index))
+                wanted.update(("station", station) for station, _ in run.durations)
+
+        found: dict[tuple[str, int], tuple[int, int]] = {}
+        popped = []
+        while self._heap:
+            # Later runs can not start a station earlier than the latest found
+            if (
+                found
+                and len(found) == len(wanted)
+                and self._heap[0][0] >= max(start for start, _ in found.values())
+            ):
+                break
+
+            entry = heappop(self._heap)
+            if not self._is_current(entry, now):
+                continue
+            popped.append(entry)
+
+            run = entry[4]
+            found.setdefault(("program", run.program), (run.start, run.end))
+            start = run.start
+            for station, seconds in run.durations:
+                end = start + seconds
+                key = ("station", station)
+                if end > now and (key not in found or start < found[key][0]):
+                    found[key] = (start, end)
+                start = end
+
+        for entry in popped:
+            heappush(self._heap, entry)
+
+        self._next = found
+        self._valid_until = min((end for _, end in found.values()), default=None)
+
+    def next_run(
+        self, snapshot: ControllerSnapshot, kind: str, index: int
+    ) -> tuple[int, int] | None:
+        """Return the next (start, end) of a program or station, in controller time.
+
+        A run that has started but not ended is the next run.
+        """
+        if snapshot is not self._snapshot:
+            self._snapshot = snapshot
+            now = snapshot.device_time + snapshot.utc_offset
+            changed = self._push_changed(snapshot)
+            if changed or self._valid_until is None or now >= self._valid_until:
+                self._recompute(now)
+
+        return self._next.get((kind, index))
+
+    def as_dict(self) -> dict:
+        """Return the state of the scheduler for diagnostics."""
+        return {"queued_runs": len(self._heap), "recomputations": self.recomputations}
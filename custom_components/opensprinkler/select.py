@@ -8,8 +8,13 @@ from homeassistant.const import CONF_NAME, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.util import slugify
 
-from . import OpenSprinklerProgramEntity, OpenSprinklerSelect
+from . import (
+    OpenSprinklerProgramEntity,
+    OpenSprinklerSelect,
+    async_setup_platform_entities,
+)
 from .const import (
+    CONF_COMPACT_START_TIMES,
     DOMAIN,
     START_TIME_DISABLED,
     START_TIME_MIDNIGHT,
@@ -26,8 +31,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler selects."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -43,6 +49,10 @@ def _create_entities(hass: HomeAssistant, entry: dict):
         entities.append(
             ProgramAdditionalStartTimeTypeSelect(entry, name, program, coordinator)
         )
+        # The start times are a single text entity in compact mode
+        if entry.options.get(CONF_COMPACT_START_TIMES, False):
+            continue
+
         for start_index in range(4):
             entities.append(
                 ProgramStartTimeOffsetTypeSelect(
@@ -72,7 +82,7 @@ class ProgramRestrictionsSelect(
     @property
     def name(self) -> str:
         """Return the name of this select."""
-        return f"{self._program.name} Restrictions"
+        return f"{self._program_data.name} Restrictions"
 
     @property
     def unique_id(self) -> str:
@@ -94,7 +104,7 @@ class ProgramRestrictionsSelect(
     @property
     def current_option(self) -> str:
         """The current select option"""
-        match self._program.odd_even_restriction:
+        match self._program_data.odd_even_restriction:
             case 0:
                 return "None"
             case 1:
@@ -104,6 +114,9 @@ class ProgramRestrictionsSelect(
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        if self._skip_write(option == self.current_option):
+            return
+
         match option:
             case "None":
                 value = 0
@@ -132,7 +145,7 @@ class ProgramTypeSelect(OpenSprinklerProgramEntity, OpenSprinklerSelect, SelectE
     @property
     def name(self) -> str:
         """Return the name of this select."""
-        return f"{self._program.name} Type"
+        return f"{self._program_data.name} Type"
 
     @property
     def unique_id(self) -> str:
@@ -154,7 +167,7 @@ class ProgramTypeSelect(OpenSprinklerProgramEntity, OpenSprinklerSelect, SelectE
     @property
     def current_option(self) -> str:
         """The current select option"""
-        match self._program.program_schedule_type:
+        match self._program_data.program_schedule_type:
             case 0:
                 return "Weekly"
             case 1:
@@ -166,6 +179,9 @@ class ProgramTypeSelect(OpenSprinklerProgramEntity, OpenSprinklerSelect, SelectE
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        if self._skip_write(option == self.current_option):
+            return
+
         match option:
             case "Weekly":
                 value = 0
@@ -198,7 +214,7 @@ class ProgramAdditionalStartTimeTypeSelect(
     @property
     def name(self) -> str:
         """Return the name of this select."""
-        return f"{self._program.name} Additional Start Time Type"
+        return f"{self._program_data.name} Additional Start Time Type"
 
     @property
     def unique_id(self) -> str:
@@ -220,7 +236,7 @@ class ProgramAdditionalStartTimeTypeSelect(
     @property
     def current_option(self) -> str:
         """The current select option"""
-        match self._program.start_time_type:
+        match self._program_data.start_time_type:
             case 0:
                 return "Repeating"
             case 1:
@@ -228,6 +244,9 @@ class ProgramAdditionalStartTimeTypeSelect(
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        if self._skip_write(option == self.current_option):
+            return
+
         match option:
             case "Repeating":
                 value = 0
@@ -258,7 +277,7 @@ class ProgramStartTimeOffsetTypeSelect(
     def name(self) -> str:
         """Return the name of this select."""
         start = str(self._start_index) if self._start_index > 0 else ""
-        return f"{self._program.name} Start{start} Time Offset Type"
+        return f"{self._program_data.name} Start{start} Time Offset Type"
 
     @property
     def unique_id(self) -> str:
@@ -290,9 +309,9 @@ class ProgramStartTimeOffsetTypeSelect(
     @property
     def current_option(self) -> str:
         """The current select option"""
-        offset_type = self._program.get_program_start_time_offset_type(
+        offset_type = self._program_data.program_start_time_offset_types[
             self._start_index
-        )
+        ]
 
         if offset_type == START_TIME_DISABLED:
             return "Disabled"
@@ -305,6 +324,9 @@ class ProgramStartTimeOffsetTypeSelect(
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        if self._skip_write(option == self.current_option):
+            return
+
         match option:
             case "Disabled":
                 value = START_TIME_DISABLED
@@ -3,19 +3,33 @@
 import logging
 from typing import Callable
 
-from homeassistant.components.sensor import SensorDeviceClass
-from homeassistant.const import CONF_NAME, EntityCategory
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import CONF_NAME, EntityCategory, UnitOfVolume
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import Entity
 from homeassistant.util import slugify
 from homeassistant.util.dt import utc_from_timestamp
 
 from . import (
+    OpenSprinklerAnalogSensor,
     OpenSprinklerControllerEntity,
+    OpenSprinklerEntity,
+    OpenSprinklerProgramEntity,
     OpenSprinklerSensor,
     OpenSprinklerStationEntity,
+    async_setup_platform_entities,
+)
+from .const import (
+    CONF_CURRENT_DRAW_DEADBAND,
+    CONF_FLOW_RATE_DEADBAND,
+    CONF_WATER_LEVEL_DEADBAND,
+    DOMAIN,
 )
-from .const import DOMAIN
+from .runlog import SECONDS_PER_DAY
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,8 +40,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler sensors."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -48,12 +63,80 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     for _, station in controller.stations.items():
         entities.append(StationStatusSensor(entry, name, station, coordinator))
 
+    # Volumes integrated from the flow rate, as total_increasing sensors
+    if controller.flow_sensor_enabled:
+        totalizer = hass.data[DOMAIN][entry.entry_id]["totalizer"]
+        entities.append(
+            WaterVolumeSensor(entry, name, controller, totalizer, coordinator)
+        )
+        for _, station in controller.stations.items():
+            entities.append(
+                StationWaterVolumeSensor(entry, name, station, totalizer, coordinator)
+            )
+
+    # Deviations from the baselines learned while each station runs alone
+    baselines = hass.data[DOMAIN][entry.entry_id]["baselines"]
+    quantities = []
+    if coordinator.data.current_draw is not None:
+        quantities.append("current_draw")
+    if controller.flow_sensor_enabled:
+        quantities.append("flow_rate")
+    for _, station in controller.stations.items():
+        for quantity in quantities:
+            entities.append(
+                StationDeviationSensor(
+                    entry, name, station, baselines, quantity, coordinator
+                )
+            )
+
+    run_log = hass.data[DOMAIN][entry.entry_id]["run_log"]
+    if run_log is not None:
+        for _, station in controller.stations.items():
+            entities.append(
+                StationRuntimeSensor(entry, name, station, run_log, coordinator)
+            )
+        for _, program in controller.programs.items():
+            entities.append(
+                ProgramRuntimeSensor(entry, name, program, run_log, coordinator)
+            )
+
+    scheduler = hass.data[DOMAIN][entry.entry_id]["scheduler"]
+    for _, program in controller.programs.items():
+        for edge in ("start", "end"):
+            entities.append(
+                ProgramNextRunSensor(entry, name, program, scheduler, edge, coordinator)
+            )
+    for _, station in controller.stations.items():
+        for edge in ("start", "end"):
+            entities.append(
+                StationNextRunSensor(entry, name, station, scheduler, edge, coordinator)
+            )
+
     return entities
 
 
-class WaterLevelSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity):
+def _local_day(controller) -> int:
+    """Return the controller's local day, as the run log is kept in days."""
+    return (controller.device_time + controller.utc_offset) // SECONDS_PER_DAY
+
+
+def _next_run_time(scheduler, controller, kind: str, index: int, edge: str):
+    """Return the next start or end of a program or station."""
+    next_run = scheduler.next_run(controller, kind, index)
+    if next_run is None:
+        return None
+
+    timestamp = next_run[0] if edge == "start" else next_run[1]
+    return utc_from_timestamp(timestamp - controller.utc_offset).isoformat()
+
+
+class WaterLevelSensor(
+    OpenSprinklerControllerEntity, OpenSprinklerAnalogSensor, Entity
+):
     """Represent a sensor for water level."""
 
+    _deadband_option = CONF_WATER_LEVEL_DEADBAND
+
     def __init__(self, entry, name, controller, coordinator):
         """Set up a new opensprinkler water level sensor."""
         self._name = name
@@ -88,7 +171,7 @@ class WaterLevelSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entit
 
     @property
     def extra_state_attributes(self):
-        controller = self._controller
+        controller = self._controller_data
         attributes = {}
         for attr in [
             "last_weather_call_error",
@@ -113,12 +196,14 @@ class WaterLevelSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entit
 
     def _get_state(self) -> int:
         """Retrieve latest state."""
-        return self._controller.water_level
+        return self._controller_data.water_level
 
 
-class FlowRateSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity):
+class FlowRateSensor(OpenSprinklerControllerEntity, OpenSprinklerAnalogSensor, Entity):
     """Represent a sensor for flow rate."""
 
+    _deadband_option = CONF_FLOW_RATE_DEADBAND
+
     def __init__(self, entry, name, controller, coordinator):
         """Set up a new opensprinkler flow rate sensor."""
         self._name = name
@@ -158,7 +243,7 @@ class FlowRateSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity)
 
     def _get_state(self) -> int:
         """Retrieve latest state."""
-        return self._controller.flow_rate
+        return self._controller_data.flow_rate
 
 
 class LastRunSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity):
@@ -197,7 +282,7 @@ class LastRunSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity):
 
     @property
     def extra_state_attributes(self):
-        controller = self._controller
+        controller = self._controller_data
         attributes = {}
         for attr in [
             "last_run_station",
@@ -213,7 +298,7 @@ class LastRunSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity):
 
     def _get_state(self):
         """Retrieve latest state."""
-        last_run = self._controller.last_run_end_time
+        last_run = self._controller_data.last_run_end_time
 
         if last_run == 0:
             return None
@@ -260,7 +345,7 @@ class RainDelayStopTimeSensor(
 
     def _get_state(self):
         """Retrieve latest state."""
-        rdst = self._controller.rain_delay_stop_time
+        rdst = self._controller_data.rain_delay_stop_time
         if rdst == 0:
             return None
 
@@ -302,7 +387,7 @@ class PauseEndTimeSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Ent
 
     def _get_state(self):
         """Retrieve latest state."""
-        pt = self._controller.pause_time_remaining
+        pt = self._controller_data.pause_time_remaining
         # pt is None if the sprinkler firmware does not support pausing (<2.2.0)
         # pt is 0 if the sprinkler firmware supports pausing, but is not currently paused.
         if pt is None or pt == 0:
@@ -310,7 +395,7 @@ class PauseEndTimeSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Ent
 
         # Since the controller provides the remaining time as a duration, add it to the
         # current device time to determine when the pause will end.
-        return utc_from_timestamp(self._controller.device_time + pt).isoformat()
+        return utc_from_timestamp(self._controller_data.device_time + pt).isoformat()
 
 
 class StationStatusSensor(OpenSprinklerStationEntity, OpenSprinklerSensor, Entity):
@@ -346,7 +431,7 @@ class StationStatusSensor(OpenSprinklerStationEntity, OpenSprinklerSensor, Entit
     @property
     def name(self) -> str:
         """Return the name of this sensor."""
-        return self._station.name + " Station Status"
+        return self._station_data.name + " Station Status"
 
     @property
     def unique_id(self) -> str:
@@ -358,25 +443,29 @@ class StationStatusSensor(OpenSprinklerStationEntity, OpenSprinklerSensor, Entit
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._station.is_master:
-            if self.state == "master_engaged":
+        if self._station_data.is_master:
+            if self._station_data.status == "master_engaged":
                 return "mdi:water-pump"
             else:
                 return "mdi:water-pump-off"
 
-        if self._station.is_running:
+        if self._station_data.is_running:
             return "mdi:valve-open"
 
         return "mdi:valve-closed"
 
     def _get_state(self) -> str:
         """Retrieve latest state."""
-        return self._station.status
+        return self._station_data.status
 
 
-class CurrentDrawSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Entity):
+class CurrentDrawSensor(
+    OpenSprinklerControllerEntity, OpenSprinklerAnalogSensor, Entity
+):
     """Represent a sensor for total current draw of all zones."""
 
+    _deadband_option = CONF_CURRENT_DRAW_DEADBAND
+
     def __init__(self, entry, name, controller, coordinator):
         """Set up a new opensprinkler current draw sensor."""
         self._name = name
@@ -415,7 +504,7 @@ class CurrentDrawSensor(OpenSprinklerControllerEntity, OpenSprinklerSensor, Enti
 
     def _get_state(self) -> int:
         """Retrieve latest state."""
-        return self._controller.current_draw
+        return self._controller_data.current_draw
 
 
 class ControllerCurrentTimeSensor(
@@ -461,8 +550,362 @@ class ControllerCurrentTimeSensor(
 
     def _get_state(self):
         """Retrieve latest state."""
-        devt = self._controller.device_time
+        devt = self._controller_data.device_time
         if devt == 0:
             return None
 
         return utc_from_timestamp(devt).isoformat()
+
+
+class StationRuntimeSensor(OpenSprinklerStationEntity, OpenSprinklerSensor, Entity):
+    """Represent a sensor for the runtime of a station today from the run log."""
+
+    def __init__(self, entry, name, station, run_log, coordinator):
+        """Set up a new OpenSprinkler station runtime sensor."""
+        self._station = station
+        self._run_log = run_log
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.DURATION
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:timer-outline"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return self._station_data.name + " Station Runtime Today"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_station_runtime_today_{self._station.index}"
+        )
+
+    @property
+    def unit_of_measurement(self) -> str:
+        """Return the units of measurement."""
+        return "s"
+
+    @property
+    def extra_state_attributes(self):
+        attributes = super().extra_state_attributes
+        today = _local_day(self._coordinator.data)
+        attributes["last_7_days"] = self._run_log.runtime(
+            "station", self._station.index, today - 6, today
+        )
+        return attributes
+
+    def _get_state(self) -> int:
+        """Retrieve latest state."""
+        today = _local_day(self._coordinator.data)
+        return self._run_log.runtime("station", self._station.index, today, today)
+
+
+class ProgramRuntimeSensor(OpenSprinklerProgramEntity, OpenSprinklerSensor, Entity):
+    """Represent a sensor for the runtime of a program today from the run log."""
+
+    def __init__(self, entry, name, program, run_log, coordinator):
+        """Set up a new OpenSprinkler program runtime sensor."""
+        self._program = program
+        self._run_log = run_log
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.DURATION
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:timer-outline"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return self._program_data.name + " Program Runtime Today"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_program_runtime_today_{self._program.index}"
+        )
+
+    @property
+    def unit_of_measurement(self) -> str:
+        """Return the units of measurement."""
+        return "s"
+
+    @property
+    def extra_state_attributes(self):
+        attributes = super().extra_state_attributes
+        today = _local_day(self._coordinator.data)
+        attributes["last_7_days"] = self._run_log.runtime(
+            "program", self._program.index, today - 6, today
+        )
+        return attributes
+
+    def _get_state(self) -> int:
+        """Retrieve latest state."""
+        today = _local_day(self._coordinator.data)
+        return self._run_log.runtime("program", self._program.index, today, today)
+
+
+class ProgramNextRunSensor(OpenSprinklerProgramEntity, OpenSprinklerSensor, Entity):
+    """Represent a sensor for the next start or end of a program."""
+
+    def __init__(self, entry, name, program, scheduler, edge, coordinator):
+        """Set up a new OpenSprinkler program next run sensor."""
+        self._program = program
+        self._scheduler = scheduler
+        self._edge = edge
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return f"mdi:clock-{self._edge}"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return self._program_data.name + f" Program Next {self._edge.title()}"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_program_next_{self._edge}_{self._program.index}"
+        )
+
+    def _get_state(self):
+        """Retrieve latest state."""
+        return _next_run_time(
+            self._scheduler,
+            self._coordinator.data,
+            "program",
+            self._program.index,
+            self._edge,
+        )
+
+
+class StationNextRunSensor(OpenSprinklerStationEntity, OpenSprinklerSensor, Entity):
+    """Represent a sensor for the next start or end of a station in a program."""
+
+    def __init__(self, entry, name, station, scheduler, edge, coordinator):
+        """Set up a new OpenSprinkler station next run sensor."""
+        self._station = station
+        self._scheduler = scheduler
+        self._edge = edge
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return f"mdi:clock-{self._edge}"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return self._station_data.name + f" Station Next {self._edge.title()}"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_station_next_{self._edge}_{self._station.index}"
+        )
+
+    def _get_state(self):
+        """Retrieve latest state."""
+        return _next_run_time(
+            self._scheduler,
+            self._coordinator.data,
+            "station",
+            self._station.index,
+            self._edge,
+        )
+
+
+class WaterVolumeSensor(
+    OpenSprinklerControllerEntity, OpenSprinklerEntity, SensorEntity
+):
+    """Represent a sensor for the water used, integrated from the flow rate."""
+
+    def __init__(self, entry, name, controller, totalizer, coordinator):
+        """Set up a new opensprinkler water volume sensor."""
+        self._controller = controller
+        self._totalizer = totalizer
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.WATER
+
+    @property
+    def state_class(self):
+        """Return the state class."""
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:water"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor including the controller name."""
+        return f"{self._name} Water Volume"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(f"{self._entry.unique_id}_{self._entity_type}_water_volume")
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the units of measurement."""
+        return UnitOfVolume.LITERS
+
+    @property
+    def native_value(self) -> float:
+        """Return the volume."""
+        return round(self._totalizer.total, 2)
+
+
+class StationWaterVolumeSensor(
+    OpenSprinklerStationEntity, OpenSprinklerEntity, SensorEntity
+):
+    """Represent a sensor for the water used by a station."""
+
+    def __init__(self, entry, name, station, totalizer, coordinator):
+        """Set up a new OpenSprinkler station water volume sensor."""
+        self._station = station
+        self._totalizer = totalizer
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.WATER
+
+    @property
+    def state_class(self):
+        """Return the state class."""
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:water"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        return self._station_data.name + " Station Water Volume"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_station_water_volume_{self._station.index}"
+        )
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the units of measurement."""
+        return UnitOfVolume.LITERS
+
+    @property
+    def native_value(self) -> float:
+        """Return the volume."""
+        return round(self._totalizer.stations.get(self._station.index, 0.0), 2)
+
+
+class StationDeviationSensor(
+    OpenSprinklerStationEntity, OpenSprinklerEntity, SensorEntity
+):
+    """Represent a sensor for the deviation of a station from its baseline."""
+
+    def __init__(self, entry, name, station, baselines, quantity, coordinator):
+        """Set up a new OpenSprinkler station deviation sensor."""
+        self._station = station
+        self._baselines = baselines
+        self._quantity = quantity
+        self._entity_type = "sensor"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def entity_category(self):
+        """Return the entity category."""
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def state_class(self):
+        """Return the state class."""
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:chart-bell-curve"
+
+    @property
+    def name(self) -> str:
+        """Return the name of this sensor."""
+        label = "Current Draw" if self._quantity == "current_draw" else "Flow Rate"
+        return f"{self._station_data.name} Station {label} Deviation"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_station_{self._quantity}_deviation_{self._station.index}"
+        )
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the units of measurement, standard deviations."""
+        return "σ"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the deviation of the last sample learned."""
+        deviation = self._baselines.deviations.get(
+            (self._quantity, self._station.index)
+        )
+        return None if deviation is None else round(deviation, 2)
+
+    @property
+    def extra_state_attributes(self):
+        attributes = super().extra_state_attributes
+        stats = self._baselines.stats.get((self._quantity, self._station.index))
+        attributes["samples"] = stats.count if stats else 0
+        attributes["mean"] = round(stats.mean, 2) if stats else None
+        attributes["std"] = round(stats.std, 2) if stats else None
+        return attributes
@@ -0,0 +1,201 @@
+"""Immutable view of an OpenSprinkler controller, taken once per poll."""
+
+from dataclasses import dataclass, fields
+
+from pyopensprinkler import Controller as OpenSprinkler
+from pyopensprinkler.const import WEEKDAYS
+from pyopensprinkler.program import Program
+from pyopensprinkler.station import Station
+
+
+def _read(obj, attr: str):
+    """Return an attribute, or None if the firmware does not report it."""
+    try:
+        return getattr(obj, attr)
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class StationSnapshot:
+    """State of a station."""
+
+    index: int
+    name: str
+    enabled: bool
+    is_master: bool
+    is_running: bool
+    status: str
+    running_program_id: int
+    seconds_remaining: int
+    start_time: int
+    end_time: int
+
+    @classmethod
+    def from_station(cls, station: Station) -> "StationSnapshot":
+        """Read a station."""
+        return cls(*(_read(station, field.name) for field in fields(cls)))
+
+
+@dataclass(frozen=True, slots=True)
+class ProgramSnapshot:
+    """State of a program."""
+
+    index: int
+    name: str
+    enabled: bool
+    use_weather_adjustments: bool
+    is_running: bool
+    program_schedule_type: int
+    start_time_type: int
+    odd_even_restriction: int
+    starting_in_days: int
+    interval_days: int
+    monthly_day: int
+    single_run_day: int
+    program_start_repeat_count: int
+    program_start_repeat_interval: int
+    program_start_times: tuple[int, ...]
+    program_start_time_offsets: tuple[int, ...]
+    program_start_time_offset_types: tuple[str | None, ...]
+    days0: int
+    weekdays: tuple[bool, ...]
+    station_durations: tuple[int, ...]
+    date_range_enabled: int
+    date_range_from: tuple[int, int]
+    date_range_to: tuple[int, int]
+
+    @classmethod
+    def from_program(cls, program: Program, is_running: bool) -> "ProgramSnapshot":
+        """Read a program."""
+        return cls(
+            index=program.index,
+            name=program.name,
+            enabled=program.enabled,
+            use_weather_adjustments=program.use_weather_adjustments,
+            is_running=is_running,
+            program_schedule_type=program.program_schedule_type,
+            start_time_type=program.start_time_type,
+            odd_even_restriction=program.odd_even_restriction,
+            starting_in_days=program.starting_in_days,
+            interval_days=program.interval_days,
+            monthly_day=program.monthly_day,
+            single_run_day=program.single_run_day,
+            program_start_repeat_count=program.program_start_repeat_count,
+            program_start_repeat_interval=program.program_start_repeat_interval,
+            program_start_times=tuple(program.program_start_times),
+            program_start_time_offsets=tuple(program.program_start_time_offsets),
+            program_start_time_offset_types=tuple(
+                program.program_start_time_offset_types
+            ),
+            days0=program.days0,
+            weekdays=tuple(program.get_weekday_enabled(day) for day in WEEKDAYS),
+            station_durations=tuple(program.station_durations),
+            date_range_enabled=program.date_range_enabled,
+            date_range_from=tuple(program.date_range_from),
+            date_range_to=tuple(program.date_range_to),
+        )
+
+    def weekday_enabled(self, weekday: str) -> bool:
+        """Return whether the program runs on a weekday ('Monday', ...)."""
+        return self.weekdays[WEEKDAYS.index(weekday)]
+
+
+# Controller snapshot fields not read from a pyopensprinkler property
+_DERIVED_FIELDS = {
+    "utc_offset",
+    "stations",
+    "programs",
+    "running_stations",
+    "program_stations",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ControllerSnapshot:
+    """State of a controller with its stations and programs."""
+
+    enabled: bool
+    water_level: int
+    flow_rate: float
+    current_draw: int
+    device_time: int
+    sunrise: int
+    sunset: int
+    pause_active: bool
+    pause_time_remaining: int | None
+    rain_delay_active: bool
+    rain_delay_stop_time: int
+    sensor_1_active: bool
+    sensor_1_enabled: bool
+    sensor_2_active: bool
+    sensor_2_enabled: bool
+    last_run_station: int
+    last_run_program: int
+    last_run_duration: int
+    last_run_end_time: int
+    last_weather_call: int
+    last_successfull_weather_call: int
+    last_weather_call_error: int
+    last_weather_call_error_name: str
+    last_reboot_time: int
+    last_reboot_cause: int
+    last_reboot_cause_name: str
+    firmware_version: int
+    firmware_version_name: str
+    firmware_minor_version: int
+    hardware_version_name: str
+    hardware_type_name: str
+    # Seconds the controller's local time is ahead of UTC
+    utc_offset: int
+    stations: tuple[StationSnapshot, ...]
+    programs: tuple[ProgramSnapshot, ...]
+    # Running index: bit n is set while station n runs, and the stations
+    # each program is running or has queued to run next.
+    running_stations: int
+    program_stations: tuple[frozenset[int], ...]
+
+    @classmethod
+    def from_controller(cls, controller: OpenSprinkler) -> "ControllerSnapshot":
+        """Read a controller after a refresh."""
+        station_count = len(controller._state["stations"]["snames"])
+        stations = tuple(
+            StationSnapshot.from_station(station)
+            for index, station in sorted(controller.stations.items())
+            if index < station_count
+        )
+
+        program_count = len(controller.programs)
+        running_stations = 0
+        program_stations = [set() for _ in range(program_count)]
+        for station in stations:
+            if station.is_running:
+                running_stations |= 1 << station.index
+            # A queued station already has the id of its program, it only
+            # waits for its turn. Program ids are 1 based, manual and run-once
+            # runs are above the program count.
+            program_index = (station.running_program_id or 0) - 1
+            if 0 <= program_index < program_count:
+                program_stations[program_index].add(station.index)
+
+        programs = tuple(
+            ProgramSnapshot.from_program(program, bool(program_stations[index]))
+            for index, program in sorted(controller.programs.items())
+        )
+
+        return cls(
+            *(
+                _read(controller, field.name)
+                for field in fields(cls)
+                if field.name not in _DERIVED_FIELDS
+            ),
+            utc_offset=(controller._get_option("tz") - 48) * 15 * 60,
+            stations=stations,
+            programs=programs,
+            running_stations=running_stations,
+            program_stations=tuple(frozenset(active) for active in program_stations),
+        )
+
+    def is_station_running(self, index: int) -> bool:
+        """Return whether a station is running."""
+        return bool(self.running_stations >> index & 1)
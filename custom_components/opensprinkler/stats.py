@@ -0,0 +1,168 @@
+"""Import of the OpenSprinkler run log into hourly long-term statistics."""
+
+import asyncio
+import logging
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, UnitOfTime, UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.dt import utc_from_timestamp
+from pyopensprinkler import Controller as OpenSprinkler
+
+from .const import DOMAIN, STATISTICS_STORAGE_KEY
+from .runlog import (
+    SECONDS_PER_DAY,
+    SECONDS_PER_HOUR,
+    OpenSprinklerRunLog,
+    controller_time_zone,
+    hourly_statistics,
+    hourly_usage,
+    local_to_utc,
+    utc_to_local,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Days of history imported the first time, the most the controller returns
+STATISTICS_DAYS = 365
+
+# Days of history requested from the controller at once
+FETCH_DAYS = 30
+
+STORAGE_VERSION = 1
+
+UNITS = {"runtime": UnitOfTime.MINUTES, "water": UnitOfVolume.LITERS}
+
+
+class OpenSprinklerStatistics:
+    """Import station runtime and water use into hourly external statistics.
+
+    Complete hours since the last import are written in one batch per
+    statistic; the last imported hour and the running sums are stored, so an
+    import resumes where the previous one ended.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        controller: OpenSprinkler,
+        coordinator: DataUpdateCoordinator,
+        run_log: OpenSprinklerRunLog,
+    ):
+        """Initialize."""
+        self._hass = hass
+        self._entry = entry
+        self._controller = controller
+        self._coordinator = coordinator
+        self._run_log = run_log
+        self._store = Store(
+            hass, STORAGE_VERSION, STATISTICS_STORAGE_KEY.format(entry.entry_id)
+        )
+        self._lock = asyncio.Lock()
+        self._sums: dict[str, float] = {}
+        self.imported_until: int | None = None
+
+    async def async_load(self) -> None:
+        """Load the last imported hour and sums."""
+        data = await self._store.async_load() or {}
+        self.imported_until = data.get("imported_until")
+        self._sums = data.get("sums", {})
+
+    def _statistic_id(self, kind: str, station: int) -> str:
+        return f"{DOMAIN}:{slugify(self._entry.unique_id)}_station_{station}_{kind}"
+
+    async def _async_records(self, since: int, until: int) -> list[tuple]:
+        """Return the station runs that ended in a time range (controller time).
+
+        Runs that are not in the run log cache come from the controller.
+        """
+        cached_since = self._run_log.cached_since or until
+        records = set()
+        start = since
+        while start < min(until, cached_since):
+            end = min(start + FETCH_DAYS * SECONDS_PER_DAY, cached_since, until)
+            records.update(
+                tuple(record)
+                for record in await self._controller.request(
+                    "/jl", {"start": start, "end": end - 1}
+                )
+                if isinstance(record[1], int) and start <= record[3] < end
+            )
+            start = end
+
+        records.update(self._run_log.records(max(since, cached_since), until))
+        return sorted(records, key=lambda record: record[3])
+
+    async def async_import(self) -> int:
+        """Import the complete hours up to the last run log fetch."""
+        async with self._lock:
+            # The run log is fetched up to a controller local time, and the
+            # statistics are imported by UTC hour
+            data = self._coordinator.data
+            time_zone = controller_time_zone(
+                dt_util.get_time_zone(self._hass.config.time_zone) or dt_util.UTC,
+                data.utc_offset,
+                data.device_time,
+            )
+            now = local_to_utc(self._run_log.fetched_until, time_zone)
+            until = now // SECONDS_PER_HOUR * SECONDS_PER_HOUR
+            since = self.imported_until or until - STATISTICS_DAYS * SECONDS_PER_DAY
+            if since >= until:
+                return 0
+
+            # An hour more on each side covers the local times repeated or
+            # skipped by a daylight saving time change, the runs outside are
+            # left out by their UTC end time
+            records = await self._async_records(
+                utc_to_local(since, time_zone) - SECONDS_PER_HOUR,
+                utc_to_local(until, time_zone) + SECONDS_PER_HOUR,
+            )
+            hours = hourly_usage(records, time_zone, since, until)
+            statistics = {
+                key: [
+                    StatisticData(start=utc_from_timestamp(hour), state=value, sum=sum_)
+                    for hour, value, sum_ in rows
+                ]
+                for key, rows in hourly_statistics(
+                    hours, self._sums, self._statistic_id
+                ).items()
+            }
+
+            names = {station.index: station.name for station in data.stations}
+            for (kind, station), batch in statistics.items():
+                station_name = names.get(station, f"Station {station + 1}")
+                async_add_external_statistics(
+                    self._hass,
+                    StatisticMetaData(
+                        has_mean=False,
+                        has_sum=True,
+                        name=f"{self._entry.data[CONF_NAME]} {station_name} {kind.title()}",
+                        source=DOMAIN,
+                        statistic_id=self._statistic_id(kind, station),
+                        unit_of_measurement=UNITS[kind],
+                    ),
+                    batch,
+                )
+
+            self.imported_until = until
+            await self._store.async_save({"imported_until": until, "sums": self._sums})
+
+        count = sum(len(batch) for batch in statistics.values())
+        _LOGGER.debug(
+            "Imported %d hourly statistics from %d run log records", count, len(records)
+        )
+        return count
+
+    def as_dict(self) -> dict:
+        """Return the state of the import for diagnostics."""
+        return {"imported_until": self.imported_until, "statistics": len(self._sums)}
@@ -11,8 +11,9 @@ from . import (
     OpenSprinklerControllerEntity,
     OpenSprinklerProgramEntity,
     OpenSprinklerStationEntity,
+    async_setup_platform_entities,
 )
-from .const import DOMAIN
+from .const import CONF_COMPACT_WEEKDAYS, DOMAIN
 
 
 async def async_setup_entry(
@@ -21,8 +22,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler switches."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -38,6 +40,10 @@ def _create_entities(hass: HomeAssistant, entry: dict):
         entities.append(ProgramEnabledSwitch(entry, name, program, coordinator))
         entities.append(ProgramUseWeatherSwitch(entry, name, program, coordinator))
         entities.append(ProgramEnableDateRange(entry, name, program, coordinator))
+        # The weekdays are a single text entity in compact mode
+        if entry.options.get(CONF_COMPACT_WEEKDAYS, False):
+            continue
+
         for weekday in [
             "Monday",
             "Tuesday",
@@ -88,14 +94,14 @@ class ControllerOperationSwitch(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._controller.enabled:
+        if self._controller_data.enabled:
             return "mdi:barley"
 
         return "mdi:barley-off"
 
     @property
     def extra_state_attributes(self):
-        controller = self._controller
+        controller = self._controller_data
         attributes = {"opensprinkler_type": "controller"}
         for attr in [
             "firmware_version",
@@ -121,15 +127,21 @@ class ControllerOperationSwitch(
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._controller.enabled)
+        return bool(self._controller_data.enabled)
 
     async def async_turn_on(self, **kwargs):
         """Enable the controller operation."""
+        if self._skip_write(self._get_state()):
+            return
+
         await self._controller.enable()
         await self._coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Disable the device operation."""
+        if self._skip_write(not self._get_state()):
+            return
+
         await self._controller.disable()
         await self._coordinator.async_request_refresh()
 
@@ -148,7 +160,7 @@ class ProgramEnabledSwitch(
     @property
     def name(self):
         """Return the name of the switch."""
-        return self._program.name + " Program Enabled"
+        return self._program_data.name + " Program Enabled"
 
     @property
     def unique_id(self) -> str:
@@ -165,22 +177,28 @@ class ProgramEnabledSwitch(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._program.enabled:
+        if self._program_data.enabled:
             return "mdi:calendar-clock"
 
         return "mdi:calendar-remove"
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._program.enabled)
+        return bool(self._program_data.enabled)
 
     async def async_turn_on(self, **kwargs):
         """Enable the program."""
+        if self._skip_write(self._get_state()):
+            return
+
         await self._program.enable()
         await self._coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Disable the program."""
+        if self._skip_write(not self._get_state()):
+            return
+
         await self._program.disable()
         await self._coordinator.async_request_refresh()
 
@@ -205,7 +223,7 @@ class ProgramWeekdaySwitch(
     @property
     def name(self):
         """Return the name of the switch."""
-        return self._program.name + f" {self._weekday} Enabled"
+        return self._program_data.name + f" {self._weekday} Enabled"
 
     @property
     def unique_id(self) -> str:
@@ -226,15 +244,21 @@ class ProgramWeekdaySwitch(
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return self._program.get_weekday_enabled(self._weekday)
+        return self._program_data.weekday_enabled(self._weekday)
 
     async def async_turn_on(self, **kwargs):
         """Enable the program."""
+        if self._skip_write(self._get_state()):
+            return
+
         await self._program.set_weekday_enabled(self._weekday, True)
         await self._coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Disable the program."""
+        if self._skip_write(not self._get_state()):
+            return
+
         await self._program.set_weekday_enabled(self._weekday, False)
         await self._coordinator.async_request_refresh()
 
@@ -258,7 +282,7 @@ class ProgramUseWeatherSwitch(
     @property
     def name(self):
         """Return the name of the switch."""
-        return self._program.name + " Program Use Weather"
+        return self._program_data.name + " Program Use Weather"
 
     @property
     def unique_id(self) -> str:
@@ -270,22 +294,28 @@ class ProgramUseWeatherSwitch(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._program.use_weather_adjustments:
+        if self._program_data.use_weather_adjustments:
             return "mdi:weather-sunny"
 
         return "mdi:weather-sunny-off"
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._program.use_weather_adjustments)
+        return bool(self._program_data.use_weather_adjustments)
 
     async def async_turn_on(self, **kwargs):
         """Enable weather adjustments."""
+        if self._skip_write(self._get_state()):
+            return
+
         await self._program.set_use_weather_adjustments(1)
         await self._coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Disable weather adjustments."""
+        if self._skip_write(not self._get_state()):
+            return
+
         await self._program.set_use_weather_adjustments(0)
         await self._coordinator.async_request_refresh()
 
@@ -309,7 +339,7 @@ class ProgramEnableDateRange(
     @property
     def name(self):
         """Return the name of the switch."""
-        return self._program.name + " Enable Date Range"
+        return self._program_data.name + " Enable Date Range"
 
     @property
     def unique_id(self) -> str:
@@ -325,15 +355,21 @@ class ProgramEnableDateRange(
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._program.date_range_enabled)
+        return bool(self._program_data.date_range_enabled)
 
     async def async_turn_on(self, **kwargs):
         """Enable the program."""
+        if self._skip_write(self._get_state()):
+            return
+
         await self._program.set_date_range_flag(1)
         await self._coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Disable the program."""
+        if self._skip_write(not self._get_state()):
+            return
+
         await self._program.set_date_range_flag(0)
         await self._coordinator.async_request_refresh()
 
@@ -352,7 +388,7 @@ class StationEnabledSwitch(
     @property
     def name(self):
         """Return the name of the switch."""
-        return self._station.name + " Station Enabled"
+        return self._station_data.name + " Station Enabled"
 
     @property
     def unique_id(self) -> str:
@@ -369,27 +405,33 @@ class StationEnabledSwitch(
     @property
     def icon(self) -> str:
         """Return icon."""
-        if self._station.is_master:
-            if self._station.enabled:
+        if self._station_data.is_master:
+            if self._station_data.enabled:
                 return "mdi:water-pump"
             else:
                 return "mdi:water-pump-off"
 
-        if self._station.enabled:
+        if self._station_data.enabled:
             return "mdi:water"
 
         return "mdi:water-off"
 
     def _get_state(self) -> bool:
         """Retrieve latest state."""
-        return bool(self._station.enabled)
+        return bool(self._station_data.enabled)
 
     async def async_turn_on(self, **kwargs):
         """Enable the station."""
+        if self._skip_write(self._get_state()):
+            return
+
         await self._station.enable()
         await self._coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
         """Disable the station."""
+        if self._skip_write(not self._get_state()):
+            return
+
         await self._station.disable()
         await self._coordinator.async_request_refresh()
@@ -1,6 +1,7 @@
 """Component providing support for OpenSprinkler text entities."""
 
 import logging
+import re
 from typing import Callable
 
 from homeassistant.components.text import TextEntity
@@ -8,11 +9,32 @@ from homeassistant.const import CONF_NAME, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.util import slugify
 
-from . import OpenSprinklerProgramEntity, OpenSprinklerText
-from .const import DOMAIN
+from . import (
+    OpenSprinklerProgramEntity,
+    OpenSprinklerText,
+    async_setup_platform_entities,
+)
+from .const import (
+    CONF_COMPACT_START_TIMES,
+    CONF_COMPACT_WEEKDAYS,
+    CONF_OFFSET,
+    CONF_OFFSET_TYPE,
+    DOMAIN,
+    START_TIME_DISABLED,
+    START_TIME_MIDNIGHT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# One letter per weekday starting on Monday, '-' for a day that is off
+WEEKDAY_LETTERS = "MTWTFSS"
+WEEKDAYS_MASK = 0x7F
+
+# A start time is "off", a time of day ("06:30") or an offset in minutes
+# from sunrise or sunset ("sunrise", "sunset-30")
+START_TIME_PATTERN = r"(off|\d{1,2}:\d{2}|(sunrise|sunset)([+-]\d{1,3})?)"
+START_TIMES_PATTERN = rf"\s*{START_TIME_PATTERN}(\s+{START_TIME_PATTERN}){{0,3}}\s*"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -20,8 +42,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler texts."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -33,6 +56,10 @@ def _create_entities(hass: HomeAssistant, entry: dict):
 
     for _, program in controller.programs.items():
         entities.append(ProgramNameText(entry, name, program, coordinator))
+        if entry.options.get(CONF_COMPACT_WEEKDAYS, False):
+            entities.append(ProgramWeekdaysText(entry, name, program, coordinator))
+        if entry.options.get(CONF_COMPACT_START_TIMES, False):
+            entities.append(ProgramStartTimesText(entry, name, program, coordinator))
 
     return entities
 
@@ -54,7 +81,7 @@ class ProgramNameText(OpenSprinklerProgramEntity, OpenSprinklerText, TextEntity)
     @property
     def name(self) -> str:
         """Return the name of this sensor."""
-        return f"{self._program.name} Program Name"
+        return f"{self._program_data.name} Program Name"
 
     @property
     def unique_id(self) -> str:
@@ -86,9 +113,192 @@ class ProgramNameText(OpenSprinklerProgramEntity, OpenSprinklerText, TextEntity)
     @property
     def native_value(self) -> str:
         """The value of the text."""
-        return self._program.name
+        return self._program_data.name
 
     async def async_set_value(self, value: str) -> None:
         """Set the text value."""
+        if self._skip_write(value == self.native_value):
+            return
+
         await self._program.set_name(value)
         await self._coordinator.async_request_refresh()
+
+
+class ProgramWeekdaysText(OpenSprinklerProgramEntity, OpenSprinklerText, TextEntity):
+    """Represent text for the days of the week of a Weekly program.
+
+    Replaces the seven weekday switches of a program, e.g. "MTW-F--" runs
+    Monday to Wednesday and Friday.
+    """
+
+    def __init__(self, entry, name, program, coordinator):
+        """Set up a new OpenSprinkler program weekdays text."""
+        self._program = program
+        self._entity_type = "text"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def entity_category(self):
+        """Return the entity category."""
+        return EntityCategory.CONFIG
+
+    @property
+    def name(self) -> str:
+        """Return the name of this text."""
+        return f"{self._program_data.name} Weekdays"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_weekdays_{self._program.index}"
+        )
+
+    @property
+    def mode(self) -> str:
+        """Defines how the text should be displayed in the UI. Can be text or password."""
+        return "text"
+
+    @property
+    def native_max(self) -> int:
+        """The maximum number of characters in the text value (inclusive)."""
+        return len(WEEKDAY_LETTERS)
+
+    @property
+    def native_min(self) -> int:
+        """The minimum number of characters in the text value (inclusive)."""
+        return len(WEEKDAY_LETTERS)
+
+    @property
+    def pattern(self) -> str:
+        """A regex pattern the text value must match."""
+        return "".join(f"[{letter}{letter.lower()}-]" for letter in WEEKDAY_LETTERS)
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:calendar-week"
+
+    @property
+    def native_value(self) -> str:
+        """The value of the text."""
+        return "".join(
+            letter if enabled else "-"
+            for letter, enabled in zip(WEEKDAY_LETTERS, self._program_data.weekdays)
+        )
+
+    async def async_set_value(self, value: str) -> None:
+        """Set all the weekdays of the program in one request."""
+        if self._program_data.program_schedule_type != 0:
+            raise RuntimeError(
+                "Cannot update Weekly schedule when schedule type is not 'Weekday'"
+            )
+
+        weekdays = 0
+        for day, letter in enumerate(value):
+            if letter != "-":
+                weekdays |= 1 << day
+
+        days0 = self._program_data.days0 & ~WEEKDAYS_MASK | weekdays
+        if self._skip_write(days0 == self._program_data.days0):
+            return
+
+        await self._program.set_days0(days0)
+        await self._coordinator.async_request_refresh()
+
+
+def _format_start_time(offset_type: str, offset: int) -> str:
+    """Return a start time as text."""
+    if offset_type == START_TIME_DISABLED:
+        return "off"
+    if offset_type == START_TIME_MIDNIGHT:
+        return f"{offset // 60:02d}:{offset % 60:02d}"
+    if offset:
+        return f"{offset_type}{offset:+d}"
+    return offset_type
+
+
+def _parse_start_time(text: str) -> dict:
+    """Return a start time of the set_start_times service from text."""
+    match = re.fullmatch(START_TIME_PATTERN, text)
+    if match is None:
+        raise ValueError(f"Invalid start time '{text}'")
+
+    if text == "off":
+        return {CONF_OFFSET_TYPE: START_TIME_DISABLED}
+
+    if match.group(2):
+        return {CONF_OFFSET_TYPE: match.group(2), CONF_OFFSET: int(match.group(3) or 0)}
+
+    hours, minutes = (int(part) for part in text.split(":"))
+    if hours > 23 or minutes > 59:
+        raise ValueError(f"Invalid start time '{text}'")
+    return {CONF_OFFSET_TYPE: START_TIME_MIDNIGHT, CONF_OFFSET: hours * 60 + minutes}
+
+
+class ProgramStartTimesText(OpenSprinklerProgramEntity, OpenSprinklerText, TextEntity):
+    """Represent text for all the start times of a program.
+
+    Replaces the start time, offset and offset type entities of a program,
+    e.g. "06:00 sunset-30 off off".
+    """
+
+    def __init__(self, entry, name, program, coordinator):
+        """Set up a new OpenSprinkler program start times text."""
+        self._program = program
+        self._entity_type = "text"
+        super().__init__(entry, name, coordinator)
+
+    @property
+    def entity_category(self):
+        """Return the entity category."""
+        return EntityCategory.CONFIG
+
+    @property
+    def name(self) -> str:
+        """Return the name of this text."""
+        return f"{self._program_data.name} Start Times"
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique, Home Assistant friendly identifier for this entity."""
+        return slugify(
+            f"{self._entry.unique_id}_{self._entity_type}_start_times_{self._program.index}"
+        )
+
+    @property
+    def mode(self) -> str:
+        """Defines how the text should be displayed in the UI. Can be text or password."""
+        return "text"
+
+    @property
+    def pattern(self) -> str:
+        """A regex pattern the text value must match."""
+        return START_TIMES_PATTERN
+
+    @property
+    def icon(self) -> str:
+        """Return icon."""
+        return "mdi:clock-start"
+
+    @property
+    def native_value(self) -> str:
+        """The value of the text."""
+        program = self._program_data
+        starts = zip(
+            program.program_start_time_offset_types,
+            program.program_start_time_offsets,
+        )
+        # Only start0 is a start time if repeating type
+        if program.start_time_type == 0:
+            starts = list(starts)[:1]
+
+        return " ".join(
+            _format_start_time(offset_type, offset) for offset_type, offset in starts
+        )
+
+    async def async_set_value(self, value: str) -> None:
+        """Set all the start times of the program in one request."""
+        await self.set_start_times(
+            [_parse_start_time(start_time) for start_time in value.split()]
+        )
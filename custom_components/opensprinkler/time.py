@@ -11,8 +11,18 @@ from homeassistant.const import CONF_NAME, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.util import slugify
 
-from . import OpenSprinklerProgramEntity, OpenSprinklerTime
-from .const import DOMAIN, START_TIME_MIDNIGHT, START_TIME_SUNRISE, START_TIME_SUNSET
+from . import (
+    OpenSprinklerProgramEntity,
+    OpenSprinklerTime,
+    async_setup_platform_entities,
+)
+from .const import (
+    CONF_COMPACT_START_TIMES,
+    DOMAIN,
+    START_TIME_MIDNIGHT,
+    START_TIME_SUNRISE,
+    START_TIME_SUNSET,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,8 +33,9 @@ async def async_setup_entry(
     async_add_entities: Callable,
 ):
     """Set up the OpenSprinkler times."""
-    entities = _create_entities(hass, entry)
-    async_add_entities(entities)
+    await async_setup_platform_entities(
+        hass, entry, async_add_entities, _create_entities
+    )
 
 
 def _create_entities(hass: HomeAssistant, entry: dict):
@@ -34,6 +45,10 @@ def _create_entities(hass: HomeAssistant, entry: dict):
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     name = entry.data[CONF_NAME]
 
+    # The start times are a single text entity in compact mode
+    if entry.options.get(CONF_COMPACT_START_TIMES, False):
+        return entities
+
     for _, program in controller.programs.items():
         for start_index in range(4):
             entities.append(
@@ -65,7 +80,7 @@ class ProgramStartTime(OpenSprinklerProgramEntity, OpenSprinklerTime, TimeEntity
     def name(self) -> str:
         """Return the name of this time."""
         start = str(self._start_index) if self._start_index > 0 else ""
-        return f"{self._program.name} Start{start} Time"
+        return f"{self._program_data.name} Start{start} Time"
 
     @property
     def unique_id(self) -> str:
@@ -88,23 +103,36 @@ class ProgramStartTime(OpenSprinklerProgramEntity, OpenSprinklerTime, TimeEntity
     @property
     def native_value(self) -> time:
         """The value of the time."""
-        minutes = self._program.get_program_start_time_offset(self._start_index)
-        offset_type = self._program.get_program_start_time_offset_type(
+        minutes = self._program_data.program_start_time_offsets[self._start_index]
+        offset_type = self._program_data.program_start_time_offset_types[
             self._start_index
-        )
+        ]
 
         if offset_type == START_TIME_SUNRISE:
-            minutes += self._controller.sunrise
+            minutes += self._coordinator.data.sunrise
         elif offset_type == START_TIME_SUNSET:
-            minutes += self._controller.sunset
+            minutes += self._coordinator.data.sunset
 
         return datetime.time(trunc(minutes / 60), minutes % 60, 0)
 
     async def async_set_value(self, value: time) -> None:
         """Update the current value."""
+        # Only start0 has a time if repeating type
+        if self._start_index > 0 and self._program_data.start_time_type == 0:
+            raise RuntimeError(
+                f"Cannot update start{self._start_index} time when start time type is 'repeating'"
+            )
+
+        # A start time from midnight is encoded as its minutes, so the type and
+        # time are set together in one request.
         minutes = value.hour * 60 + value.minute
-        await self._program.set_program_start_time_offset_type(
-            self._start_index, START_TIME_MIDNIGHT
-        )
-        await self._program.set_program_start_time_offset(self._start_index, minutes)
+        program = self._program_data
+        if self._skip_write(
+            program.program_start_time_offset_types[self._start_index]
+            == START_TIME_MIDNIGHT
+            and program.program_start_time_offsets[self._start_index] == minutes
+        ):
+            return
+
+        await self._program.set_program_start_time(self._start_index, minutes)
         await self._coordinator.async_request_refresh()
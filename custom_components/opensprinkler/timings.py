@@ -0,0 +1,58 @@
+"""Timings of the phases of setting up an OpenSprinkler entry."""
+
+from time import monotonic
+
+
+class SetupTimings:
+    """Record how long each phase of an entry setup took, in seconds.
+
+    Each phase lasts from the end of the previous one. The platforms record
+    the time to construct their entities and to add them to Home Assistant.
+    """
+
+    def __init__(self):
+        """Initialize, starting the first phase."""
+        self._start = self._last = monotonic()
+        self.phases: dict[str, float] = {}
+        self.platforms: dict[str, dict] = {}
+
+    def end_phase(self, name: str) -> None:
+        """End a phase."""
+        now = monotonic()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    def add_platform(
+        self, domain: str, entities: int, construction: float, registration: float
+    ) -> None:
+        """Record the setup of a platform."""
+        self.platforms[domain] = {
+            "entities": entities,
+            "construction": construction,
+            "registration": registration,
+        }
+
+    @property
+    def total(self) -> float:
+        """Return the time from the start of the setup to the last phase."""
+        return self._last - self._start
+
+    def summary(self) -> str:
+        """Return the timings as one line for the log."""
+        phases = ", ".join(
+            f"{name} {seconds:.3f} s" for name, seconds in self.phases.items()
+        )
+        platforms = ", ".join(
+            f"{domain} {timing['entities']} entities "
+            f"{timing['construction']:.3f} + {timing['registration']:.3f} s"
+            for domain, timing in sorted(self.platforms.items())
+        )
+        return f"{self.total:.3f} s ({phases}; {platforms})"
+
+    def as_dict(self) -> dict:
+        """Return the timings for diagnostics."""
+        return {
+            "total": self.total,
+            "phases": self.phases,
+            "platforms": self.platforms,
+        }
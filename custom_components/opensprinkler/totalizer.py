@@ -0,0 +1,87 @@
+"""Water volume totals integrated from the OpenSprinkler flow sensor."""
+
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import FLOW_STORAGE_KEY
+from .snapshot import ControllerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between polls above which the flow is not integrated, e.g. after the
+# controller was unreachable
+MAX_SAMPLE_GAP = 300
+
+# Seconds the totals may be held in memory before they are saved
+SAVE_DELAY = 60
+
+STORAGE_VERSION = 1
+
+
+class FlowTotalizer:
+    """Integrate the flow rate of each poll into water volume in litres.
+
+    The rate is integrated with the trapezoidal rule over the time between
+    polls. The volume of an interval is split between the (non master)
+    stations running at its start, and always added to the controller total.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize."""
+        self._store = Store(hass, STORAGE_VERSION, FLOW_STORAGE_KEY.format(entry_id))
+        self._last_sample: tuple[float, float, list[int]] | None = None
+        self.total = 0.0
+        self.stations: dict[int, float] = {}
+
+    async def async_load(self) -> None:
+        """Load the totals saved by a previous run."""
+        data = await self._store.async_load() or {}
+        self.total = data.get("total", 0.0)
+        self.stations = {
+            int(index): volume for index, volume in data.get("stations", {}).items()
+        }
+
+    async def async_save(self) -> None:
+        """Save the totals now."""
+        await self._store.async_save(self._data())
+
+    def _data(self) -> dict:
+        return {"total": self.total, "stations": self.stations}
+
+    def add_sample(self, snapshot: ControllerSnapshot, now: float) -> None:
+        """Add the flow rate of a poll taken at a monotonic time."""
+        rate = snapshot.flow_rate
+        if rate is None:
+            self._last_sample = None
+            return
+
+        running = [
+            station.index
+            for station in snapshot.stations
+            if snapshot.is_station_running(station.index) and not station.is_master
+        ]
+        last_sample, self._last_sample = self._last_sample, (now, rate, running)
+        if last_sample is None:
+            return
+
+        last_time, last_rate, last_running = last_sample
+        elapsed = now - last_time
+        if not 0 < elapsed <= MAX_SAMPLE_GAP:
+            _LOGGER.debug("Not integrating the flow over %.0f seconds", elapsed)
+            return
+
+        volume = (last_rate + rate) / 2 * elapsed / 60
+        if not volume:
+            return
+
+        self.total += volume
+        for index in last_running:
+            share = volume / len(last_running)
+            self.stations[index] = self.stations.get(index, 0.0) + share
+        self._store.async_delay_save(self._data, SAVE_DELAY)
+
+    def as_dict(self) -> dict:
+        """Return the totals for diagnostics."""
+        return {"total": self.total, "stations": len(self.stations)}
@@ -0,0 +1,159 @@
+"""WebSocket API streaming compact OpenSprinkler controller state."""
+
+import logging
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED
+from .snapshot import ControllerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+
+# Fields sent as a list per station or program, patched by index in deltas
+LIST_FIELDS = ("station_names", "remaining", "program_names", "programs")
+
+# Bits of each "programs" item
+PROGRAM_ENABLED = 1
+PROGRAM_RUNNING = 2
+
+
+def compact_state(snapshot: ControllerSnapshot) -> dict:
+    """Return the state of a controller a dashboard needs to render it.
+
+    The running stations are a hexadecimal bitmask (bit n for station n), as
+    JavaScript numbers do not hold more than 53 bits.
+    """
+    return {
+        "device_time": snapshot.device_time,
+        "enabled": bool(snapshot.enabled),
+        "running": format(snapshot.running_stations, "x"),
+        "station_names": [station.name for station in snapshot.stations],
+        "remaining": [
+            station.seconds_remaining if station.is_running else 0
+            for station in snapshot.stations
+        ],
+        "program_names": [program.name for program in snapshot.programs],
+        "programs": [
+            (PROGRAM_ENABLED if program.enabled else 0)
+            | (PROGRAM_RUNNING if program.is_running else 0)
+            for program in snapshot.programs
+        ],
+        "flow_rate": snapshot.flow_rate,
+        "water_level": snapshot.water_level,
+        "pause_remaining": snapshot.pause_time_remaining or 0,
+        "rain_delay_stop_time": (
+            snapshot.rain_delay_stop_time if snapshot.rain_delay_active else 0
+        ),
+    }
+
+
+def compact_delta(previous: dict, current: dict) -> dict | None:
+    """Return the fields of a compact state that changed.
+
+    Lists of the same length are sent as [index, value] pairs of the items
+    that changed. Returns None when the stations or programs changed, and the
+    whole state has to be sent again.
+    """
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if value == old:
+            continue
+        if key not in LIST_FIELDS:
+            delta[key] = value
+        elif len(value) != len(old):
+            return None
+        else:
+            delta[key] = [
+                [index, item]
+                for index, (item, old_item) in enumerate(zip(value, old))
+                if item != old_item
+            ]
+
+    return delta
+
+
+def _get_compact_state(data: dict) -> dict:
+    """Return the compact state of the latest poll, shared by all subscribers."""
+    snapshot = data["coordinator"].data
+    cached = data.get("compact_state")
+    if cached is None or cached[0] is not snapshot:
+        cached = data["compact_state"] = snapshot, compact_state(snapshot)
+    return cached[1]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE,
+        vol.Required("config_entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Send the compact state of a controller, then its changes after each poll.
+
+    When the controller is unloaded, an ``unloaded`` event ends the
+    subscription.
+    """
+    data = hass.data.get(DOMAIN, {}).get(msg["config_entry_id"])
+    if data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Controller not found"
+        )
+        return
+
+    state = _get_compact_state(data)
+
+    @callback
+    def _async_send_delta() -> None:
+        nonlocal state
+        current = _get_compact_state(data)
+        if current is state:
+            return
+
+        delta = compact_delta(state, current)
+        state = current
+        if delta is None:
+            message = {"snapshot": current}
+        elif delta:
+            message = {"delta": delta}
+        else:
+            return
+        connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    remove_listener = data["coordinator"].async_add_listener(_async_send_delta)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        remove_listener()
+        remove_unload_listener()
+
+    @callback
+    def _async_end() -> None:
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+
+        _async_unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"unloaded": True})
+        )
+
+    remove_unload_listener = async_dispatcher_connect(
+        hass, SIGNAL_ENTRY_UNLOADED.format(msg["config_entry_id"]), _async_end
+    )
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"snapshot": state}))
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
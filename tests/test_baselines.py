@@ -0,0 +1,81 @@
+"""Tests for the per-station current draw and flow baselines."""
+
+from statistics import mean, stdev
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from opensprinkler.baselines import MIN_SAMPLES, RunningStats, StationBaselines
+from opensprinkler.const import EVENT_STATION_DEVIATION
+
+
+def make_baselines():
+    hass = SimpleNamespace(bus=SimpleNamespace(async_fire=MagicMock()))
+    baselines = StationBaselines(hass, "entry")
+    baselines._store = SimpleNamespace(async_delay_save=lambda data, delay: None)
+    return baselines
+
+
+def make_snapshot(current_draw, running, start_time=0, device_time=60):
+    stations = [
+        SimpleNamespace(index=i, is_master=i == 0, start_time=start_time)
+        for i in range(4)
+    ]
+    return SimpleNamespace(
+        current_draw=current_draw,
+        flow_rate=None,
+        device_time=device_time,
+        stations=stations,
+        is_station_running=lambda index: index in running,
+    )
+
+
+def test_running_stats_match_the_batch_statistics():
+    samples = [310, 305, 322, 298, 315, 301]
+    stats = RunningStats()
+    for sample in samples:
+        stats.add(sample)
+
+    assert stats.count == 6
+    assert stats.mean == pytest.approx(mean(samples))
+    assert stats.std == pytest.approx(stdev(samples))
+
+
+def test_learns_one_settled_station_and_reports_a_deviation_once_per_run():
+    baselines = make_baselines()
+    # Another station running, or the master only with it, is not learned
+    baselines.add_sample(make_snapshot(600, {1, 2}))
+    baselines.add_sample(make_snapshot(300, {1}, device_time=10))
+    assert baselines.stats == {}
+
+    for i in range(MIN_SAMPLES + 1):
+        baselines.add_sample(make_snapshot(300 + i % 2 * 20, {0, 1}))
+    assert baselines.stats["current_draw", 1].count == MIN_SAMPLES + 1
+    assert abs(baselines.deviations["current_draw", 1]) < 1
+    baselines._hass.bus.async_fire.assert_not_called()
+
+    # A broken valve wire
+    baselines.add_sample(make_snapshot(40, {1}, start_time=100, device_time=200))
+    baselines.add_sample(make_snapshot(40, {1}, start_time=100, device_time=205))
+    assert baselines.deviations["current_draw", 1] < -4
+    baselines._hass.bus.async_fire.assert_called_once()
+    event_type, data = baselines._hass.bus.async_fire.call_args.args
+    assert event_type == EVENT_STATION_DEVIATION
+    assert data["station"] == 1
+    assert data["quantity"] == "current_draw"
+    assert data["value"] == 40
+    assert baselines.as_dict() == {"current_draw": 1, "flow_rate": 0}
+
+
+@pytest.mark.asyncio
+async def test_baselines_are_restored_with_station_indexes():
+    baselines = make_baselines()
+    # Saved as JSON, with the station indexes as strings
+    baselines._store.async_load = AsyncMock(
+        return_value={"current_draw": {"1": [20, 310.0, 1900.0]}, "flow_rate": {}}
+    )
+
+    await baselines.async_load()
+
+    assert baselines.stats == {("current_draw", 1): RunningStats(20, 310.0, 1900.0)}
+    assert baselines._data()["current_draw"] == {1: [20, 310.0, 1900.0]}
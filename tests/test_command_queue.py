@@ -0,0 +1,66 @@
+"""Tests for the offline command queue."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler.commands import OpenSprinklerCommandQueue, command_key
+from opensprinkler.latency import LatencyTracker
+from pyopensprinkler import OpenSprinklerConnectionError
+
+
+def make_queue():
+    controller = SimpleNamespace(request=AsyncMock(return_value={"result": 1}))
+    queue = OpenSprinklerCommandQueue(
+        SimpleNamespace(), "entry", controller, LatencyTracker(2, 10)
+    )
+    queue._store = SimpleNamespace(async_save=AsyncMock())
+    queue.enabled = True
+    queue.expiry = 3600
+    return controller, queue
+
+
+def test_commands_on_the_same_target_share_a_key():
+    assert command_key("/cm", {"sid": 1, "en": 1, "t": 60}) == command_key(
+        "/cm", {"sid": 1, "en": 0}
+    )
+    assert command_key("/cp", {"pid": 0, "en": 1}) != command_key(
+        "/cp", {"pid": 0, "name": "Lawn"}
+    )
+    assert command_key("/cp", {"pid": 0, "v": "[]", "name": "Lawn"}) is None
+    assert command_key("/cv", {"rbt": 1}) is None
+    assert command_key("/ja", None) is None
+
+
+@pytest.mark.asyncio
+async def test_commands_wait_for_the_controller_and_replay_in_order():
+    controller, queue = make_queue()
+    request = queue._request
+    request.side_effect = OpenSprinklerConnectionError("Cannot connect")
+
+    assert await controller.request("/cv", {"en": 1}) == {"result": 1}
+    await controller.request("/co", {"wl": 80})
+    await controller.request("/cm", {"sid": 2, "en": 1, "t": 60})
+    await controller.request("/cv", {"en": 0})
+    await controller.request("/co", {"wl": 120})
+    # Reads and whole program writes still fail
+    with pytest.raises(OpenSprinklerConnectionError):
+        await controller.request("/ja")
+    with pytest.raises(OpenSprinklerConnectionError):
+        await controller.request("/cp", {"pid": 0, "v": "[]"})
+
+    assert queue.pending == 3
+    assert queue.collapsed == 2
+
+    request.reset_mock(side_effect=True)
+    queue._commands[0]["time"] -= 3601
+    assert await queue.async_replay() == 2
+    assert [call.args for call in request.await_args_list] == [
+        ("/cv", {"en": 0}, None, None),
+        ("/co", {"wl": 120}, None, None),
+    ]
+    assert queue.pending == 0
+    assert queue.expired == 1
+
+    await controller.request("/cv", {"en": 1})
+    request.assert_awaited_with("/cv", {"en": 1}, None, None)
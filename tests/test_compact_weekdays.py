@@ -0,0 +1,76 @@
+"""Tests for the compact weekdays text entity."""
+
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler.const import DOMAIN
+from opensprinkler.text import ProgramWeekdaysText
+
+
+def make_entity(weekdays, days0, schedule_type=0):
+    # The days of the live pyopensprinkler state are not compared with
+    program = SimpleNamespace(index=0, days0=None, set_days0=AsyncMock())
+    snapshot = SimpleNamespace(
+        programs=[
+            SimpleNamespace(
+                name="Lawn",
+                days0=days0,
+                weekdays=weekdays,
+                program_schedule_type=schedule_type,
+            )
+        ]
+    )
+    coordinator = SimpleNamespace(data=snapshot, async_request_refresh=AsyncMock())
+    entry = SimpleNamespace(entry_id="entry", unique_id="aa_bb", options={})
+    entity = ProgramWeekdaysText(entry, "OpenSprinkler", program, coordinator)
+    entity.hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                "entry": {
+                    "command_queue": SimpleNamespace(pending=0),
+                    "skipped_writes": Counter(),
+                }
+            }
+        }
+    )
+    return entity
+
+
+def test_weekdays_are_shown_as_letters():
+    entity = make_entity((True, True, True, False, True, False, False), 0b0010111)
+
+    assert entity.native_value == "MTW-F--"
+    assert entity.unique_id == "aa_bb_text_weekdays_0"
+
+
+@pytest.mark.asyncio
+async def test_weekdays_are_written_in_one_request():
+    """All seven days are set by a single program change."""
+    entity = make_entity((False,) * 7, 0b10000000)
+
+    await entity.async_set_value("m-w---S")
+
+    entity._program.set_days0.assert_awaited_once_with(0b11000101)
+    entity._coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_weekdays_of_the_last_poll_are_not_written_again():
+    entity = make_entity((True, False, True, False, False, False, True), 0b11000101)
+
+    await entity.async_set_value("M-W---S")
+
+    entity._program.set_days0.assert_not_awaited()
+    assert entity.hass.data[DOMAIN]["entry"]["skipped_writes"] == {"text": 1}
+
+
+@pytest.mark.asyncio
+async def test_weekdays_need_a_weekly_program():
+    entity = make_entity((False,) * 7, 0, schedule_type=3)
+
+    with pytest.raises(RuntimeError):
+        await entity.async_set_value("MTWTFSS")
+
+    entity._program.set_days0.assert_not_awaited()
@@ -0,0 +1,58 @@
+"""Tests for the per controller connection pool."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from opensprinkler.connection import KEEPALIVE_MARGIN, OpenSprinklerConnection
+
+
+def make_hass():
+    return SimpleNamespace(bus=SimpleNamespace(async_listen_once=Mock()))
+
+
+async def start_server():
+    async def handle(request):
+        return web.json_response({"result": 1})
+
+    app = web.Application()
+    app.router.add_get("/ja", handle)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_polls_reuse_one_connection():
+    """Consecutive requests are sent on the same kept alive connection."""
+    server = await start_server()
+    connection = OpenSprinklerConnection(make_hass(), True, 5)
+    assert connection.reuse_rate is None
+
+    try:
+        for _ in range(4):
+            async with connection.session.get(server.make_url("/ja")) as resp:
+                assert await resp.json() == {"result": 1}
+    finally:
+        await connection.async_close()
+        await server.close()
+
+    assert connection.as_dict() == {
+        "connections_created": 1,
+        "connections_reused": 3,
+        "reuse_rate": 0.75,
+        "keepalive_timeout": 5 + KEEPALIVE_MARGIN,
+    }
+
+
+@pytest.mark.asyncio
+async def test_keepalive_follows_scan_interval():
+    """Idle connections outlive the time between two polls."""
+    connection = OpenSprinklerConnection(make_hass(), False, 30)
+    try:
+        assert connection.keepalive_timeout == 30 + KEEPALIVE_MARGIN
+        assert connection.as_dict()["keepalive_timeout"] == 30 + KEEPALIVE_MARGIN
+    finally:
+        await connection.async_close()
@@ -0,0 +1,74 @@
+"""Tests for the deadband of the analog diagnostic sensors."""
+
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from opensprinkler import exceeds_deadband
+from opensprinkler.const import (
+    CONF_FLOW_RATE_DEADBAND,
+    CONF_MAX_SILENCE,
+    CONF_RELATIVE_DEADBAND,
+    DOMAIN,
+)
+from opensprinkler.sensor import FlowRateSensor
+
+
+def test_deadband_is_the_larger_of_absolute_and_relative():
+    assert not exceeds_deadband(2.0, 2.0, 0, 0)
+    assert exceeds_deadband(2.0, 2.01, 0, 0)
+    assert not exceeds_deadband(10.0, 10.4, 0.5, 0)
+    assert not exceeds_deadband(10.0, 10.9, 0.5, 0.1)
+    assert exceeds_deadband(10.0, 11.0, 0.5, 0.1)
+    # Starting and stopping always count
+    assert exceeds_deadband(0, 0.1, 0.5, 0)
+    assert exceeds_deadband(0.1, 0, 0.5, 0)
+    assert exceeds_deadband(None, 0.1, 0.5, 0)
+
+
+def test_flow_rate_writes_only_outside_the_deadband_or_after_silence():
+    snapshot = SimpleNamespace(flow_rate=10.0)
+    coordinator = SimpleNamespace(data=snapshot, last_update_success=True)
+    entry = SimpleNamespace(
+        entry_id="entry",
+        unique_id="aa_bb",
+        options={
+            CONF_FLOW_RATE_DEADBAND: 0.5,
+            CONF_RELATIVE_DEADBAND: 0,
+            CONF_MAX_SILENCE: 300,
+        },
+    )
+    entity = FlowRateSensor(entry, "OpenSprinkler", None, coordinator)
+    entity.hass = SimpleNamespace(
+        data={DOMAIN: {"entry": {"deadband_suppressed": Counter()}}}
+    )
+    entity.async_write_ha_state = MagicMock()
+
+    with patch("opensprinkler.monotonic", return_value=0.0):
+        entity._remember_written()
+
+    with patch("opensprinkler.monotonic", return_value=10.0):
+        snapshot.flow_rate = 10.3
+        entity._handle_coordinator_update()
+        assert entity.state == 10.0
+        entity.async_write_ha_state.assert_not_called()
+
+        snapshot.flow_rate = 11.0
+        entity._handle_coordinator_update()
+        assert entity.state == 11.0
+        entity.async_write_ha_state.assert_called_once()
+
+    with patch("opensprinkler.monotonic", return_value=320.0):
+        snapshot.flow_rate = 11.2
+        entity._handle_coordinator_update()
+        assert entity.state == 11.2
+        assert entity.async_write_ha_state.call_count == 2
+
+    # Unavailable is written right away
+    coordinator.last_update_success = False
+    with patch("opensprinkler.monotonic", return_value=321.0):
+        entity._handle_coordinator_update()
+    assert entity.async_write_ha_state.call_count == 3
+    assert entity.hass.data[DOMAIN]["entry"]["deadband_suppressed"] == {
+        CONF_FLOW_RATE_DEADBAND: 1
+    }
@@ -0,0 +1,144 @@
+"""Tests for the station and program events derived from polls."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from opensprinkler.events import OpenSprinklerEventEmitter, diff_events
+from opensprinkler.snapshot import StationSnapshot
+
+from .test_schedule import make_program
+
+
+def make_snapshot(device_time, running, queued=None):
+    """Return a snapshot with stations running and queued by program id.
+
+    running is {index: (program id, start, end)}, queued {index: program id}.
+    """
+    queued = queued or {}
+    stations = tuple(
+        StationSnapshot(
+            index,
+            f"S{index + 1}",
+            True,
+            False,
+            index in running,
+            "idle",
+            *(
+                (running[index][0], 0, *running[index][1:])
+                if index in running
+                else (queued.get(index, 0), 0, 0, 0)
+            ),
+        )
+        for index in range(3)
+    )
+    mask = sum(1 << index for index in running)
+    program_stations = frozenset(
+        station.index for station in stations if station.running_program_id == 1
+    )
+    return SimpleNamespace(
+        device_time=device_time,
+        sunrise=420,
+        sunset=1140,
+        water_level=100,
+        stations=stations,
+        programs=(make_program(0, is_running=bool(program_stations)),),
+        running_stations=mask,
+        program_stations=(program_stations,),
+        is_station_running=lambda index: bool(mask >> index & 1),
+    )
+
+
+def test_events_follow_a_program_through_its_stations():
+    program_starts = {}
+    idle = make_snapshot(1000, {})
+    first = make_snapshot(1005, {0: (1, 1000, 1600)})
+    second = make_snapshot(1605, {2: (1, 1600, 1900)})
+    done = make_snapshot(1905, {})
+
+    assert diff_events(idle, first, program_starts) == [
+        (
+            "opensprinkler_station_started",
+            {"station": 0, "program_id": 1, "duration": 600},
+        ),
+        (
+            "opensprinkler_program_started",
+            {"program": 0, "program_id": 1, "duration": 900},
+        ),
+    ]
+    assert diff_events(first, second, program_starts) == [
+        (
+            "opensprinkler_station_stopped",
+            {"station": 0, "program_id": 1, "duration": 605},
+        ),
+        (
+            "opensprinkler_station_started",
+            {"station": 2, "program_id": 1, "duration": 300},
+        ),
+    ]
+    assert diff_events(second, done, program_starts) == [
+        (
+            "opensprinkler_station_stopped",
+            {"station": 2, "program_id": 1, "duration": 305},
+        ),
+        (
+            "opensprinkler_program_stopped",
+            {"program": 0, "program_id": 1, "duration": 900},
+        ),
+    ]
+    assert diff_events(done, make_snapshot(1910, {}), program_starts) == []
+
+
+def test_program_keeps_running_while_a_station_waits():
+    program_starts = {}
+    idle = make_snapshot(1000, {})
+    # Only the second station, waiting for its turn
+    queued = make_snapshot(1005, {}, {2: 1})
+    running = make_snapshot(1065, {2: (1, 1060, 1360)})
+    # Between two stations, the next one waiting for the delay to pass
+    between = make_snapshot(1365, {}, {1: 1})
+    done = make_snapshot(1700, {})
+
+    assert diff_events(idle, queued, program_starts) == [
+        (
+            "opensprinkler_program_started",
+            {"program": 0, "program_id": 1, "duration": 900},
+        ),
+    ]
+    assert [event for event, _ in diff_events(queued, running, program_starts)] == [
+        "opensprinkler_station_started"
+    ]
+    assert [event for event, _ in diff_events(running, between, program_starts)] == [
+        "opensprinkler_station_stopped"
+    ]
+    assert diff_events(between, done, program_starts) == [
+        (
+            "opensprinkler_program_stopped",
+            {"program": 0, "program_id": 1, "duration": 695},
+        ),
+    ]
+
+
+def test_station_run_again_is_a_stop_and_a_start():
+    first = make_snapshot(1000, {1: (99, 900, 1100)})
+    again = make_snapshot(1105, {1: (99, 1100, 1200)})
+
+    assert [event for event, _ in diff_events(first, again, {})] == [
+        "opensprinkler_station_stopped",
+        "opensprinkler_station_started",
+    ]
+
+
+def test_emitter_fires_on_the_bus_once_per_snapshot():
+    hass = MagicMock()
+    idle = make_snapshot(1000, {})
+    emitter = OpenSprinklerEventEmitter(hass, "entry", idle)
+
+    emitter.async_update(idle)
+    running = make_snapshot(1005, {1: (99, 1000, 1060)})
+    emitter.async_update(running)
+    emitter.async_update(running)
+
+    hass.bus.async_fire.assert_called_once_with(
+        "opensprinkler_station_started",
+        {"config_entry_id": "entry", "station": 1, "program_id": 99, "duration": 60},
+    )
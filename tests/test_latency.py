@@ -0,0 +1,44 @@
+"""Tests for the timeouts derived from controller latency."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler import OpenSprinklerDataUpdater
+from opensprinkler.latency import MIN_SAMPLES, LatencyTracker
+
+
+def test_timeout_follows_the_latency_between_floor_and_ceiling():
+    latency = LatencyTracker(2, 10)
+    for _ in range(MIN_SAMPLES - 1):
+        latency.add(0.08)
+    # Not enough requests measured yet
+    assert latency.timeout == 10
+
+    latency.add(0.08)
+    assert latency.timeout == 2
+
+    for _ in range(MIN_SAMPLES):
+        latency.add(1.5)
+    assert latency.percentile(0.99) == 1.5
+    assert latency.timeout == 6
+
+    latency.add_timeout(6)
+    assert latency.timeout == 10
+    assert latency.as_dict()["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_polls_and_commands_have_separate_budgets():
+    controller = SimpleNamespace(
+        _state={"status": "current"},
+        refresh=AsyncMock(side_effect=asyncio.TimeoutError),
+    )
+    updater = OpenSprinklerDataUpdater(controller, timeout=5, min_timeout=1)
+
+    await updater.async_update_data()
+
+    assert updater.poll_latency.as_dict()["p99"] == 5
+    assert updater.poll_latency.timeouts == 1
+    assert updater.command_latency.as_dict()["samples"] == 0
@@ -0,0 +1,63 @@
+"""Tests for the options flow."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TIMEOUT
+from homeassistant.data_entry_flow import FlowResultType
+from opensprinkler import _async_update_listener, _get_layout
+from opensprinkler.config_flow import OptionsFlowHandler, _options_schema
+from opensprinkler.connection import KEEPALIVE_MARGIN
+from opensprinkler.const import CONF_MIN_TIMEOUT, DOMAIN
+
+
+def make_flow():
+    entry = SimpleNamespace(options={CONF_SCAN_INTERVAL: 5})
+    flow = OptionsFlowHandler()
+    flow.handler = "entry"
+    flow.flow_id = "flow"
+    flow.hass = SimpleNamespace(
+        config_entries=SimpleNamespace(async_get_entry=lambda entry_id: entry)
+    )
+    return flow
+
+
+@pytest.mark.asyncio
+async def test_minimum_timeout_above_maximum_is_rejected():
+    user_input = _options_schema({})({CONF_MIN_TIMEOUT: 12, CONF_TIMEOUT: 10})
+
+    result = await make_flow().async_step_init(user_input)
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_MIN_TIMEOUT: "min_timeout_above_max"}
+
+    user_input[CONF_MIN_TIMEOUT] = 10
+    result = await make_flow().async_step_init(user_input)
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+
+
+@pytest.mark.asyncio
+async def test_new_scan_interval_reloads_the_entry():
+    entry = SimpleNamespace(entry_id="entry", options={CONF_SCAN_INTERVAL: 5})
+    data = {
+        "layout": _get_layout(entry),
+        "connection": SimpleNamespace(keepalive_timeout=5 + KEEPALIVE_MARGIN),
+        "updater": SimpleNamespace(),
+    }
+    hass = SimpleNamespace(
+        data={DOMAIN: {"entry": data}},
+        config_entries=SimpleNamespace(async_schedule_reload=MagicMock()),
+    )
+
+    with patch("opensprinkler._async_apply_options") as apply_options, patch(
+        "opensprinkler.async_get_poll_scheduler"
+    ):
+        await _async_update_listener(hass, entry)
+        apply_options.assert_called_once()
+        hass.config_entries.async_schedule_reload.assert_not_called()
+
+        entry.options = {CONF_SCAN_INTERVAL: 30}
+        await _async_update_listener(hass, entry)
+    hass.config_entries.async_schedule_reload.assert_called_once_with("entry")
+    apply_options.assert_called_once()
@@ -0,0 +1,69 @@
+"""Tests for the polls of all controllers spread over the interval."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler.polling import OpenSprinklerPollScheduler
+
+
+class MockLoop:
+    def __init__(self, now):
+        self.now = now
+        self.timers = {}
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback, poll):
+        self.timers[poll.entry.entry_id] = when
+        return SimpleNamespace(cancel=lambda: self.timers.pop(poll.entry.entry_id))
+
+
+def add_entry(scheduler, entry_id, update=None):
+    entry = SimpleNamespace(entry_id=entry_id, pref_disable_polling=False)
+    coordinator = SimpleNamespace(update_method=update or AsyncMock())
+    return scheduler.async_add(entry, coordinator), coordinator
+
+
+def test_entries_poll_at_evenly_spread_phases():
+    loop = MockLoop(1001)
+    scheduler = OpenSprinklerPollScheduler(SimpleNamespace(loop=loop))
+    removers = [add_entry(scheduler, entry_id)[0] for entry_id in "abc"]
+    for entry_id in "abc":
+        scheduler.set_interval(entry_id, 6)
+
+    # At least half an interval from now, at 0, 2 and 4 seconds into it
+    assert loop.timers == {"a": 1008, "b": 1004, "c": 1006}
+
+    removers[1]()
+    assert loop.timers == {"a": 1008, "c": 1005}
+    assert scheduler.as_dict("c")["phase"] == 3
+
+
+@pytest.mark.asyncio
+async def test_polls_wait_for_a_free_slot():
+    scheduler = OpenSprinklerPollScheduler(
+        SimpleNamespace(loop=MockLoop(0)), max_concurrent=2
+    )
+    release = asyncio.Event()
+    started = []
+
+    async def update(entry_id):
+        started.append(entry_id)
+        await release.wait()
+
+    coordinators = [
+        add_entry(scheduler, entry_id, lambda entry_id=entry_id: update(entry_id))[1]
+        for entry_id in "abc"
+    ]
+    tasks = [
+        asyncio.create_task(coordinator.update_method()) for coordinator in coordinators
+    ]
+    await asyncio.sleep(0)
+    assert started == ["a", "b"]
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert started == ["a", "b", "c"]
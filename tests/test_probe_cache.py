@@ -0,0 +1,40 @@
+"""Tests for handing the config flow probe over to the first setup."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from opensprinkler import async_pop_probe, async_store_probe
+from opensprinkler.const import PROBE_TTL
+
+
+def make_hass():
+    return SimpleNamespace(data={})
+
+
+def test_probe_is_returned_once():
+    """A stored probe is handed to exactly one setup."""
+    hass = make_hass()
+    controller = object()
+
+    async_store_probe(hass, "aa_bb", controller)
+
+    assert async_pop_probe(hass, "aa_bb") is controller
+    assert async_pop_probe(hass, "aa_bb") is None
+
+
+def test_probe_for_other_entry_is_not_used():
+    """Probes are keyed by the entry unique id."""
+    hass = make_hass()
+    async_store_probe(hass, "aa_bb", object())
+
+    assert async_pop_probe(hass, "cc_dd") is None
+
+
+def test_expired_probe_is_discarded():
+    """A probe older than the TTL forces a fresh download."""
+    hass = make_hass()
+    with patch("opensprinkler.monotonic", return_value=1000.0):
+        async_store_probe(hass, "aa_bb", object())
+
+    with patch("opensprinkler.monotonic", return_value=1001.0 + PROBE_TTL):
+        assert async_pop_probe(hass, "aa_bb") is None
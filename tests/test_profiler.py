@@ -0,0 +1,72 @@
+"""Tests for profiling the update cycles of a controller."""
+
+import asyncio
+import pstats
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from opensprinkler.profiler import CoordinatorProfiler
+
+
+def make_hass():
+    loop = asyncio.get_running_loop()
+    return SimpleNamespace(
+        loop=loop,
+        data={},
+        async_add_executor_job=lambda target, *args: loop.run_in_executor(
+            None, target, *args
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_profiles_the_next_cycles_then_restores_the_update(tmp_path):
+    hass = make_hass()
+    update = AsyncMock(return_value="state")
+    coordinator = SimpleNamespace(update_method=update)
+    profiler = CoordinatorProfiler(hass, coordinator, 2, 5)
+    path = str(tmp_path / "profile.cprof")
+
+    task = asyncio.create_task(profiler.async_run(path))
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceValidationError):
+        await CoordinatorProfiler(hass, coordinator, 1, 5).async_run(path)
+
+    assert await coordinator.update_method() == "state"
+    await asyncio.sleep(0)
+    assert not task.done()
+    await coordinator.update_method()
+    await task
+
+    assert profiler.completed == 2
+    assert coordinator.update_method is update
+    assert hass.data == {}
+    assert pstats.Stats(path).total_calls
+
+
+@pytest.mark.asyncio
+async def test_profile_without_updates_ends_after_the_scan_intervals(tmp_path):
+    hass = make_hass()
+    update = AsyncMock()
+    coordinator = SimpleNamespace(update_method=update)
+    path = str(tmp_path / "profile.cprof")
+
+    with patch("opensprinkler.profiler.TIMEOUT_MARGIN", 0):
+        profiler = CoordinatorProfiler(hass, coordinator, 3, 0.01)
+    await profiler.async_run(path)
+    assert profiler.completed == 0
+    assert coordinator.update_method is update
+    assert hass.data == {}
+
+    # Stopped, e.g. by the entry unloading, after one cycle
+    profiler = CoordinatorProfiler(hass, coordinator, 3, 60)
+    task = asyncio.create_task(profiler.async_run(path))
+    await asyncio.sleep(0)
+    await coordinator.update_method()
+    await asyncio.sleep(0)
+    profiler.async_stop()
+    await task
+    assert profiler.completed == 1
+    assert pstats.Stats(path).total_calls
@@ -0,0 +1,116 @@
+"""Tests for exporting and importing program definitions."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from opensprinkler import OpenSprinklerControllerEntity
+
+PROGRAM_DATA = [
+    [3, 127, 0, [360, -1, -1, -1], [600, 0, 300], "Lawn", [0, 33, 415]],
+    [1, 0, 2, [1200, 2, 60, -1], [0, 900, 0], "Drip", [1, 100, 200]],
+]
+
+
+class ControllerEntity(OpenSprinklerControllerEntity):
+    def __init__(self):
+        self._controller = SimpleNamespace(
+            _state={"programs": {"pd": PROGRAM_DATA}}, request=AsyncMock()
+        )
+        self._coordinator = SimpleNamespace(
+            data=SimpleNamespace(stations=(None, None, None)),
+            async_request_refresh=AsyncMock(),
+        )
+
+
+@pytest.mark.asyncio
+async def test_importing_an_export_writes_nothing():
+    entity = ControllerEntity()
+    exported = await entity.export_programs()
+
+    assert exported["programs"][1] == {
+        "index": 1,
+        "name": "Drip",
+        "flag": 1,
+        "days0": 0,
+        "days1": 2,
+        "start_times": [1200, 2, 60, -1],
+        "durations": [0, 900, 0],
+        "date_range": [100, 200],
+    }
+    assert await entity.import_programs(exported["programs"]) == {"written": []}
+    entity._controller.request.assert_not_awaited()
+    entity._coordinator.async_request_refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_import_writes_changed_and_new_programs_once():
+    entity = ControllerEntity()
+
+    result = await entity.import_programs(
+        [
+            {"index": 1, "durations": [0, 600, 0]},
+            {"index": 0},
+            {"index": 2, "name": "New", "start_times": [420, -1, -1, -1]},
+        ]
+    )
+
+    assert result == {"written": [1, 2]}
+    assert [call.args for call in entity._controller.request.await_args_list] == [
+        (
+            "/cp",
+            {
+                "pid": 1,
+                "v": "[1,0,2,[1200,2,60,-1],[0,600,0]]",
+                "name": "Drip",
+                "from": 100,
+                "to": 200,
+            },
+        ),
+        (
+            "/cp",
+            {
+                "pid": -1,
+                "v": "[0,0,0,[420,-1,-1,-1],[0,0,0]]",
+                "name": "New",
+                "from": 33,
+                "to": 415,
+            },
+        ),
+    ]
+    entity._coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "programs",
+    [
+        # The same program twice, once by position
+        [{"index": 1, "name": "A"}, {"name": "B"}],
+        # Past the next program
+        [{"index": 3, "name": "New"}],
+        [{"index": 2}, {"index": 4}],
+    ],
+)
+async def test_import_rejects_duplicates_and_gaps(programs):
+    entity = ControllerEntity()
+
+    with pytest.raises(ServiceValidationError):
+        await entity.import_programs(programs)
+
+    entity._controller.request.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_new_programs_are_added_in_index_order():
+    entity = ControllerEntity()
+
+    result = await entity.import_programs(
+        [{"index": 3, "name": "Fourth"}, {"index": 2, "name": "Third"}]
+    )
+
+    assert result == {"written": [2, 3]}
+    assert [
+        call.args[1]["name"] for call in entity._controller.request.await_args_list
+    ] == ["Third", "Fourth"]
@@ -0,0 +1,259 @@
+"""Tests for moving a new password into a running controller."""
+
+import sys
+import time
+from hashlib import md5
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant import config_entries, loader
+from homeassistant.bootstrap import async_load_base_functionality
+from homeassistant.const import (
+    CONF_MAC,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_URL,
+    CONF_VERIFY_SSL,
+)
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import async_get_platforms
+from opensprinkler import async_swap_password
+from opensprinkler.const import DOMAIN
+from pyopensprinkler import Controller as OpenSprinkler
+
+
+def make_hass(entry, controller, coordinator):
+    return SimpleNamespace(
+        data={
+            DOMAIN: {
+                entry.entry_id: {
+                    "controller": controller,
+                    "coordinator": coordinator,
+                }
+            }
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_password_is_swapped_into_running_controller():
+    """The running controller adopts the password and polls again."""
+    entry = SimpleNamespace(entry_id="abc")
+    controller = OpenSprinkler("http://os", "old")
+    coordinator = SimpleNamespace(async_refresh=AsyncMock())
+    hass = make_hass(entry, controller, coordinator)
+
+    validated = OpenSprinkler("http://os", "new")
+
+    assert await async_swap_password(hass, entry, validated)
+    assert hass.data[DOMAIN][entry.entry_id]["controller"] is controller
+    assert controller._password == "new"
+    assert controller._md5password == validated._md5password
+    coordinator.async_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_password_is_not_swapped_when_entry_is_not_running():
+    """An entry that is not set up has to be reloaded instead."""
+    entry = SimpleNamespace(entry_id="abc")
+    hass = SimpleNamespace(data={})
+
+    assert not await async_swap_password(hass, entry, OpenSprinkler("http://os", "new"))
+
+
+def make_state(num_programs=2, num_stations=8):
+    """Return a /ja reply of a controller in UTC."""
+    now = int(time.time())
+    return {
+        "settings": {
+            "devt": now,
+            "nbrd": 1,
+            "en": 1,
+            "sn1": 0,
+            "sn2": 0,
+            "rd": 0,
+            "rdst": 0,
+            "sunrise": 360,
+            "sunset": 1200,
+            "eip": 0,
+            "lwc": now,
+            "lswc": now,
+            "lupt": now - 1000,
+            "lrbtc": 99,
+            "lrun": [0, 0, 0, 0],
+            "RSSI": -50,
+            "mac": "AA:BB:CC:DD:EE:FF",
+            "loc": "0,0",
+            "wterr": 0,
+            "curr": 0,
+            "flcrt": 0,
+            "flwrt": 30,
+            "pq": 0,
+            "pt": 0,
+            "nq": 0,
+            "mqtt": {"en": 0},
+            "ps": [[0, 0, 0] for _ in range(num_stations)],
+        },
+        "programs": {
+            "nprogs": num_programs,
+            "nboards": 1,
+            "mnp": 40,
+            "mnst": 4,
+            "pnsize": 32,
+            "pd": [
+                [
+                    65,
+                    127,
+                    0,
+                    [360 + pid, -1, -1, -1],
+                    [60] * num_stations,
+                    f"Program {pid}",
+                    [0, 33, 415],
+                ]
+                for pid in range(num_programs)
+            ],
+        },
+        "options": {
+            "fwv": 221,
+            "fwm": 4,
+            "tz": 48,
+            "hwv": 33,
+            "hwt": 172,
+            "dexp": 0,
+            "mexp": 8,
+            "mas": 0,
+            "mas2": 0,
+            "wl": 100,
+            "sn1t": 2,
+            "sn2t": 0,
+            "fpr0": 100,
+            "fpr1": 0,
+            "devid": 0,
+        },
+        "status": {"sn": [0] * num_stations, "nstations": num_stations},
+        "stations": {
+            "masop": [0],
+            "masop2": [0],
+            "ignore_rain": [0],
+            "ignore_sn1": [0],
+            "ignore_sn2": [0],
+            "stn_dis": [0],
+            "stn_seq": [255],
+            "stn_spe": [0],
+            "snames": [f"S{sid:02d}" for sid in range(num_stations)],
+            "maxlen": 32,
+        },
+    }
+
+
+@pytest.fixture
+async def hass(tmp_path):
+    """Return a running Home Assistant that finds this integration."""
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    hass = HomeAssistant(str(tmp_path))
+    hass.config.skip_pip = True
+    hass.data[loader.DATA_CUSTOM_COMPONENTS] = None
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    # The calendar platform only needs the views it registers to exist
+    hass.config.components.add("http")
+    hass.http = MagicMock()
+    hass.set_state(CoreState.running)
+    yield hass
+    await hass.async_stop(force=True)
+    sys.path.pop(0)
+
+
+@pytest.fixture
+async def controller_url():
+    """Serve /ja of a controller whose password can be changed by the test."""
+    server = SimpleNamespace(password="opendoor")
+
+    async def handle(request):
+        if request.query.get("pw") != md5(server.password.encode()).hexdigest():
+            return web.json_response({"result": 2})
+        if request.path == "/ja":
+            return web.json_response(make_state())
+        if request.path == "/jl":
+            return web.json_response([])
+        return web.json_response({"result": 1})
+
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", handle)
+    server.test_server = TestServer(app)
+    await server.test_server.start_server()
+    server.url = str(server.test_server.make_url("/"))
+    yield server
+    await server.test_server.close()
+
+
+def current_entities(hass, entry):
+    """Return the registry entries and entity objects of an entry."""
+    registry = er.async_get(hass)
+    entries = {
+        entity.entity_id: entity.id
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+    }
+    objects = {
+        entity_id: id(entity)
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity_id, entity in platform.entities.items()
+    }
+    return entries, objects
+
+
+async def test_reauth_keeps_the_entry_running(hass, controller_url):
+    """A new password neither reloads the entry nor recreates its entities."""
+    entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="OS",
+        data={
+            CONF_URL: controller_url.url,
+            CONF_PASSWORD: "opendoor",
+            CONF_NAME: "OS",
+            CONF_VERIFY_SSL: False,
+            CONF_MAC: "AA:BB:CC:DD:EE:FF",
+        },
+        source=config_entries.SOURCE_USER,
+        unique_id="aa_bb",
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    assert entry.state is config_entries.ConfigEntryState.LOADED
+    data = hass.data[DOMAIN][entry.entry_id]
+    before = current_entities(hass, entry)
+    assert before[0] and before[1]
+
+    controller_url.password = "changed"
+    await data["coordinator"].async_refresh()
+    await hass.async_block_till_done()
+    (flow,) = [
+        flow
+        for flow in hass.config_entries.flow.async_progress()
+        if flow["context"]["source"] == config_entries.SOURCE_REAUTH
+    ]
+
+    with patch.object(
+        hass.config_entries, "async_reload", wraps=hass.config_entries.async_reload
+    ) as reload:
+        result = await hass.config_entries.flow.async_configure(
+            flow["flow_id"], {CONF_PASSWORD: "changed"}
+        )
+        await hass.async_block_till_done()
+
+    assert result["reason"] == "reauth_successful"
+    reload.assert_not_called()
+    assert entry.data[CONF_PASSWORD] == "changed"
+    assert hass.data[DOMAIN][entry.entry_id] is data
+    assert data["coordinator"].last_update_success
+    assert current_entities(hass, entry) == before
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
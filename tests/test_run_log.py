@@ -0,0 +1,198 @@
+"""Tests for the incremental run log cache."""
+
+import asyncio
+import os
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from zoneinfo import ZoneInfo
+
+import pytest
+from opensprinkler import _async_setup_run_log
+from opensprinkler.runlog import (
+    SECONDS_PER_DAY,
+    OpenSprinklerRunLog,
+    controller_time_zone,
+    hourly_statistics,
+    hourly_usage,
+    local_to_utc,
+    utc_to_local,
+)
+from opensprinkler.sensor import StationRuntimeSensor
+
+DAY = 20000 * SECONDS_PER_DAY
+
+
+async def run_in_executor(func, *args):
+    return func(*args)
+
+
+def make_run_log(path, records):
+    hass = SimpleNamespace(async_add_executor_job=run_in_executor)
+    controller = SimpleNamespace(request=AsyncMock(return_value=records))
+    return OpenSprinklerRunLog(hass, controller, str(path))
+
+
+@pytest.mark.asyncio
+async def test_only_new_days_are_fetched(tmp_path):
+    """The next fetch starts where the last one ended and skips cached records."""
+    yesterday = [1, 0, 600, DAY - 100]
+    today = [[1, 0, 300, DAY + 100], [99, 2, 60, DAY + 200], [0, "rd", 1, DAY + 300]]
+    run_log = make_run_log(tmp_path, [yesterday, *today])
+    await run_log.async_load()
+
+    assert await run_log.async_fetch(DAY + 1000) == 4
+
+    run_log._controller.request.return_value = [*today, [2, 1, 120, DAY + 2000]]
+    assert await run_log.async_fetch(DAY + 3000) == 1
+
+    assert run_log._controller.request.await_args.args == (
+        "/jl",
+        {"start": DAY + 1000, "end": DAY + 3000},
+    )
+    assert run_log.runtime("station", 0, 20000, 20000) == 300
+    assert run_log.runtime("station", 0, 19999, 20000) == 900
+    assert run_log.runtime("program", 0, 20000, 20000) == 300
+    assert run_log.runtime("program", 1, 20000, 20000) == 120
+    assert sorted(os.listdir(tmp_path)) == [
+        "20241003.jsonl",
+        "20241004.jsonl",
+        "checkpoint",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cache_is_reloaded_without_fetching(tmp_path):
+    run_log = make_run_log(tmp_path, [[1, 0, 300, DAY + 100]])
+    await run_log.async_load()
+    await run_log.async_fetch(DAY + 1000)
+
+    restarted = make_run_log(tmp_path, [])
+    await restarted.async_load()
+
+    assert restarted.fetched_until == DAY + 1000
+    assert restarted.runtime("station", 0, 20000, 20000) == 300
+    restarted._controller.request.assert_not_awaited()
+
+
+def test_runs_are_totalled_per_utc_hour():
+    """Runs count in the hour they ended, in UTC rather than controller time."""
+    time_zone = timezone(timedelta(hours=2))
+    records = [
+        (1, 0, 600, DAY + 3599),
+        (1, 0, 300, DAY + 3600),
+        (1, 1, 120, DAY + 3700, 6.0),
+        (0, "rd", 1, DAY + 3800),
+        # Already imported
+        (1, 0, 60, DAY - 3600),
+    ]
+
+    hours = hourly_usage(records, time_zone, DAY - 2 * 3600, DAY)
+
+    assert hours == {
+        DAY - 2 * 3600: {("runtime", 0): 600},
+        DAY - 3600: {("runtime", 0): 300, ("runtime", 1): 120, ("water", 1): 12.0},
+    }
+
+
+def timestamp(*args):
+    """Return the timestamp of a time, or the local time of a wall time."""
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+def test_each_run_is_converted_with_its_own_daylight_saving_time():
+    """A year of runs at 12:10 New York time, imported in the summer."""
+    new_york = ZoneInfo("America/New_York")
+    now = timestamp(2024, 7, 20, 12)
+    time_zone = controller_time_zone(new_york, -4 * 3600, now)
+    assert time_zone is new_york
+    records = [
+        (1, 0, 600, timestamp(2024, 1, 15, 12, 10)),
+        (1, 0, 300, timestamp(2024, 7, 15, 12, 10)),
+    ]
+
+    hours = hourly_usage(records, time_zone, now - 365 * SECONDS_PER_DAY, now)
+
+    assert hours == {
+        timestamp(2024, 1, 15, 17): {("runtime", 0): 600},
+        timestamp(2024, 7, 15, 16): {("runtime", 0): 300},
+    }
+    assert utc_to_local(timestamp(2024, 1, 15, 17, 10), time_zone) == records[0][3]
+    assert local_to_utc(records[1][3], time_zone) == timestamp(2024, 7, 15, 16, 10)
+
+
+def test_controller_in_another_time_zone_keeps_its_offset():
+    # Home Assistant in New York, the controller at UTC+1
+    time_zone = controller_time_zone(ZoneInfo("America/New_York"), 3600, 0)
+
+    assert time_zone.utcoffset(None) == timedelta(hours=1)
+
+
+def test_hourly_statistics_continue_the_running_sums():
+    sums = {"runtime_0": 10.0}
+    hours = {
+        DAY + 3600: Counter({("runtime", 0): 120, ("water", 0): 5.0}),
+        DAY: Counter({("runtime", 0): 600}),
+    }
+
+    statistics = hourly_statistics(
+        hours, sums, lambda kind, station: f"{kind}_{station}"
+    )
+
+    assert statistics == {
+        ("runtime", 0): [(DAY, 10.0, 20.0), (DAY + 3600, 2.0, 22.0)],
+        ("water", 0): [(DAY + 3600, 5.0, 5.0)],
+    }
+    assert sums == {"runtime_0": 22.0, "water_0": 5.0}
+
+
+def test_runtime_today_is_the_controllers_local_day():
+    """At 22:00 UTC a controller at UTC+3 is already in the next day."""
+    run_log = SimpleNamespace(
+        runtime=lambda kind, index, first_day, last_day: {20000: 300, 20001: 60}[
+            last_day
+        ]
+    )
+    snapshot = SimpleNamespace(device_time=DAY - 2 * 3600, utc_offset=3 * 3600)
+    coordinator = SimpleNamespace(data=snapshot)
+    entity = StationRuntimeSensor(
+        SimpleNamespace(unique_id="aa_bb"),
+        "OpenSprinkler",
+        SimpleNamespace(index=0),
+        run_log,
+        coordinator,
+    )
+
+    assert entity._get_state() == 300
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_retried_on_the_next_poll(tmp_path):
+    tasks = []
+    hass = SimpleNamespace(
+        config=SimpleNamespace(components=set(), path=lambda *parts: str(tmp_path)),
+        async_add_executor_job=run_in_executor,
+    )
+    entry = SimpleNamespace(
+        entry_id="entry",
+        async_on_unload=lambda remove: None,
+        async_create_task=lambda hass, coro: tasks.append(coro),
+    )
+    controller = SimpleNamespace(request=AsyncMock(side_effect=asyncio.TimeoutError))
+    listeners = []
+    coordinator = SimpleNamespace(
+        data=SimpleNamespace(last_run_end_time=1, device_time=DAY, utc_offset=3600),
+        async_add_listener=lambda listener: listeners.append(listener),
+        async_update_listeners=Mock(),
+    )
+
+    await _async_setup_run_log(hass, entry, coordinator, controller)
+    await tasks.pop()
+    assert controller.request.await_args.args[1]["end"] == DAY + 3600
+    coordinator.async_update_listeners.assert_not_called()
+
+    # The same last run is fetched again
+    listeners[0]()
+    assert len(tasks) == 1
+    await tasks.pop()
@@ -0,0 +1,214 @@
+"""Tests for the program schedule expansion and its cache."""
+
+from dataclasses import replace
+from datetime import date
+from types import SimpleNamespace
+
+from opensprinkler.schedule import (
+    EPOCH,
+    SECONDS_PER_DAY,
+    NextRunScheduler,
+    ScheduleCache,
+    day_matches,
+    expand_program,
+)
+from opensprinkler.snapshot import ProgramSnapshot, StationSnapshot
+
+# Monday 7 October 2024
+MONDAY = (date(2024, 10, 7) - EPOCH).days
+
+# The controller runs 10 hours ahead of UTC, and schedules in local time
+UTC_OFFSET = 10 * 3600
+
+
+def make_program(index=0, **changes):
+    program = ProgramSnapshot(
+        index=index,
+        name=f"Program {index + 1}",
+        enabled=True,
+        use_weather_adjustments=False,
+        is_running=False,
+        program_schedule_type=0,
+        start_time_type=1,
+        odd_even_restriction=0,
+        starting_in_days=0,
+        interval_days=0,
+        monthly_day=0,
+        single_run_day=0,
+        program_start_repeat_count=0,
+        program_start_repeat_interval=0,
+        program_start_times=(360, 1 << 13 | 1 << 12 | 30, -1, -1),
+        program_start_time_offsets=(360, -30, 0, 0),
+        program_start_time_offset_types=("midnight", "sunset", "disabled", "disabled"),
+        days0=0b0010101,
+        weekdays=(True, False, True, False, True, False, False),
+        station_durations=(600, 0, 300),
+        date_range_enabled=0,
+        date_range_from=(1, 1),
+        date_range_to=(12, 31),
+    )
+    return replace(program, **changes)
+
+
+def make_station(index, enabled=True):
+    return StationSnapshot(
+        index, f"S{index + 1}", enabled, False, False, "idle", 0, 0, 0, 0
+    )
+
+
+def make_snapshot(
+    programs,
+    local_time=MONDAY * SECONDS_PER_DAY + 3600,
+    utc_offset=UTC_OFFSET,
+    **changes,
+):
+    return SimpleNamespace(
+        **{
+            "enabled": True,
+            "device_time": local_time - utc_offset,
+            "utc_offset": utc_offset,
+            "sunrise": 420,
+            "sunset": 1140,
+            "water_level": 50,
+            "stations": tuple(make_station(index) for index in range(3)),
+            "programs": tuple(programs),
+            **changes,
+        }
+    )
+
+
+def matching_days(program, days=14):
+    return [
+        day - MONDAY
+        for day in range(MONDAY, MONDAY + days)
+        if day_matches(program, day)
+    ]
+
+
+def test_days_follow_the_firmware_rules():
+    assert matching_days(make_program()) == [0, 2, 4, 7, 9, 11]
+    # Odd days only: Monday 14, Wednesday 16 and Friday 18 October are even
+    assert matching_days(make_program(odd_even_restriction=1)) == [0, 2, 4]
+    assert matching_days(make_program(odd_even_restriction=2)) == [7, 9, 11]
+    assert matching_days(
+        make_program(
+            program_schedule_type=3, interval_days=3, starting_in_days=MONDAY % 3
+        )
+    ) == [0, 3, 6, 9, 12]
+    # The last day of the month, within a date range around the new year
+    assert matching_days(
+        make_program(
+            program_schedule_type=2,
+            date_range_enabled=1,
+            date_range_from=(10, 10),
+            date_range_to=(1, 31),
+        ),
+        days=120,
+    ) == [24, 54, 85, 116]
+    assert matching_days(
+        make_program(program_schedule_type=1, single_run_day=MONDAY + 5)
+    ) == [5]
+
+
+def test_runs_use_start_times_repeats_and_adjusted_durations():
+    stations = frozenset({0, 2})
+    runs = expand_program(make_program(), MONDAY, MONDAY, stations, 420, 1140, 50)
+    day = MONDAY * SECONDS_PER_DAY
+    assert [(run.start - day, run.end - run.start) for run in runs] == [
+        (360 * 60, 900),
+        ((1140 - 30) * 60, 900),
+    ]
+
+    program = make_program(
+        use_weather_adjustments=True,
+        start_time_type=0,
+        program_start_repeat_count=2,
+        program_start_repeat_interval=600,
+        program_start_time_offset_types=("sunrise", None, None, None),
+        program_start_time_offsets=(15, 2, 600, 0),
+    )
+    runs = expand_program(program, MONDAY, MONDAY, frozenset({0}), 420, 1140, 50)
+    # The third repeat would start the next day
+    assert [(run.start - day) // 60 for run in runs] == [435, 1035]
+    assert runs[0].durations == ((0, 300),)
+
+
+def test_cache_expands_only_changed_programs():
+    cache = ScheduleCache()
+    programs = [make_program(0), make_program(1)]
+    runs = cache.runs(make_snapshot(programs))
+    assert cache.expansions == 2
+    assert len(runs) == 2 * 7 * 2
+
+    # Running state and water level (without weather adjustments) are not
+    # part of the schedule
+    programs[0] = replace(programs[0], is_running=True)
+    assert cache.runs(make_snapshot(programs, water_level=80)) == runs
+    assert cache.expansions == 2
+
+    programs[1] = replace(programs[1], enabled=False)
+    assert len(cache.runs(make_snapshot(programs))) == 7 * 2
+    assert cache.expansions == 3
+
+    # Program 1 starts at sunset
+    cache.runs(make_snapshot(programs, sunset=1150))
+    assert cache.expansions == 5
+
+    cache.runs(make_snapshot(programs, local_time=(MONDAY + 1) * SECONDS_PER_DAY))
+    assert cache.expansions == 7
+
+    # 01:00 on Tuesday is still Monday in UTC
+    cache.runs(
+        make_snapshot(programs, local_time=(MONDAY + 1) * SECONDS_PER_DAY + 3600)
+    )
+    assert cache.first_day == MONDAY
+    assert cache.expansions == 7
+    assert cache.runs(make_snapshot(programs, enabled=False)) == []
+
+
+def test_scheduler_advances_lazily_and_recomputes_changed_programs():
+    schedule = ScheduleCache()
+    scheduler = NextRunScheduler(schedule)
+    programs = [
+        make_program(0),
+        make_program(1, program_start_time_offsets=(420, 0, 0, 0)),
+    ]
+    day = MONDAY * SECONDS_PER_DAY
+
+    snapshot = make_snapshot(programs)
+    assert scheduler.next_run(snapshot, "program", 0) == (day + 21600, day + 22500)
+    # Station 3 runs after station 1
+    assert scheduler.next_run(snapshot, "station", 2) == (day + 22200, day + 22500)
+    assert scheduler.next_run(snapshot, "station", 1) is None
+    assert scheduler.recomputations == 1
+
+    # Nothing ends before the next poll
+    scheduler.next_run(make_snapshot(programs, local_time=day + 7200), "program", 0)
+    assert scheduler.recomputations == 1
+
+    # The run of program 1 is still going, the one of program 0 has ended
+    snapshot = make_snapshot(programs, local_time=day + 25300)
+    assert scheduler.next_run(snapshot, "program", 0) == (day + 66600, day + 67500)
+    assert scheduler.next_run(snapshot, "program", 1) == (day + 25200, day + 26100)
+    assert scheduler.recomputations == 2
+
+    programs[1] = replace(programs[1], enabled=False)
+    snapshot = make_snapshot(programs, local_time=day + 25300)
+    assert scheduler.next_run(snapshot, "program", 1) is None
+    assert scheduler.next_run(snapshot, "station", 0) == (day + 66600, day + 67200)
+    assert schedule.expansions == 3
+
+    # Disabling the controller leaves no runs to look for
+    snapshot = make_snapshot(programs, local_time=day + 25300, enabled=False)
+    assert scheduler.next_run(snapshot, "program", 0) is None
+
+
+def test_next_run_is_found_in_controller_local_time():
+    """At 05:00 local, 10:00 UTC, a controller at UTC-5 still has its 06:00 run."""
+    scheduler = NextRunScheduler(ScheduleCache())
+    day = MONDAY * SECONDS_PER_DAY
+    snapshot = make_snapshot(
+        [make_program(0)], local_time=day + 5 * 3600, utc_offset=-5 * 3600
+    )
+
+    assert scheduler.next_run(snapshot, "program", 0) == (day + 21600, day + 22500)
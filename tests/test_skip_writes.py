@@ -0,0 +1,72 @@
+"""Tests for skipping writes that would not change the controller."""
+
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler.const import DOMAIN
+from opensprinkler.number import ProgramDurationNumber
+from opensprinkler.switch import ProgramEnabledSwitch
+
+
+def make_entity(entity_class, *args):
+    program = SimpleNamespace(
+        index=0,
+        enable=AsyncMock(),
+        disable=AsyncMock(),
+        set_station_duration=AsyncMock(),
+    )
+    snapshot = SimpleNamespace(
+        programs=[SimpleNamespace(name="Lawn", enabled=True, station_durations=(90,))]
+    )
+    coordinator = SimpleNamespace(data=snapshot, async_request_refresh=AsyncMock())
+    entry = SimpleNamespace(entry_id="entry", unique_id="aa_bb", options={})
+    entity = entity_class(entry, "OpenSprinkler", program, *args, coordinator)
+    entity.hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                "entry": {
+                    "command_queue": SimpleNamespace(pending=0),
+                    "skipped_writes": Counter(),
+                }
+            }
+        }
+    )
+    return entity
+
+
+@pytest.mark.asyncio
+async def test_switch_skips_the_state_it_already_has():
+    entity = make_entity(ProgramEnabledSwitch)
+
+    await entity.async_turn_on()
+    entity._program.enable.assert_not_awaited()
+    entity._coordinator.async_request_refresh.assert_not_awaited()
+
+    await entity.async_turn_off()
+    entity._program.disable.assert_awaited_once()
+    entity._coordinator.async_request_refresh.assert_awaited_once()
+    assert entity.hass.data[DOMAIN]["entry"]["skipped_writes"] == {"switch": 1}
+
+
+@pytest.mark.asyncio
+async def test_number_compares_the_value_sent_to_the_controller():
+    """90 seconds show as 2 minutes, but setting 2 minutes changes them."""
+    entity = make_entity(ProgramDurationNumber, SimpleNamespace(index=0, name="Front"))
+
+    await entity.async_set_native_value(1.5)
+    entity._program.set_station_duration.assert_not_awaited()
+
+    await entity.async_set_native_value(2)
+    entity._program.set_station_duration.assert_awaited_once_with(0, 120)
+
+
+@pytest.mark.asyncio
+async def test_writes_are_not_skipped_while_commands_are_queued():
+    """A queued disable makes an enable a change again."""
+    entity = make_entity(ProgramEnabledSwitch)
+    entity.hass.data[DOMAIN]["entry"]["command_queue"].pending = 1
+
+    await entity.async_turn_on()
+    entity._program.enable.assert_awaited_once()
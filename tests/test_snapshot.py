@@ -0,0 +1,157 @@
+"""Tests for the per poll controller snapshot."""
+
+import dataclasses
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler import OpenSprinklerDataUpdater
+from opensprinkler.snapshot import ControllerSnapshot
+from pyopensprinkler import Controller as OpenSprinkler
+
+
+def make_state(num_programs=2, num_stations=8):
+    boards = (num_stations + 7) // 8
+    return {
+        "settings": {
+            "devt": 1700000000,
+            "nbrd": boards,
+            "en": 1,
+            "sn1": 0,
+            "sn2": 0,
+            "rd": 0,
+            "rdst": 0,
+            "sunrise": 360,
+            "sunset": 1200,
+            "lwc": 1699990000,
+            "lswc": 1699990000,
+            "lupt": 1699000000,
+            "lrbtc": 99,
+            "lrun": [0, 0, 0, 0],
+            "wterr": 0,
+            "curr": 120,
+            "flcrt": 0,
+            "flwrt": 30,
+            "pt": 0,
+            "ps": [[0, 0, 0] for _ in range(num_stations)],
+        },
+        "programs": {
+            "pd": [
+                [
+                    1 | (1 << 6),
+                    0b0010101,
+                    0,
+                    [360 + index, -1, -1, -1],
+                    [60 * (station + 1) for station in range(num_stations)],
+                    f"Program {index}",
+                    [0, 33, 415],
+                ]
+                for index in range(num_programs)
+            ],
+        },
+        "options": {
+            "fwv": 221,
+            "tz": 48,
+            "fwm": 4,
+            "hwv": 33,
+            "hwt": 172,
+            "mas": 0,
+            "mas2": 0,
+            "wl": 100,
+            "sn1t": 2,
+            "sn2t": 0,
+        },
+        "status": {"sn": [0] * num_stations},
+        "stations": {
+            "stn_dis": [0] * boards,
+            "snames": [f"S{station:02d}" for station in range(num_stations)],
+        },
+    }
+
+
+async def make_controller(state):
+    controller = OpenSprinkler("http://opensprinkler", "opendoor")
+    controller._state = state
+    controller._refresh_state = AsyncMock()
+    await controller.refresh()
+    return controller
+
+
+@pytest.mark.asyncio
+async def test_snapshot_matches_pyopensprinkler():
+    """The snapshot holds the same values as the pyopensprinkler properties."""
+    state = make_state()
+    state["status"]["sn"][2] = 1
+    state["settings"]["ps"][2] = [2, 300, 1700000000]
+    state["stations"]["stn_dis"][0] = 0b00001000
+    controller = await make_controller(state)
+
+    snapshot = ControllerSnapshot.from_controller(controller)
+
+    assert snapshot.water_level == controller.water_level
+    assert snapshot.current_draw == 120
+    assert len(snapshot.stations) == 8
+    for station in snapshot.stations:
+        live = controller.stations[station.index]
+        assert station.name == live.name
+        assert station.status == live.status
+        assert station.enabled == live.enabled
+        assert station.end_time == live.end_time
+    for program in snapshot.programs:
+        live = controller.programs[program.index]
+        assert program.is_running == live.is_running
+        assert program.station_durations == tuple(live.station_durations)
+        assert program.program_start_time_offset_types == tuple(
+            live.program_start_time_offset_types
+        )
+        for weekday in ("Monday", "Tuesday", "Sunday"):
+            assert program.weekday_enabled(weekday) == live.get_weekday_enabled(weekday)
+    assert [program.is_running for program in snapshot.programs] == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_immutable():
+    """Entities cannot change the shared snapshot."""
+    snapshot = ControllerSnapshot.from_controller(await make_controller(make_state()))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.programs[0].name = "Changed"
+    assert not hasattr(snapshot.stations[0], "__dict__")
+
+
+@pytest.mark.asyncio
+async def test_state_is_parsed_once_per_poll():
+    """The snapshot is only rebuilt when a new state was downloaded."""
+    controller = await make_controller(make_state())
+    updater = OpenSprinklerDataUpdater(controller)
+
+    snapshot = updater.get_snapshot()
+    assert updater.get_snapshot() is snapshot
+
+    controller._state = make_state(num_programs=3)
+    await controller.refresh()
+
+    assert len(updater.get_snapshot().programs) == 3
+
+
+@pytest.mark.asyncio
+async def test_running_index():
+    """The running index maps programs to the stations they run or queued."""
+    state = make_state(num_programs=3, num_stations=16)
+    for station, program_id in ((1, 2), (9, 2), (4, 3), (6, 99)):
+        state["status"]["sn"][station] = 1
+        state["settings"]["ps"][station] = [program_id, 60, 1700000000]
+    # Queued, not running yet
+    state["settings"]["ps"][12] = [1, 60, 0]
+
+    snapshot = ControllerSnapshot.from_controller(await make_controller(state))
+
+    assert snapshot.running_stations == 1 << 1 | 1 << 4 | 1 << 6 | 1 << 9
+    assert snapshot.is_station_running(9)
+    assert not snapshot.is_station_running(12)
+    # A program is active while a station runs or waits for it
+    assert snapshot.program_stations == ({12}, {1, 9}, {4})
+    assert [program.is_running for program in snapshot.programs] == [
+        True,
+        True,
+        True,
+    ]
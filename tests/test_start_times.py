@@ -0,0 +1,114 @@
+"""Tests for setting program start times in one request."""
+
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from opensprinkler.const import DOMAIN
+from opensprinkler.text import ProgramStartTimesText
+from pyopensprinkler.program import Program
+
+# 06:00, 30 minutes before sunset, disabled, disabled
+START_TIMES = [360, 1 << 13 | 1 << 12 | 30, -1, -1]
+
+
+def make_entity(start_time_type=1, start_times=START_TIMES, live_start_times=None):
+    """Return the entity of a program with start times as of the last poll.
+
+    The live pyopensprinkler state may have moved on since, e.g. while a
+    refresh is applied.
+    """
+    program = Program.__new__(Program)
+    program._index = 0
+    program._controller = SimpleNamespace(
+        _state={
+            "programs": {
+                "pd": [[1, 127, 0, list(live_start_times or start_times), [0]]]
+            }
+        }
+    )
+    program.set_program_start_times = AsyncMock()
+
+    snapshot = SimpleNamespace(
+        programs=[
+            SimpleNamespace(
+                name="Lawn",
+                start_time_type=start_time_type,
+                program_start_times=tuple(start_times),
+                program_start_time_offsets=(360, -30, 0, 0),
+                program_start_time_offset_types=(
+                    "midnight",
+                    "sunset",
+                    "disabled",
+                    "disabled",
+                ),
+            )
+        ]
+    )
+    coordinator = SimpleNamespace(data=snapshot, async_request_refresh=AsyncMock())
+    entry = SimpleNamespace(entry_id="entry", unique_id="aa_bb", options={})
+    entity = ProgramStartTimesText(entry, "OpenSprinkler", program, coordinator)
+    entity.hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                "entry": {
+                    "command_queue": SimpleNamespace(pending=0),
+                    "skipped_writes": Counter(),
+                }
+            }
+        }
+    )
+    return entity
+
+
+def test_start_times_are_shown_as_text():
+    assert make_entity().native_value == "06:00 sunset-30 off off"
+    assert make_entity(start_time_type=0).native_value == "06:00"
+
+
+@pytest.mark.asyncio
+async def test_start_times_are_written_in_one_request():
+    entity = make_entity(start_times=[-1, -1, -1, -1])
+
+    await entity.async_set_value("06:00 sunset-30")
+
+    entity._program.set_program_start_times.assert_awaited_once_with(START_TIMES)
+    entity._coordinator.async_request_refresh.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_repeating_program_keeps_repeat_settings():
+    """Start1 and start2 hold the repeat count and interval of the program."""
+    entity = make_entity(
+        start_time_type=0, start_times=[360, 3, 120, -1], live_start_times=[-1] * 4
+    )
+
+    await entity.async_set_value("sunrise+15")
+
+    entity._program.set_program_start_times.assert_awaited_once_with(
+        [1 << 14 | 15, 3, 120, -1]
+    )
+
+    with pytest.raises(RuntimeError):
+        await entity.async_set_value("06:00 07:00")
+
+
+@pytest.mark.asyncio
+async def test_invalid_start_time_is_rejected():
+    entity = make_entity()
+
+    with pytest.raises(ValueError):
+        await entity.async_set_value("25:00")
+
+    entity._program.set_program_start_times.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_start_times_of_the_last_poll_are_not_written_again():
+    entity = make_entity(live_start_times=[-1, -1, -1, -1])
+
+    await entity.async_set_value("06:00 sunset-30")
+
+    entity._program.set_program_start_times.assert_not_awaited()
+    assert entity.hass.data[DOMAIN]["entry"]["skipped_writes"] == {"text": 1}
@@ -0,0 +1,59 @@
+"""Tests for the import of the run log into long-term statistics."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from opensprinkler.runlog import SECONDS_PER_DAY, SECONDS_PER_HOUR
+
+# The statistics are only imported with the recorder
+pytest.importorskip("homeassistant.components.recorder")
+
+from opensprinkler.stats import OpenSprinklerStatistics  # noqa: E402
+
+DAY = 20000 * SECONDS_PER_DAY
+HOUR = SECONDS_PER_HOUR
+
+
+@pytest.mark.asyncio
+async def test_complete_utc_hours_are_imported_for_a_controller_behind_utc():
+    """At 10:30 UTC a controller at UTC-5 has logged runs up to 05:30 local."""
+    utc_offset = -5 * HOUR
+    run_log = SimpleNamespace(
+        fetched_until=DAY + 10 * HOUR + 1800 + utc_offset,
+        cached_since=DAY - SECONDS_PER_DAY,
+        records=lambda since, until: [
+            record
+            for record in (
+                (1, 0, 600, DAY + 4 * HOUR + 600),
+                (1, 1, 300, DAY + 5 * HOUR + 600),
+            )
+            if since <= record[3] < until
+        ],
+    )
+    coordinator = SimpleNamespace(
+        data=SimpleNamespace(
+            utc_offset=utc_offset, device_time=DAY + 10 * HOUR + 1800, stations=()
+        )
+    )
+    entry = SimpleNamespace(
+        entry_id="entry", unique_id="aa_bb", data={"name": "OpenSprinkler"}
+    )
+    statistics = OpenSprinklerStatistics(
+        SimpleNamespace(config=SimpleNamespace(time_zone="Etc/GMT+5")),
+        entry,
+        None,
+        coordinator,
+        run_log,
+    )
+    statistics._store = SimpleNamespace(async_save=AsyncMock())
+    statistics.imported_until = DAY + 8 * HOUR
+
+    with patch("opensprinkler.stats.async_add_external_statistics") as add:
+        assert await statistics.async_import() == 1
+
+    # The run that ended at 09:10 UTC, the one at 10:10 UTC waits for its hour
+    metadata, batch = add.call_args.args[1:]
+    assert metadata["statistic_id"] == "opensprinkler:aa_bb_station_0_runtime"
+    assert [row["start"].timestamp() for row in batch] == [DAY + 9 * HOUR]
+    assert statistics.imported_until == DAY + 10 * HOUR
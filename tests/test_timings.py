@@ -0,0 +1,25 @@
+"""Tests for the setup phase timings."""
+
+from unittest.mock import patch
+
+from opensprinkler.timings import SetupTimings
+
+
+def test_phases_last_from_the_end_of_the_previous_one():
+    with patch("opensprinkler.timings.monotonic", side_effect=[10.0, 10.5, 12.0]):
+        timings = SetupTimings()
+        timings.end_phase("controller")
+        timings.end_phase("first_refresh")
+    timings.add_platform("switch", 39, 0.25, 0.5)
+
+    assert timings.as_dict() == {
+        "total": 2.0,
+        "phases": {"controller": 0.5, "first_refresh": 1.5},
+        "platforms": {
+            "switch": {"entities": 39, "construction": 0.25, "registration": 0.5}
+        },
+    }
+    assert timings.summary() == (
+        "2.000 s (controller 0.500 s, first_refresh 1.500 s; "
+        "switch 39 entities 0.250 + 0.500 s)"
+    )
@@ -0,0 +1,174 @@
+"""Tests for program and station topology tracking."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from opensprinkler import (
+    OpenSprinklerProgramEntity,
+    OpenSprinklerStationEntity,
+    _get_topology,
+    async_setup_platform_entities,
+)
+from opensprinkler.const import DOMAIN, SIGNAL_TOPOLOGY_UPDATED
+
+
+class MockController:
+    """Mock controller exposing programs and stations like pyopensprinkler."""
+
+    def __init__(self, num_programs, num_stations):
+        self._state = {
+            "programs": {"pd": [[] for _ in range(num_programs)]},
+            "stations": {"snames": [f"S{i}" for i in range(num_stations)]},
+        }
+        self.programs = {i: object() for i in range(num_programs)}
+        self.stations = {i: object() for i in range(num_stations)}
+
+
+def test_topology_lists_program_and_station_indexes():
+    controller = MockController(2, 3)
+
+    assert _get_topology(controller) == (frozenset({0, 1}), frozenset({0, 1, 2}))
+
+
+def test_removed_stations_are_pruned():
+    """Stations beyond the current station count are dropped."""
+    controller = MockController(1, 16)
+    controller._state["stations"]["snames"] = controller._state["stations"]["snames"][
+        :8
+    ]
+
+    programs, stations = _get_topology(controller)
+
+    assert stations == frozenset(range(8))
+    assert set(controller.stations) == set(range(8))
+
+
+def test_deleted_program_changes_topology():
+    controller = MockController(3, 8)
+    before = _get_topology(controller)
+
+    del controller.programs[2]
+    del controller._state["programs"]["pd"][2]
+
+    assert _get_topology(controller) != before
+
+
+def test_entities_of_removed_program_or_station_no_longer_exist():
+    """Entities skip writing state once their program or station is gone."""
+    snapshot = SimpleNamespace(programs=[object(), object()], stations=[object()] * 2)
+    coordinator = SimpleNamespace(data=snapshot)
+
+    program_entity = OpenSprinklerProgramEntity()
+    program_entity._program = SimpleNamespace(index=1)
+    program_entity._coordinator = coordinator
+    station_entity = OpenSprinklerStationEntity()
+    station_entity._station = SimpleNamespace(index=1)
+    station_entity._coordinator = coordinator
+
+    assert program_entity._exists()
+    assert station_entity._exists()
+
+    coordinator.data = SimpleNamespace(programs=[object()], stations=[object()])
+
+    assert not program_entity._exists()
+    assert not station_entity._exists()
+
+
+@pytest.mark.asyncio
+async def test_topology_change_while_entities_are_added_is_reconciled():
+    entry = SimpleNamespace(entry_id="entry", async_on_unload=lambda remove: None)
+    timings = SimpleNamespace(add_platform=Mock())
+    hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                "entry": {
+                    "setup_timings": timings,
+                    "controller": MockController(2, 1),
+                }
+            }
+        },
+        async_run_hass_job=lambda job, *args: job.target(*args),
+    )
+    unique_ids = ["program_0"]
+
+    def create_entities(hass, entry):
+        return [SimpleNamespace(unique_id=unique_id) for unique_id in unique_ids]
+
+    async def add_entities(entities):
+        # A program is added on the controller meanwhile
+        unique_ids.append("program_1")
+        async_dispatcher_send(hass, SIGNAL_TOPOLOGY_UPDATED.format("entry"))
+
+    platform = SimpleNamespace(domain="switch", async_add_entities=add_entities)
+    async_add_entities = Mock()
+    with patch(
+        "opensprinkler.async_get_current_platform", return_value=platform
+    ), patch("opensprinkler.er"):
+        await async_setup_platform_entities(
+            hass, entry, async_add_entities, create_entities
+        )
+
+    added = async_add_entities.call_args.args[0]
+    assert [entity.unique_id for entity in added] == ["program_1"]
+    assert timings.add_platform.call_args.args[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_only_entities_of_deleted_programs_are_removed_from_the_registry():
+    """Entities left out by an option or controller setting keep their entry."""
+    entry = SimpleNamespace(entry_id="entry", async_on_unload=lambda remove: None)
+    hass = SimpleNamespace(
+        data={
+            DOMAIN: {
+                "entry": {
+                    "setup_timings": SimpleNamespace(add_platform=Mock()),
+                    # Program 2 was deleted while Home Assistant was not running
+                    "controller": MockController(2, 4),
+                }
+            }
+        }
+    )
+
+    def create_entities(hass, entry):
+        return [
+            SimpleNamespace(
+                unique_id=f"aa_switch_program_enabled_{index}",
+                _program=SimpleNamespace(index=index),
+            )
+            for index in range(2)
+        ] + [
+            SimpleNamespace(
+                unique_id=f"aa_number_station_duration_{index}_3",
+                _program=SimpleNamespace(index=index),
+                _station=SimpleNamespace(index=3),
+            )
+            for index in range(2)
+        ]
+
+    registry = Mock()
+    registry.async_get_entity_id = lambda domain, platform, unique_id: unique_id
+    registered = [
+        "aa_switch_program_enabled_2",
+        "aa_number_station_duration_2_3",
+        "aa_number_station_duration_0_3",
+        # Weekday switches of a program in compact mode
+        "aa_switch_monday_enabled_1",
+        "aa_switch_controller_enabled",
+    ]
+    platform = SimpleNamespace(domain="switch", async_add_entities=AsyncMock())
+    with patch(
+        "opensprinkler.async_get_current_platform", return_value=platform
+    ), patch("opensprinkler.er") as er:
+        er.async_get.return_value = registry
+        er.async_entries_for_config_entry.return_value = [
+            SimpleNamespace(domain="switch", unique_id=unique_id)
+            for unique_id in registered
+        ]
+        await async_setup_platform_entities(hass, entry, Mock(), create_entities)
+
+    assert [call.args[0] for call in registry.async_remove.call_args_list] == [
+        "aa_switch_program_enabled_2",
+        "aa_number_station_duration_2_3",
+    ]
@@ -0,0 +1,42 @@
+"""Tests for the flow totalizer."""
+
+from types import SimpleNamespace
+
+from opensprinkler.totalizer import MAX_SAMPLE_GAP, FlowTotalizer
+
+
+def make_totalizer():
+    totalizer = FlowTotalizer(SimpleNamespace(), "entry")
+    totalizer._store = SimpleNamespace(async_delay_save=lambda data, delay: None)
+    return totalizer
+
+
+def make_snapshot(flow_rate, running, master=()):
+    stations = [SimpleNamespace(index=i, is_master=i in master) for i in range(4)]
+    return SimpleNamespace(
+        flow_rate=flow_rate,
+        stations=stations,
+        is_station_running=lambda index: index in running,
+    )
+
+
+def test_flow_is_integrated_over_poll_times():
+    """The trapezoid of 10 and 20 L/min over 30 s is 7.5 L."""
+    totalizer = make_totalizer()
+
+    totalizer.add_sample(make_snapshot(10.0, {1, 2}, master={0}), 100.0)
+    totalizer.add_sample(make_snapshot(20.0, {1}), 130.0)
+
+    assert totalizer.total == 7.5
+    assert totalizer.stations == {1: 3.75, 2: 3.75}
+
+
+def test_long_gaps_are_not_integrated():
+    totalizer = make_totalizer()
+
+    totalizer.add_sample(make_snapshot(10.0, {1}), 100.0)
+    totalizer.add_sample(make_snapshot(10.0, {1}), 100.0 + MAX_SAMPLE_GAP + 1)
+    totalizer.add_sample(make_snapshot(10.0, {1}), 100.0 + MAX_SAMPLE_GAP + 7)
+
+    assert totalizer.total == 1.0
+    assert totalizer.stations == {1: 1.0}
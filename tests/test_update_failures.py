@@ -110,3 +110,19 @@ async def test_invalid_url_is_never_suppressed():
 
     with pytest.raises(UpdateFailed):
         await updater.async_update_data()
+
+
+@pytest.mark.asyncio
+async def test_failure_threshold_can_be_changed_at_runtime():
+    """The options listener can raise the tolerance of a running updater."""
+    state = {"status": "cached"}
+    controller = MockController(state)
+    controller.refresh.side_effect = asyncio.TimeoutError
+    updater = OpenSprinklerDataUpdater(controller)
+    updater.max_consecutive_failures = MAX_CONSECUTIVE_UPDATE_FAILURES + 2
+
+    for _ in range(MAX_CONSECUTIVE_UPDATE_FAILURES + 1):
+        assert await updater.async_update_data() is state
+
+    with pytest.raises(asyncio.TimeoutError):
+        await updater.async_update_data()
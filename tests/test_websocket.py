@@ -0,0 +1,110 @@
+"""Tests for the compact controller state WebSocket subscription."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from opensprinkler.const import DOMAIN, SIGNAL_ENTRY_UNLOADED
+from opensprinkler.websocket_api import compact_delta, compact_state, ws_subscribe
+
+
+def make_snapshot(running=(), remaining=0, programs_running=False, stations=72):
+    return SimpleNamespace(
+        device_time=1000,
+        enabled=1,
+        running_stations=sum(1 << index for index in running),
+        stations=tuple(
+            SimpleNamespace(
+                name=f"S{index:02d}",
+                is_running=index in running,
+                seconds_remaining=remaining if index in running else 0,
+            )
+            for index in range(stations)
+        ),
+        programs=(
+            SimpleNamespace(name="Lawn", enabled=1, is_running=programs_running),
+        ),
+        flow_rate=None,
+        water_level=100,
+        pause_time_remaining=None,
+        rain_delay_active=False,
+        rain_delay_stop_time=0,
+    )
+
+
+def test_delta_holds_only_changed_items():
+    idle = compact_state(make_snapshot())
+    running = compact_state(make_snapshot(running=(70,), remaining=300))
+
+    # Station 70 does not fit in a JavaScript number
+    assert running["running"] == "4" + "0" * 17
+    assert compact_delta(idle, running) == {
+        "running": "4" + "0" * 17,
+        "remaining": [[70, 300]],
+    }
+    assert compact_delta(running, running) == {}
+    assert compact_delta(idle, compact_state(make_snapshot(stations=8))) is None
+
+
+def test_subscription_sends_state_then_deltas():
+    coordinator = SimpleNamespace(data=make_snapshot(), listeners=[])
+    coordinator.async_add_listener = lambda listener: coordinator.listeners.append(
+        listener
+    )
+    hass = SimpleNamespace(data={DOMAIN: {"entry": {"coordinator": coordinator}}})
+    connection = MagicMock(subscriptions={})
+
+    ws_subscribe(
+        hass,
+        connection,
+        {"id": 5, "type": "opensprinkler/subscribe", "config_entry_id": "entry"},
+    )
+    connection.send_result.assert_called_once_with(5)
+    snapshot = connection.send_message.call_args[0][0]
+    assert snapshot["event"]["snapshot"]["program_names"] == ["Lawn"]
+
+    coordinator.data = make_snapshot(programs_running=True)
+    coordinator.listeners[0]()
+    # A poll that changed nothing sends nothing
+    coordinator.listeners[0]()
+
+    assert connection.send_message.call_count == 2
+    delta = connection.send_message.call_args[0][0]
+    assert delta == {
+        "id": 5,
+        "type": "event",
+        "event": {"delta": {"programs": [[0, 3]]}},
+    }
+
+
+def test_subscription_ends_when_the_controller_is_unloaded():
+    coordinator = SimpleNamespace(data=make_snapshot(), listeners=[])
+
+    def add_listener(listener):
+        coordinator.listeners.append(listener)
+        return lambda: coordinator.listeners.remove(listener)
+
+    coordinator.async_add_listener = add_listener
+    hass = SimpleNamespace(
+        data={DOMAIN: {"entry": {"coordinator": coordinator}}},
+        async_run_hass_job=lambda job, *args: job.target(*args),
+    )
+    connection = MagicMock(subscriptions={})
+    ws_subscribe(
+        hass,
+        connection,
+        {"id": 5, "type": "opensprinkler/subscribe", "config_entry_id": "entry"},
+    )
+
+    async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format("entry"))
+
+    assert connection.subscriptions == {}
+    assert coordinator.listeners == []
+    assert connection.send_message.call_args[0][0] == {
+        "id": 5,
+        "type": "event",
+        "event": {"unloaded": True},
+    }
+    # Another unload of the entry does not end it again
+    async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format("entry"))
+    assert connection.send_message.call_count == 2